@@ -18,26 +18,127 @@ import os
 import pickle
 import numpy as np
 import pandas as pd
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, g, send_file
 from flask_cors import CORS
 from datetime import datetime, timedelta
 
+import metrics
+import profiling
+import data_store
+import sql_store
+import scenarios
+import elasticity
+import streaming
+import bulk
+import schemas
+import json_provider
+import shared_models
+import inference_pool
+import logistics
+import supply_planner
+import allocations
+import risk
+import feature_store
+from market_aggregates import MarketAggregates
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend communication
+# orjson-backed jsonify and Arrow batch scoring; both are in requirements.txt but optional
+if not json_provider.install(app):
+    print("Warning: orjson not installed; responses use the slower standard json encoder")
+if bulk.pa is None:
+    print("Warning: pyarrow not installed; Arrow batch scoring requests will be rejected")
 
 # Global variables to store loaded models and data
 crop_advisor_model = None
 demand_radar_model = None
 crop_suitability_model = None
 vegan_demand_model = None
-vegan_consumption_df = None
+price_elasticity = None    # elasticity.ElasticityTable for the vegan demand model
 crop_suitability_df = None
-logistics_supply_df = None
+consumption_table = None   # data_store.ColumnarTable; read with .snapshot()
+logistics_table = None     # data_store.ColumnarTable; read with .snapshot()
+route_index = None         # (destination_city, crop) -> logistics row positions
+supply_store = None        # sql_store.SQLiteStore when VOIS_DATA_BACKEND=sqlite
+logistics_engine = None    # logistics.LogisticsEngine: estimated lanes for any district/city
+shipment_planner = None    # supply_planner.SupplyPlanner over logistics_engine
+allocation_book = None     # allocations.AllocationBook: /optimize_supply_chain solutions per (city, crop)
+district_profiles = None   # feature_store.DistrictProfileStore: /predict_suitability district features
+market_aggregates = None
+model_paths = {}           # model name -> artifact path served (for the inference pool)
+model_pool = None          # inference_pool.InferencePool when VOIS_INFERENCE_WORKERS > 0
+
+# Set VOIS_USE_COMPRESSED_MODELS=false to always serve the full forests
+USE_COMPRESSED_MODELS = os.environ.get('VOIS_USE_COMPRESSED_MODELS', 'true').lower() == 'true'
+
+def _load_model_file(models_dir, name):
+    """
+    Load models/<name>.pkl, preferring the pruned/distilled
+    models/<name>.compressed.pkl written by compress_models.py when present
+    and newer than the original (a compressed file older than a retrained
+    model may use another encoding, so it is ignored).
+    Compressed artifacts keep the same structure, so callers need no changes.
+    With VOIS_SHARED_MODELS=true, forests are served from memory-mapped
+    arrays shared by all worker processes (see shared_models.py).
+    """
+    original_path = os.path.join(models_dir, f'{name}.pkl')
+    compressed_path = os.path.join(models_dir, f'{name}.compressed.pkl')
+    if (USE_COMPRESSED_MODELS and os.path.exists(compressed_path) and
+            os.path.getmtime(compressed_path) >= os.path.getmtime(original_path)):
+        path, suffix = compressed_path, ' (compressed)'
+    else:
+        if USE_COMPRESSED_MODELS and os.path.exists(compressed_path):
+            print(f"Warning: ignoring {compressed_path}, older than the retrained {name}.pkl")
+        path, suffix = original_path, ''
+    model_paths[name] = path
+    
+    if shared_models.ENABLED:
+        shared = shared_models.load(os.path.basename(path)[:-len('.pkl')], path)
+        if shared is not None:
+            return shared, suffix + ' (shared)'
+    
+    with open(path, 'rb') as f:
+        return pickle.load(f), suffix
+
+# Encoder keys of artifacts trained before category vocabularies were stored
+LEGACY_ENCODER_KEYS = {
+    'soil_type': 'soil_encoder',
+    'crop': 'crop_encoder',
+    'district': 'district_encoder',
+    'region': 'region_encoder',
+    'product': 'product_encoder'
+}
+
+def _attach_category_lookups(model_data):
+    """
+    Precompute {feature: {value: code}} dicts on a model artifact so requests
+    encode categorical inputs with a dict lookup instead of LabelEncoder.transform.
+    """
+    if 'categories' in model_data:
+        vocabularies = model_data['categories']
+    else:
+        vocabularies = {
+            feature: list(model_data[key].classes_)
+            for feature, key in LEGACY_ENCODER_KEYS.items() if key in model_data
+        }
+    model_data['lookups'] = {
+        feature: {value: code for code, value in enumerate(values)}
+        for feature, values in vocabularies.items()
+    }
+    return model_data
+
+def encode_category(model_data, feature, value):
+    """Return the integer code of a categorical value; SchemaError (a 400) if unseen in training."""
+    code = model_data['lookups'][feature].get(value)
+    if code is None:
+        raise schemas.unknown_category(feature, value)
+    return code
 
 def load_models():
     """Load all trained models at application startup."""
-    global crop_advisor_model, demand_radar_model, crop_suitability_model, vegan_demand_model
+    global crop_advisor_model, demand_radar_model, crop_suitability_model, vegan_demand_model, price_elasticity
+    global model_pool
     
     try:
         # Get the base directory (parent of backend/)
@@ -45,28 +146,39 @@ def load_models():
         models_dir = os.path.join(base_dir, 'models')
         
         # Load Crop Advisor model
-        crop_model_path = os.path.join(models_dir, 'crop_advisor.pkl')
-        with open(crop_model_path, 'rb') as f:
-            crop_advisor_model = pickle.load(f)
-        print(f"✓ Loaded Crop Advisor model")
+        crop_advisor_model, suffix = _load_model_file(models_dir, 'crop_advisor')
+        print(f"✓ Loaded Crop Advisor model{suffix}")
         
         # Load Demand Radar model
-        demand_model_path = os.path.join(models_dir, 'demand_radar.pkl')
-        with open(demand_model_path, 'rb') as f:
-            demand_radar_model = pickle.load(f)
-        print(f"✓ Loaded Demand Radar model")
+        demand_radar_model, suffix = _load_model_file(models_dir, 'demand_radar')
+        print(f"✓ Loaded Demand Radar model{suffix}")
         
         # Load Crop Suitability model
-        suitability_model_path = os.path.join(models_dir, 'crop_suitability.pkl')
-        with open(suitability_model_path, 'rb') as f:
-            crop_suitability_model = pickle.load(f)
-        print(f"✓ Loaded Crop Suitability model")
+        crop_suitability_model, suffix = _load_model_file(models_dir, 'crop_suitability')
+        _attach_category_lookups(crop_suitability_model)
+        print(f"✓ Loaded Crop Suitability model{suffix}")
         
         # Load Vegan Demand Forecast model
-        vegan_model_path = os.path.join(models_dir, 'vegan_demand_forecast.pkl')
-        with open(vegan_model_path, 'rb') as f:
-            vegan_demand_model = pickle.load(f)
-        print(f"✓ Loaded Vegan Demand Forecast model")
+        vegan_demand_model, suffix = _load_model_file(models_dir, 'vegan_demand_forecast')
+        _attach_category_lookups(vegan_demand_model)
+        print(f"✓ Loaded Vegan Demand Forecast model{suffix}")
+        
+        # Precomputed by train_models.py; missing entries are estimated on first use
+        elasticity_path = os.path.join(models_dir, 'price_elasticity.json')
+        if os.path.exists(elasticity_path):
+            price_elasticity = elasticity.ElasticityTable.load(elasticity_path)
+        else:
+            price_elasticity = elasticity.ElasticityTable()
+        print(f"✓ Loaded price elasticity table ({len(price_elasticity)} entries)")
+        
+        # Run predictions in worker processes; the proxies keep the same predict() interface
+        if inference_pool.POOL_WORKERS > 0:
+            model_pool = inference_pool.InferencePool(model_paths)
+            crop_advisor_model = model_pool.model('crop_advisor')
+            demand_radar_model = model_pool.model('demand_radar')
+            crop_suitability_model['model'] = model_pool.model('crop_suitability')
+            vegan_demand_model['model'] = model_pool.model('vegan_demand_forecast')
+            print(f"✓ Started inference pool ({model_pool.workers} workers)")
         
     except FileNotFoundError as e:
         print(f"Error: Model file not found - {e}")
@@ -75,24 +187,131 @@ def load_models():
         print(f"Error loading models: {e}")
         raise
 
+def invalid_request(timer, error, model='none'):
+    """Structured 400 for a schemas.SchemaError: {"error", "details": [{"field", "message"}]}."""
+    timer.error(error.kind, model=model)
+    return jsonify(error.to_dict()), 400
+
+def price_elasticity_fields(region, product, month, features):
+    """Model-derived price elasticity of demand and its 0-1 score for a forecast request."""
+    value = price_elasticity.lookup(vegan_demand_model['model'], region, product, month, features)
+    return {
+        "price_elasticity": round(value, 3),
+        "price_elasticity_score": round(elasticity.score(value), 3)
+    }
+
 def load_data():
     """Load CSV data files for supply chain optimization."""
-    global vegan_consumption_df, crop_suitability_df, logistics_supply_df
+    global crop_suitability_df, consumption_table, logistics_table, route_index, supply_store, market_aggregates
+    global logistics_engine, shipment_planner, allocation_book, district_profiles
     
     try:
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         data_dir = os.path.join(base_dir, 'data')
+        consumption_path = os.path.join(data_dir, 'vegan_consumption.csv')
+        logistics_path = os.path.join(data_dir, 'logistics_supply.csv')
+        suitability_path = os.path.join(data_dir, 'crop_suitability.csv')
         
         # Load dataframes
-        vegan_consumption_df = pd.read_csv(os.path.join(data_dir, 'vegan_consumption.csv'))
-        crop_suitability_df = pd.read_csv(os.path.join(data_dir, 'crop_suitability.csv'))
-        logistics_supply_df = pd.read_csv(os.path.join(data_dir, 'logistics_supply.csv'))
+        vegan_consumption_df = pd.read_csv(consumption_path)
         
-        print(f"✓ Loaded data files")
+        # Appendable tables (see /ingest/*); appended rows are compacted back to the CSVs
+        consumption_table = data_store.ColumnarTable(
+            'consumption', vegan_consumption_df, data_store.CONSUMPTION_SCHEMA, consumption_path
+        )
+        
+        if sql_store.DATA_BACKEND == 'sqlite':
+            # Logistics and suitability stay on disk, shared by all workers
+            supply_store = sql_store.SQLiteStore(data_dir=data_dir)
+            logistics_table = supply_store.table('logistics', data_store.LOGISTICS_SCHEMA)
+            suitability_df = pd.read_csv(suitability_path)
+            # Medians are aggregated inside SQLite; workers never load the logistics rows
+            lane_aggregates = lambda: supply_store.lane_aggregates(logistics.LogisticsEngine.SUPPLY_FIELDS)
+            logistics_engine = logistics.LogisticsEngine().update_aggregates(*lane_aggregates(), suitability_df)
+            # Re-aggregated on appends made by this worker, as the memory backend does
+            logistics_table.add_listener(lambda rows, start: logistics_engine.update_aggregates(*lane_aggregates()))
+        else:
+            crop_suitability_df = suitability_df = pd.read_csv(suitability_path)
+            logistics_supply_df = pd.read_csv(logistics_path)
+            logistics_table = data_store.ColumnarTable(
+                'logistics', logistics_supply_df, data_store.LOGISTICS_SCHEMA, logistics_path
+            )
+            route_index = data_store.RouteIndex(logistics_table, ('destination_city', 'crop'))
+            # Distance matrix and per-crop rates for lanes missing from the CSV
+            logistics_engine = logistics.LogisticsEngine().update(logistics_supply_df, crop_suitability_df)
+            logistics_table.add_listener(lambda rows, start: logistics_engine.update(logistics_table.snapshot()))
+        shipment_planner = supply_planner.SupplyPlanner(logistics_engine)
+        # Per-district soil/climate features, so suitability requests may send just district + crop
+        district_profiles = feature_store.DistrictProfileStore(suitability_path)
+        district_profiles.update(suitability_df)
+        # Cached solutions are re-ranked once their crop gets new logistics rows; under
+        # SQLite other workers append too, so the book also follows the table's last rowid
+        allocation_book = allocations.AllocationBook(
+            (lambda: supply_store.query_scalar('SELECT MAX(rowid) FROM logistics')) if supply_store else None
+        )
+        logistics_table.add_listener(lambda rows, start: allocation_book.discard_crops(rows['crop'].unique()))
+        
+        # Build market rollups once; appended rows are folded in incrementally
+        market_aggregates = MarketAggregates()
+        market_aggregates.update(vegan_consumption_df)
+        consumption_table.add_listener(lambda rows, start: market_aggregates.update(rows))
+        
+        print(f"✓ Loaded data files ({sql_store.DATA_BACKEND} backend)")
         
     except Exception as e:
         print(f"Warning: Could not load data files: {e}")
 
+# Source crop of each vegan product (simplified mapping)
+PRODUCT_CROPS = {
+    'Oat Milk': 'Oats',
+    'Soy Products': 'Soy',
+    'Chickpea Flour': 'Chickpea',
+    'Tofu': 'Soy'
+}
+
+def product_crop(product):
+    """Crop a product is made from; otherwise the product's first word."""
+    return PRODUCT_CROPS.get(product, product.split()[0] if ' ' in product else product)
+
+def supply_candidates(destination, crop):
+    """
+    Logistics routes to destination for crop, left-joined with the source
+    district's crop suitability rows.
+    """
+    if supply_store is not None:
+        return supply_store.supply_candidates(destination, crop)
+    
+    logistics_df = logistics_table.snapshot()
+    logistics = logistics_df.iloc[route_index.lookup((destination, crop), len(logistics_df))]
+    if len(logistics) == 0:
+        return logistics
+    suitability = crop_suitability_df[crop_suitability_df['crop'] == crop]
+    return logistics.merge(
+        suitability,
+        left_on='source_district',
+        right_on='district',
+        how='left'
+    )
+
+def ranked_candidates(destination, crop):
+    """
+    Supply candidates sorted by priority (higher suitability, lower cost),
+    falling back to the engine's estimated lanes. Returns (DataFrame, estimated).
+    """
+    merged = supply_candidates(destination, crop)
+    estimated = len(merged) == 0 and logistics_engine is not None
+    if estimated:
+        merged = logistics_engine.candidates(destination, crop)
+    if len(merged) == 0:
+        return merged, estimated
+    
+    # Calculate priority: higher suitability, lower cost
+    merged['priority_score'] = (
+        merged['suitability_score'].fillna(0.5) * 0.6 +
+        (1 - merged['transport_cost'] / merged['transport_cost'].max()) * 0.4
+    )
+    return merged.sort_values('priority_score', ascending=False), estimated
+
 # Load models and data at module level
 try:
     load_models()
@@ -100,56 +319,235 @@ try:
 except Exception as e:
     print(f"Warning: Could not load models/data at startup: {e}")
 
+@app.before_request
+def start_profiling():
+    """Start the opt-in slow-request profiler (see profiling.py)."""
+    g.profile_session = profiling.start(request.headers)
+
+@app.after_request
+def finish_profiling(response):
+    """Keep the profile if the request exceeded the latency threshold, naming it in a header."""
+    session = g.get('profile_session')
+    if session is not None:
+        name = profiling.finish(session, request.endpoint)
+        if name is not None:
+            response.headers['X-VOIS-Profile-Name'] = name
+    return response
+
+@app.teardown_request
+def stop_profiling(error=None):
+    """
+    Always stop the profiler and release its lock: after_request is skipped
+    when an exception propagates (DEBUG / PROPAGATE_EXCEPTIONS).
+    """
+    session = g.pop('profile_session', None)
+    if session is not None:
+        session.stop()
+
 @app.route('/', methods=['GET'])
 def health_check():
     """Health check endpoint."""
     return "VOIS (V-Pulse) API is Online", 200
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Per-endpoint stage latency histograms and error counters (Prometheus text format)."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# ==================== ADMIN ENDPOINTS ====================
+
+@app.route('/admin/profiles', methods=['GET'])
+def list_profiles():
+    """List captured slow-request profiles (requires X-Admin-Token)."""
+    if not profiling.is_admin(request.headers):
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify({
+        "profiles": profiling.list_profiles(),
+        "threshold_ms": profiling.THRESHOLD_MS,
+        "max_files": profiling.MAX_FILES
+    }), 200
+
+@app.route('/admin/profiles/<name>', methods=['GET'])
+def download_profile(name):
+    """
+    Download a captured profile as a pstats file (load with pstats/snakeviz),
+    or ?format=text for the top functions by cumulative time.
+    Requires X-Admin-Token.
+    """
+    if not profiling.is_admin(request.headers):
+        return jsonify({"error": "Forbidden"}), 403
+    path = profiling.profile_path(name)
+    if path is None:
+        return jsonify({"error": "Profile not found"}), 404
+    if request.args.get('format') == 'text':
+        return Response(profiling.summarize(name), mimetype='text/plain')
+    return send_file(path, as_attachment=True, download_name=name)
+
+def _ingest(table, endpoint):
+    """Parse, validate and append an ingestion request body to a table."""
+    timer = metrics.RequestTimer(endpoint)
+    if not profiling.is_admin(request.headers):
+        timer.error('forbidden', model=table.name if table else 'none')
+        return jsonify({"error": "Forbidden"}), 403
+    if table is None:
+        timer.error('data_not_loaded', model='none')
+        return jsonify({"error": "Data not loaded"}), 500
+    
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            body = upload.read()
+            content_type = 'text/csv' if upload.filename.lower().endswith('.csv') else 'application/x-ndjson'
+        else:
+            body = request.get_data()
+            content_type = request.content_type
+        rows = data_store.validate_rows(data_store.parse_records(body, content_type), table.schema)
+        timer.lap('parse')
+        
+        total_rows = table.append(rows)
+        timer.lap('allocate')
+        
+        response = jsonify({"appended": len(rows), "total_rows": total_rows})
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
+        
+    except data_store.ValidationError as e:
+        timer.error(e, model=table.name)
+        return jsonify({"error": str(e), "details": e.errors}), 400
+    except Exception as e:
+        timer.error(e, model=table.name)
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/ingest/consumption', methods=['POST'])
+def ingest_consumption():
+    """
+    Append vegan consumption rows (requires X-Admin-Token).
+    
+    Body: NDJSON (application/x-ndjson), a JSON array (application/json),
+    CSV with a header row (text/csv), or a multipart upload in the 'file' field.
+    Columns: date, region, product, consumption, price, genz_ratio, google_trends_score
+    
+    Returns: {"appended": int, "total_rows": int}; 400 with per-row details on invalid input.
+    """
+    return _ingest(consumption_table, 'ingest_consumption')
+
+@app.route('/ingest/logistics', methods=['POST'])
+def ingest_logistics():
+    """
+    Append logistics supply rows (requires X-Admin-Token); body formats as /ingest/consumption.
+    Columns: source_district, destination_city, crop, transport_cost, distance,
+             processing_capacity, storage_cost, supply_quantity
+    """
+    return _ingest(logistics_table, 'ingest_logistics')
+
+def fill_district_profiles(columns):
+    """Join the district profile fields a suitability batch left out (see feature_store.py)."""
+    if district_profiles is None:
+        return columns
+    profiles = district_profiles.get(request.args.get('profile_version'))
+    return profiles.fill_columns(columns, list(crop_suitability_model['lookups']['district']))
+
+def _score_batch(timer, model_name, model_data, fields, output_field, bounds, prepare=None):
+    """
+    Score a columnar batch (Arrow IPC, .npy or JSON "rows") with one predict call.
+    prepare(columns) -> columns may fill in derived columns first. Predictions
+    are clipped to bounds and returned in the request's format.
+    """
+    try:
+        binary = bulk.media_type(request.content_type) in bulk.BINARY_MIMETYPES
+        columns, source = bulk.read_columns(
+            request.get_data(), request.content_type, None if binary else request.get_json()
+        )
+        if prepare is not None:
+            columns = prepare(columns)
+        timer.lap('parse')
+        
+        features = bulk.feature_matrix(columns, fields, model_data['lookups'])
+        timer.lap('encode')
+        
+        predictions = np.clip(model_data['model'].predict(features), *bounds)
+        timer.lap('predict')
+        
+        if binary:
+            body, mimetype = bulk.write_predictions(predictions, output_field, request.content_type, source)
+            response = Response(body, mimetype=mimetype)
+        elif streaming.wants_ndjson(request):
+            response = streaming.ndjson_response(
+                {"row": row, output_field: round(float(value), 3)} for row, value in enumerate(predictions)
+            )
+        else:
+            response = jsonify({"count": len(predictions), output_field: np.round(predictions, 3).tolist()})
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
+        
+    except (bulk.BulkFormatError, feature_store.ProfileError) as e:
+        timer.error(e, model=model_name)
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        timer.error(e, model=model_name)
+        return jsonify({"error": str(e)}), 500
+
 # ==================== EXISTING ENDPOINTS ====================
 
 @app.route('/predict_demand', methods=['POST'])
 def predict_demand():
     """Predict number of orders based on pricing and location data."""
+    timer = metrics.RequestTimer('predict_demand')
     if demand_radar_model is None:
+        timer.error('model_not_loaded', model='demand_radar')
         return jsonify({"error": "Demand model not loaded"}), 500
     
     try:
-        data = request.get_json()
-        required_fields = ['base_price', 'checkout_price', 'center_id', 'meal_id']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
-        features = np.array([[float(data['base_price']), float(data['checkout_price']), 
-                             int(data['center_id']), int(data['meal_id'])]])
+        data = schemas.PREDICT_DEMAND.validate(request.get_json(silent=True))
+        timer.lap('parse')
+        
+        features = np.array([[data['base_price'], data['checkout_price'],
+                             data['center_id'], data['meal_id']]])
+        timer.lap('encode')
         prediction = demand_radar_model.predict(features)[0]
+        timer.lap('predict')
         
-        return jsonify({"predicted_orders": round(float(prediction))}), 200
+        response = jsonify({"predicted_orders": round(float(prediction))})
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
         
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='demand_radar')
     except Exception as e:
+        timer.error(e, model='demand_radar')
         return jsonify({"error": str(e)}), 500
 
 @app.route('/recommend_crop', methods=['POST'])
 def recommend_crop():
     """Recommend crop based on environmental and soil conditions."""
+    timer = metrics.RequestTimer('recommend_crop')
     if crop_advisor_model is None:
+        timer.error('model_not_loaded', model='crop_advisor')
         return jsonify({"error": "Crop model not loaded"}), 500
     
     try:
-        data = request.get_json()
-        required_fields = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
-        features = np.array([[float(data['N']), float(data['P']), float(data['K']),
-                             float(data['temperature']), float(data['humidity']),
-                             float(data['ph']), float(data['rainfall'])]])
+        data = schemas.RECOMMEND_CROP.validate(request.get_json(silent=True))
+        timer.lap('parse')
+        
+        features = np.array([[data['N'], data['P'], data['K'],
+                             data['temperature'], data['humidity'],
+                             data['ph'], data['rainfall']]])
+        timer.lap('encode')
         prediction = crop_advisor_model.predict(features)[0]
+        timer.lap('predict')
         
-        return jsonify({"recommended_crop": str(prediction)}), 200
+        response = jsonify({"recommended_crop": str(prediction)})
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
         
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='crop_advisor')
     except Exception as e:
+        timer.error(e, model='crop_advisor')
         return jsonify({"error": str(e)}), 500
 
 # ==================== NEW VOIS ENDPOINTS ====================
@@ -168,37 +566,77 @@ def predict_suitability():
         "rainfall": float,
         "temperature": float,
         "irrigation": int (0 or 1),
-        "distance_to_city": float
+        "distance_to_city": float,
+        "profile_version": str      # optional
     }
     
+    Fields after crop are optional: missing ones are filled from the
+    district's profile (see feature_store.py), of profile_version or the
+    current version. A request with just district and crop is served from
+    the cached encoded row.
+    
     Returns:
     {
         "suitability_score": float (0-1),
-        "recommendation": str
+        "recommendation": str,
+        "profile_version": str      # when profile fields were used
     }
+    
+    Batch scoring: send the same fields as columns in an Arrow IPC stream
+    (application/vnd.apache.arrow.stream), a NumPy structured array
+    (application/x-npy) or JSON {"rows": [...]}; see bulk.py. Missing
+    district columns are joined from the profiles (?profile_version= to pin
+    one). Returns suitability_score per row (no recommendation).
     """
+    timer = metrics.RequestTimer('predict_suitability')
     if crop_suitability_model is None:
+        timer.error('model_not_loaded', model='crop_suitability')
         return jsonify({"error": "Suitability model not loaded"}), 500
     
+    if bulk.is_batch(request.content_type, request.get_json(silent=True)):
+        return _score_batch(timer, 'crop_suitability', crop_suitability_model,
+                            bulk.SUITABILITY_FIELDS, 'suitability_score', (0, 1),
+                            prepare=fill_district_profiles)
+    
     try:
-        data = request.get_json()
+        data = schemas.PREDICT_SUITABILITY.validate(request.get_json(silent=True))
+        timer.lap('parse')
         model_data = crop_suitability_model
         
-        # Encode categorical features
-        soil_encoded = model_data['soil_encoder'].transform([data['soil_type']])[0]
-        crop_encoded = model_data['crop_encoder'].transform([data['crop']])[0]
-        district_encoded = model_data['district_encoder'].transform([data['district']])[0]
+        missing = [field for field, _ in feature_store.PROFILE_FIELDS if data[field] is None]
+        profiles = None
+        if missing:
+            if district_profiles is None:
+                raise schemas.SchemaError([{"field": field, "message": f"Missing required field: {field}",
+                                            "missing": True} for field in missing])
+            profiles = district_profiles.get(data['profile_version'])
         
-        # Prepare features
-        features = np.array([[
-            float(data['soil_ph']), soil_encoded, float(data['rainfall']),
-            float(data['temperature']), int(data['irrigation']),
-            float(data['distance_to_city']), crop_encoded, district_encoded
-        ]])
+        if profiles is not None and len(missing) == len(feature_store.PROFILE_FIELDS):
+            # District + crop only: the encoded row is cached per profile version
+            features = profiles.encoded_row(data['district'], data['crop'],
+                                            lambda feature, value: encode_category(model_data, feature, value))
+        else:
+            if profiles is not None:
+                profile = profiles.profile(data['district'])
+                data.update({field: profile[field] for field in missing})
+            
+            # Encode categorical features
+            soil_encoded = encode_category(model_data, 'soil_type', data['soil_type'])
+            crop_encoded = encode_category(model_data, 'crop', data['crop'])
+            district_encoded = encode_category(model_data, 'district', data['district'])
+            
+            # Prepare features
+            features = np.array([[
+                data['soil_ph'], soil_encoded, data['rainfall'],
+                data['temperature'], data['irrigation'],
+                data['distance_to_city'], crop_encoded, district_encoded
+            ]])
+        timer.lap('encode')
         
         # Predict
         score = model_data['model'].predict(features)[0]
         score = max(0, min(1, score))  # Clamp to [0, 1]
+        timer.lap('predict')
         
         # Generate recommendation
         if score >= 0.8:
@@ -210,12 +648,24 @@ def predict_suitability():
         else:
             recommendation = "Not suitable - Consider alternative crops or locations"
         
-        return jsonify({
+        result = {
             "suitability_score": round(float(score), 3),
             "recommendation": recommendation
-        }), 200
+        }
+        if profiles is not None:
+            result["profile_version"] = profiles.version
+        response = jsonify(result)
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
         
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='crop_suitability')
+    except feature_store.ProfileError as e:
+        timer.error(e, model='crop_suitability')
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
+        timer.error(e, model='crop_suitability')
         return jsonify({"error": str(e)}), 500
 
 @app.route('/forecast_vegan_demand', methods=['POST'])
@@ -238,46 +688,145 @@ def forecast_vegan_demand():
     {
         "predicted_consumption": float,
         "genz_adoption_index": float,
-        "price_elasticity_score": float
+        "price_elasticity": float,        # % demand change per 1% price change
+        "price_elasticity_score": float   # 0-1, 1 = demand insensitive to price
     }
+    
+    Batch scoring: send the same fields as columns in an Arrow IPC stream,
+    a NumPy structured array or JSON {"rows": [...]} (see bulk.py). Returns
+    predicted_consumption per row.
     """
+    timer = metrics.RequestTimer('forecast_vegan_demand')
     if vegan_demand_model is None:
+        timer.error('model_not_loaded', model='vegan_demand_forecast')
         return jsonify({"error": "Vegan demand model not loaded"}), 500
     
+    if bulk.is_batch(request.content_type, request.get_json(silent=True)):
+        return _score_batch(timer, 'vegan_demand_forecast', vegan_demand_model,
+                            bulk.VEGAN_DEMAND_FIELDS, 'predicted_consumption', (0, None))
+    
     try:
-        data = request.get_json()
+        data = schemas.FORECAST_VEGAN_DEMAND.validate(request.get_json(silent=True))
+        timer.lap('parse')
         model_data = vegan_demand_model
         
         # Encode categorical features
-        region_encoded = model_data['region_encoder'].transform([data['region']])[0]
-        product_encoded = model_data['product_encoder'].transform([data['product']])[0]
+        region_encoded = encode_category(model_data, 'region', data['region'])
+        product_encoded = encode_category(model_data, 'product', data['product'])
         
         # Prepare features
+        month = data['month']
+        quarter = data['quarter'] or (month - 1) // 3 + 1
         features = np.array([[
-            float(data['price']), float(data['genz_ratio']),
-            float(data['google_trends_score']), region_encoded,
-            product_encoded, int(data['month']), int(data['quarter'])
+            data['price'], data['genz_ratio'],
+            data['google_trends_score'], region_encoded,
+            product_encoded, month, quarter
         ]])
+        timer.lap('encode')
         
         # Predict consumption
         consumption = model_data['model'].predict(features)[0]
         consumption = max(0, consumption)  # Ensure non-negative
+        timer.lap('predict')
         
         # Calculate GenZ Adoption Index
-        genz_index = float(data['genz_ratio']) * float(data['google_trends_score']) / 100
+        genz_index = data['genz_ratio'] * data['google_trends_score'] / 100
         
-        # Calculate Price Elasticity Score (simplified)
-        # Higher price typically reduces demand
-        base_price = float(data['price'])
-        price_elasticity = max(0, 1 - (base_price - 100) / 500)  # Normalized
+        # Price elasticity from the precomputed table (estimated on first use if unseen)
+        elasticity_result = price_elasticity_fields(data['region'], data['product'], month, features)
         
-        return jsonify({
+        response = jsonify({
             "predicted_consumption": round(float(consumption), 2),
             "genz_adoption_index": round(genz_index, 3),
-            "price_elasticity_score": round(price_elasticity, 3)
-        }), 200
+            **elasticity_result
+        })
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
         
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='vegan_demand_forecast')
     except Exception as e:
+        timer.error(e, model='vegan_demand_forecast')
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/scenario_sweep', methods=['POST'])
+def scenario_sweep():
+    """
+    What-if demand surface over two features in one request.
+    
+    Expected JSON:
+    {
+        "region": str,
+        "product": str,
+        "price": float,                  # base values for the features not swept
+        "genz_ratio": float (0-1),       # (defaults 200, 0.5 and 70)
+        "google_trends_score": float (0-100),
+        "month": int (1-12),
+        "quarter": int (1-4),            # optional, derived from month
+        "x": {"feature": "price", "start": 100, "stop": 500, "step": 10},
+        "y": {"feature": "genz_ratio", "start": 0, "stop": 1, "step": 0.05}
+    }
+    Axis features: price, genz_ratio, google_trends_score.
+    
+    Returns:
+    {
+        "x": {"feature": str, "values": [float]},
+        "y": {"feature": str, "values": [float]},
+        "consumption": [[float]],        # one row per y value, one column per x value
+        "cells": int, "min": float, "max": float,
+        "best": {x_feature: float, y_feature: float, "consumption": float}
+    }
+    
+    With "Accept: application/x-ndjson" the surface is streamed instead: an
+    {"type": "axes"} line, one {"type": "row", "y", "consumption"} line per y
+    value and a final {"type": "summary"} line. Streamed grids may have up to
+    VOIS_SWEEP_MAX_STREAM_CELLS cells.
+    """
+    timer = metrics.RequestTimer('scenario_sweep')
+    if vegan_demand_model is None:
+        timer.error('model_not_loaded', model='vegan_demand_forecast')
+        return jsonify({"error": "Vegan demand model not loaded"}), 500
+    
+    try:
+        data = schemas.SCENARIO_SWEEP.validate(request.get_json(silent=True))
+        timer.lap('parse')
+        model_data = vegan_demand_model
+        
+        month = data['month']
+        base_row = [
+            data['price'], data['genz_ratio'], data['google_trends_score'],
+            encode_category(model_data, 'region', data['region']),
+            encode_category(model_data, 'product', data['product']),
+            month, data['quarter'] or (month - 1) // 3 + 1
+        ]
+        timer.lap('encode')
+        
+        if streaming.wants_ndjson(request):
+            # Rows are scored as they are streamed; the timer covers validation only
+            plan = scenarios.plan_sweep(data['x'], data['y'], scenarios.SWEEP_MAX_STREAM_CELLS)
+            response = streaming.ndjson_response(
+                scenarios.stream_surface(model_data['model'], base_row, plan),
+                on_error=lambda e: metrics.count_error('scenario_sweep', e, model='vegan_demand_forecast')
+            )
+            timer.finish()
+            return response
+        
+        surface = scenarios.response_surface(model_data['model'], base_row, data['x'], data['y'])
+        timer.lap('predict')
+        
+        response = jsonify(surface)
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
+        
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='vegan_demand_forecast')
+    except scenarios.SweepError as e:
+        timer.error(e, model='vegan_demand_forecast')
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        timer.error(e, model='vegan_demand_forecast')
         return jsonify({"error": str(e)}), 500
 
 @app.route('/optimize_supply_chain', methods=['POST'])
@@ -303,92 +852,431 @@ def optimize_supply_chain():
             }
         ],
         "total_cost": float,
-        "waste_reduction": float
+        "waste_reduction": float,
+        "estimated_routes": bool
     }
+    
+    Quantities are tons; transport_cost is a lane's cost per 1000 tons and
+    total_cost is what the allocated tons cost (logistics.shipping_cost).
+    
+    When logistics_supply.csv has no lanes for the destination and crop,
+    every source district's lane is estimated from the distance matrix and
+    per-crop cost-per-km rates (see logistics.py) and estimated_routes is true.
+    
+    The ranked candidates and allocation are kept per (destination, crop)
+    (see allocations.py), so repeat requests and /optimize_supply_chain/delta
+    only re-fill the lanes whose allocation changes.
+    
+    With "Accept: application/x-ndjson" each source is streamed as a
+    {"type": "source", ...} line followed by a {"type": "summary"} line.
     """
-    if logistics_supply_df is None or crop_suitability_df is None:
+    timer = metrics.RequestTimer('optimize_supply_chain')
+    if logistics_table is None:
+        timer.error('data_not_loaded', model='logistics')
         return jsonify({"error": "Data not loaded"}), 500
     
     try:
-        data = request.get_json()
+        data = schemas.OPTIMIZE_SUPPLY_CHAIN.validate(request.get_json(silent=True))
         destination = data['destination_city']
         product = data['product']
-        required_qty = float(data['required_quantity'])
+        required_qty = data['required_quantity']
+        timer.lap('parse')
         
-        # Find matching crops (simplified mapping)
-        crop_mapping = {
-            'Oat Milk': 'Oats',
-            'Soy Products': 'Soy',
-            'Chickpea Flour': 'Chickpea'
-        }
-        crop = crop_mapping.get(product, product.split()[0] if ' ' in product else product)
+        crop = product_crop(product)
+        timer.lap('encode')
+        
+        # Ranked once per (destination, crop); later requests only re-fill for the new quantity
+        solution = allocation_book.allocate(destination, crop, required_qty,
+                                            lambda: ranked_candidates(destination, crop))
+        if solution is None:
+            timer.error('no_routes', model='logistics')
+            return jsonify({"error": "No supply routes found"}), 404
+        optimal_sources, totals = solution
+        timer.lap('allocate')
+        
+        if streaming.wants_ndjson(request):
+            records = [{"type": "source", **source} for source in optimal_sources]
+            records.append({"type": "summary", **totals})
+            response = streaming.ndjson_response(records)
+        else:
+            response = jsonify({"optimal_sources": optimal_sources, **totals})
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
         
-        # Filter logistics data
-        logistics = logistics_supply_df[
-            (logistics_supply_df['destination_city'] == destination) &
-            (logistics_supply_df['crop'] == crop)
-        ].copy()
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='logistics')
+    except Exception as e:
+        timer.error(e, model='logistics')
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/optimize_supply_chain/delta', methods=['POST'])
+def optimize_supply_chain_delta():
+    """
+    Apply supply or demand changes to the kept /optimize_supply_chain solutions.
+    
+    Expected JSON:
+    {
+        "product": str,
+        "supply": {district: float},       # new supply_quantity; every kept destination of the crop
+        "destination_city": str,           # with required_quantity: that destination's new demand
+        "required_quantity": float
+    }
+    
+    Supply changes also apply to destinations solved later, until logistics
+    rows for the crop are ingested. They change the plans every client is
+    served, so this requires the X-Admin-Token header (see profiling.py).
+    
+    Returns:
+    {
+        "product", "crop",
+        "changes": {city: [{"rank", "source_district", "quantity_before", "quantity_after"}]},
+        "solutions": {city: {"required_quantity", "allocated", "unmet", "total_cost", "sources_used"}}
+    }
+    """
+    timer = metrics.RequestTimer('optimize_supply_chain_delta')
+    if not profiling.is_admin(request.headers):
+        timer.error('forbidden', model='logistics')
+        return jsonify({"error": "Forbidden"}), 403
+    if allocation_book is None:
+        timer.error('data_not_loaded', model='logistics')
+        return jsonify({"error": "Data not loaded"}), 500
+    
+    try:
+        data = schemas.SUPPLY_DELTA.validate(request.get_json(silent=True))
+        supply = schemas.supply_changes(data)
+        destination = data['destination_city']
+        crop = product_crop(data['product'])
+        timer.lap('parse')
         
-        if len(logistics) == 0:
+        applied = allocation_book.apply(crop, supply, destination, data['required_quantity'],
+                                        lambda: ranked_candidates(destination, crop))
+        if applied is None:
+            timer.error('no_routes', model='logistics')
             return jsonify({"error": "No supply routes found"}), 404
+        changes, solutions = applied
+        timer.lap('allocate')
         
-        # Get suitability scores
-        suitability = crop_suitability_df[
-            crop_suitability_df['crop'] == crop
-        ].copy()
-        
-        # Merge and calculate priority scores
-        merged = logistics.merge(
-            suitability,
-            left_on='source_district',
-            right_on='district',
-            how='left'
-        )
+        response = jsonify({"product": data['product'], "crop": crop, "changes": changes, "solutions": solutions})
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
         
-        # Calculate priority: higher suitability, lower cost
-        merged['priority_score'] = (
-            merged['suitability_score'].fillna(0.5) * 0.6 +
-            (1 - merged['transport_cost'] / merged['transport_cost'].max()) * 0.4
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='logistics')
+    except Exception as e:
+        timer.error(e, model='logistics')
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/simulate_plan', methods=['POST'])
+def simulate_plan():
+    """
+    Monte Carlo shortfall and cost risk of an /optimize_supply_chain plan.
+
+    Expected JSON:
+    {
+        "destination_city": str,
+        "product": str,
+        "required_quantity": float,
+        "scenarios": int (default 10000),
+        "yield_cv": float (default 0.15),      # district yield std / mean
+        "demand_cv": float,                    # optional: normal demand instead of the forest spread
+        "price": float, "genz_ratio": float,   # forecast features for the demand spread
+        "google_trends_score": float, "month": int,
+        "seed": int, "budget_ms": float
+    }
+
+    Demand is spread by the vegan demand forest's per-tree forecasts for the
+    destination and product (Normal(1, demand_cv) when demand_cv is sent or
+    the forest has no trees for them); supply by a yield factor per source
+    district (see risk.py). Scenarios stop at the latency budget (truncated is true).
+
+    Returns:
+    {
+        "product", "crop", "estimated_routes", "scenarios", "truncated", "demand_spread",
+        "demand": {"mean", "p5", "p50", "p95", "p99"},
+        "plan" / "reoptimized": {"shortfall", "shortfall_probability", "fill_rate_pct", "cost"}
+    }
+    
+    Shortfalls are tons; costs are priced as in /optimize_supply_chain.
+    """
+    timer = metrics.RequestTimer('simulate_plan')
+    if allocation_book is None:
+        timer.error('data_not_loaded', model='logistics')
+        return jsonify({"error": "Data not loaded"}), 500
+
+    try:
+        data = schemas.SIMULATE_PLAN.validate(request.get_json(silent=True))
+        destination = data['destination_city']
+        product = data['product']
+        crop = product_crop(product)
+        timer.lap('parse')
+
+        lanes = allocation_book.lanes(destination, crop, data['required_quantity'],
+                                      lambda: ranked_candidates(destination, crop))
+        if lanes is None:
+            timer.error('no_routes', model='logistics')
+            return jsonify({"error": "No supply routes found"}), 404
+        timer.lap('allocate')
+
+        # Per-tree spread when the forecast model knows the city and product, else normal demand
+        ratios = None
+        lookups = vegan_demand_model['lookups'] if vegan_demand_model is not None else None
+        if (data['demand_cv'] is None and lookups is not None and
+                destination in lookups['region'] and product in lookups['product']):
+            month = data['month'] or datetime.now().month
+            features = np.array([
+                data['price'], data['genz_ratio'], data['google_trends_score'],
+                lookups['region'][destination], lookups['product'][product],
+                month, (month - 1) // 3 + 1
+            ])
+            predictions = risk.tree_predictions(vegan_demand_model['model'], features)
+            if predictions is not None:
+                ratios = risk.demand_ratios(predictions)
+        timer.lap('predict')
+
+        result = risk.simulate(
+            lanes, data['required_quantity'], min(data['scenarios'], risk.SIMULATION_MAX_SCENARIOS),
+            data['yield_cv'], ratios=ratios,
+            demand_cv=risk.DEMAND_CV if data['demand_cv'] is None else data['demand_cv'],
+            seed=data['seed'], budget_ms=data['budget_ms'] or risk.SIMULATION_BUDGET_MS
         )
+        timer.lap('simulate')
+
+        response = jsonify({"product": product, "crop": crop, "estimated_routes": lanes['estimated'], **result})
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
+
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='logistics')
+    except Exception as e:
+        timer.error(e, model='logistics')
+        return jsonify({"error": str(e)}), 500
+
+def _site_query(endpoint, schema, search):
+    """Shared body of the spatial endpoints; search(point, data, crop) -> source records."""
+    timer = metrics.RequestTimer(endpoint)
+    if logistics_engine is None:
+        timer.error('data_not_loaded', model='logistics')
+        return jsonify({"error": "Data not loaded"}), 500
+    
+    try:
+        data = schema.validate(request.get_json(silent=True))
+        point = schemas.query_point(data)
+        if isinstance(point, str):
+            location, point = point, logistics_engine.locate(point)
+            if point is None:
+                raise logistics.NetworkError(f"Unknown location: {location}")
+        crop = data['crop'] or (product_crop(data['product']) if data['product'] else None)
+        timer.lap('parse')
         
-        # Sort by priority
-        merged = merged.sort_values('priority_score', ascending=False)
+        sources = search(point, data, crop)
+        timer.lap('filter_merge')
         
-        # Allocate supply
-        optimal_sources = []
-        remaining_qty = required_qty
-        total_cost = 0
+        response = jsonify({
+            "origin": {"latitude": point[0], "longitude": point[1]},
+            "crop": crop, "role": data['role'], "sources": sources
+        })
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
         
-        for _, row in merged.iterrows():
-            if remaining_qty <= 0:
-                break
-            
-            available = min(row['supply_quantity'], remaining_qty)
-            allocation_pct = (available / required_qty) * 100
-            
-            cost = row['transport_cost'] * (available / 1000)  # Cost per ton
-            
-            optimal_sources.append({
-                "source_district": row['source_district'],
-                "allocation_percentage": round(allocation_pct, 2),
-                "transport_cost": round(row['transport_cost'], 2),
-                "total_cost": round(cost, 2),
-                "suitability_score": round(row['suitability_score'], 3)
-            })
-            
-            total_cost += cost
-            remaining_qty -= available
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='logistics')
+    except logistics.NetworkError as e:
+        timer.error(e, model='logistics')
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        timer.error(e, model='logistics')
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/nearest_sources', methods=['POST'])
+def nearest_sources():
+    """
+    The k districts nearest to a place, by road distance.
+    
+    Expected JSON:
+    {
+        "location": str,                   # a city or district, or latitude + longitude
+        "product": str,                    # optional crop filter (or "crop")
+        "role": "source" | "processing" | "any",   # default source
+        "k": int                           # default 5
+    }
+    
+    Returns:
+    {
+        "origin": {"latitude", "longitude"}, "crop", "role",
+        "sources": [{"district", "distance_km", "latitude", "longitude",
+                     "supply_quantity", "processing_capacity", "storage_cost",
+                     "suitability_score"}]      # crop fields only with a crop filter
+    }
+    
+    Answered from a BallTree over the district coordinates (see logistics.py).
+    """
+    return _site_query('nearest_sources', schemas.NEAREST_SOURCES,
+                       lambda point, data, crop: logistics_engine.nearest(point, data['k'], crop, data['role']))
+
+@app.route('/sources_within', methods=['POST'])
+def sources_within():
+    """
+    Districts within a road distance of a place, nearest first.
+    
+    Expected JSON: as /nearest_sources, with "radius_km": float instead of k.
+    Returns: as /nearest_sources.
+    """
+    return _site_query('sources_within', schemas.SOURCES_WITHIN,
+                       lambda point, data, crop: logistics_engine.within(point, data['radius_km'], crop, data['role']))
+
+@app.route('/optimize_network', methods=['POST'])
+def optimize_network():
+    """
+    Multi-stage supply plan: source district -> processing hub -> city.
+    
+    Expected JSON:
+    {
+        "product": str,
+        "demands": {city: float},          # or destination_city + required_quantity
+        "storage_months": float            # optional, default 1
+    }
+    
+    Solved as a min-cost flow over supply quantities, hub processing
+    capacities and storage costs, and estimated lane costs (see logistics.py).
+    Quantities are tons; legs cost logistics.per_ton() of their transport_cost
+    per ton and hubs storage_cost per ton per month, as in /optimize_supply_chain.
+    
+    Returns:
+    {
+        "product", "crop",
+        "stages": {
+            "farm_to_hub": [{"source_district", "hub", "quantity", "cost"}],
+            "hub_processing": [{"hub", "capacity", "utilization_pct", "quantity", "cost"}],
+            "hub_to_city": [{"hub", "destination_city", "quantity", "cost"}]
+        },
+        "deliveries": {city: {"required", "delivered", "unmet"}},
+        "costs": {"transport_to_hubs", "storage", "transport_to_cities", "total"},
+        "delivered": float,
+        "graph": {"nodes", "edges"}
+    }
+    """
+    timer = metrics.RequestTimer('optimize_network')
+    if logistics_engine is None:
+        timer.error('data_not_loaded', model='logistics')
+        return jsonify({"error": "Data not loaded"}), 500
+    
+    try:
+        data = schemas.OPTIMIZE_NETWORK.validate(request.get_json(silent=True))
+        demands = schemas.demand_map(data)
+        crop = product_crop(data['product'])
+        timer.lap('parse')
+        
+        plan = logistics_engine.network_plan(crop, demands, data['storage_months'])
+        timer.lap('allocate')
+        
+        response = jsonify({"product": data['product'], "crop": crop, **plan})
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
+        
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='logistics')
+    except logistics.NetworkError as e:
+        timer.error(e, model='logistics')
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        timer.error(e, model='logistics')
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/plan_supply', methods=['POST'])
+def plan_supply():
+    """
+    Time-phased shipment plan over a rolling horizon, within shelf life.
+    
+    Expected JSON:
+    {
+        "product": str,
+        "cities": [str],                   # or destination_city
+        "period": "week" | "month",        # optional, default week
+        "horizon": int,                    # periods, default 12
+        "start": "YYYY-MM-DD",             # optional, default today
+        "shelf_life_days": int,            # optional, default per product
+        "price": float,                    # forecast inputs (optional)
+        "genz_ratio": float (0-1),
+        "google_trends_score": float (0-100)
+    }
+    
+    Demand per city and period is the vegan demand forecast for the month
+    of the period, taken as tons per month and scaled to the period length.
+    Re-planning the same window with new forecast inputs or after a
+    logistics update warm-starts from the previous plan (see supply_planner.py).
+    
+    Returns:
+    {
+        "product", "crop", "period", "shelf_life_days", "shelf_life_periods",
+        "schedule": [{
+            "period", "start", "firm",     # only the first period is firm
+            "demand": {city: float}, "delivered": {city: float},
+            "farm_to_hub": [{"source_district", "hub", "quantity", "cost"}],
+            "shipments": [{"hub", "destination_city", "arrival_period", "held_periods",
+                           "quantity", "transport_cost", "storage_cost"}]
+        }],
+        "costs": {"transport_to_hubs", "transport_to_cities", "storage", "total"},
+        "required", "delivered", "unmet",
+        "graph": {"nodes", "edges"},
+        "solve": {"warm": bool, "seconds": float}
+    }
+    
+    Quantities are tons; costs are priced as in /optimize_network.
+    """
+    timer = metrics.RequestTimer('plan_supply')
+    if vegan_demand_model is None or shipment_planner is None:
+        timer.error('data_not_loaded', model='logistics')
+        return jsonify({"error": "Models or data not loaded"}), 500
+    
+    try:
+        data = schemas.PLAN_SUPPLY.validate(request.get_json(silent=True))
+        cities = schemas.plan_cities(data)
+        product, period = data['product'], data['period']
+        crop = product_crop(product)
+        timer.lap('parse')
+        model_data = vegan_demand_model
+        
+        # One forecast row per (city, period), at the month of the period's midpoint
+        days = supply_planner.PERIOD_DAYS[period]
+        starts = supply_planner.period_starts(data['start'] or datetime.now().date(), period, data['horizon'])
+        product_encoded = encode_category(model_data, 'product', product)
+        months = [(start + timedelta(days=days // 2)).month for start in starts]
+        features = np.array([
+            [data['price'], data['genz_ratio'], data['google_trends_score'],
+             encode_category(model_data, 'region', city), product_encoded, month, (month - 1) // 3 + 1]
+            for city in cities for month in months
+        ])
+        timer.lap('encode')
         
-        # Calculate waste reduction (simplified)
-        waste_reduction = min(50, len(optimal_sources) * 10)  # Up to 50%
+        monthly = np.maximum(model_data['model'].predict(features), 0).reshape(len(cities), len(starts))
+        scale = days / supply_planner.DAYS_PER_MONTH
+        demands = {city: [float(value) * scale for value in monthly[c]] for c, city in enumerate(cities)}
+        timer.lap('predict')
         
-        return jsonify({
-            "optimal_sources": optimal_sources,
-            "total_cost": round(total_cost, 2),
-            "waste_reduction_percentage": round(waste_reduction, 1)
-        }), 200
+        shelf_life = data['shelf_life_days'] or supply_planner.shelf_life_days(product)
+        plan = shipment_planner.plan(crop, demands, starts, period, shelf_life)
+        timer.lap('allocate')
         
+        response = jsonify({
+            "product": product, "crop": crop, "period": period,
+            "shelf_life_days": shelf_life, **plan
+        })
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
+        
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e, model='logistics')
+    except logistics.NetworkError as e:
+        timer.error(e, model='logistics')
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
+        timer.error(e, model='logistics')
         return jsonify({"error": str(e)}), 500
 
 @app.route('/combined_intelligence', methods=['POST'])
@@ -408,37 +1296,41 @@ def combined_intelligence():
     
     Returns comprehensive intelligence report.
     """
+    timer = metrics.RequestTimer('combined_intelligence')
     try:
-        data = request.get_json()
+        data = schemas.COMBINED_INTELLIGENCE.validate(request.get_json(silent=True))
+        timer.lap('parse')
         
         # Get demand forecast - directly predict instead of calling endpoint
         if vegan_demand_model is not None:
             try:
                 model_data = vegan_demand_model
-                region_encoded = model_data['region_encoder'].transform([data['region']])[0]
-                product_encoded = model_data['product_encoder'].transform([data['product']])[0]
+                region_encoded = encode_category(model_data, 'region', data['region'])
+                product_encoded = encode_category(model_data, 'product', data['product'])
                 
-                price = float(data.get('price', 200))
-                genz_ratio = float(data.get('genz_ratio', 0.5))
-                google_trends = float(data.get('google_trends_score', 70))
-                month = int(data.get('month', datetime.now().month))
+                price = data['price']
+                genz_ratio = data['genz_ratio']
+                google_trends = data['google_trends_score']
+                month = data['month'] or datetime.now().month
                 quarter = (month - 1) // 3 + 1
                 
                 features = np.array([[
                     price, genz_ratio, google_trends, region_encoded,
                     product_encoded, month, quarter
                 ]])
+                timer.lap('encode')
                 
                 consumption = max(0, model_data['model'].predict(features)[0])
+                timer.lap('predict')
                 genz_index = genz_ratio * google_trends / 100
-                price_elasticity = max(0, 1 - (price - 100) / 500)
                 
                 demand_result = {
                     "predicted_consumption": round(float(consumption), 2),
                     "genz_adoption_index": round(genz_index, 3),
-                    "price_elasticity_score": round(price_elasticity, 3)
+                    **price_elasticity_fields(data['region'], data['product'], month, features)
                 }
             except Exception as e:
+                metrics.count_error('combined_intelligence', e, model='vegan_demand_forecast')
                 demand_result = {"predicted_consumption": 0, "error": str(e)}
         else:
             demand_result = {"predicted_consumption": 0}
@@ -447,21 +1339,24 @@ def combined_intelligence():
         if crop_suitability_model is not None:
             try:
                 model_data = crop_suitability_model
-                district_encoded = model_data['district_encoder'].transform([data['district']])[0]
-                crop_encoded = model_data['crop_encoder'].transform([data['crop']])[0]
-                soil_type_encoded = model_data['soil_type_encoder'].transform([data.get('soil_type', 'Loamy')])[0]
+                district_encoded = encode_category(model_data, 'district', data['district'])
+                crop_encoded = encode_category(model_data, 'crop', data['crop'])
+                soil_type_encoded = encode_category(model_data, 'soil_type', data['soil_type'])
                 
+                # Same column order as training / predict_suitability
                 features = np.array([[
-                    district_encoded, crop_encoded,
-                    float(data.get('soil_ph', 7.0)),
+                    data['soil_ph'],
                     soil_type_encoded,
-                    float(data.get('rainfall', 600)),
-                    float(data.get('temperature', 25)),
-                    int(data.get('irrigation', 1)),
-                    float(data.get('distance_to_city', 50))
+                    data['rainfall'],
+                    data['temperature'],
+                    data['irrigation'],
+                    data['distance_to_city'],
+                    crop_encoded, district_encoded
                 ]])
+                timer.lap('encode')
                 
                 score = max(0, min(1, model_data['model'].predict(features)[0]))
+                timer.lap('predict')
                 
                 if score >= 0.8:
                     recommendation = "Highly suitable - Excellent conditions for this crop"
@@ -477,6 +1372,7 @@ def combined_intelligence():
                     "recommendation": recommendation
                 }
             except Exception as e:
+                metrics.count_error('combined_intelligence', e, model='crop_suitability')
                 suitability_result = {"suitability_score": 0.5, "error": str(e)}
         else:
             suitability_result = {"suitability_score": 0.5}
@@ -491,24 +1387,125 @@ def combined_intelligence():
         # Weighted priority score
         priority_score = (suitability * 0.5 + consumption_normalized * 0.5)
         
-        # Add debug info
-        print(f"DEBUG - Combined Intelligence:")
-        print(f"  Consumption: {consumption}, Normalized: {consumption_normalized}")
-        print(f"  Suitability: {suitability}")
-        print(f"  Priority Score: {priority_score}")
-        if 'error' in demand_result:
-            print(f"  Demand Error: {demand_result['error']}")
-        if 'error' in suitability_result:
-            print(f"  Suitability Error: {suitability_result['error']}")
-        
-        return jsonify({
+        # Debug info (only emitted when the app logger is at DEBUG level)
+        app.logger.debug(
+            "Combined Intelligence: consumption=%s normalized=%s suitability=%s priority=%s "
+            "demand_error=%s suitability_error=%s",
+            consumption, consumption_normalized, suitability, priority_score,
+            demand_result.get('error'), suitability_result.get('error')
+        )
+        
+        response = jsonify({
             "demand_forecast": demand_result,
             "suitability_analysis": suitability_result,
             "priority_score": round(priority_score, 3),
             "recommendation": "Proceed with production" if priority_score > 0.6 else "Review conditions"
-        }), 200
+        })
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
+        
+    except schemas.SchemaError as e:
+        return invalid_request(timer, e)
+    except Exception as e:
+        timer.error(e)
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/market_summary', methods=['GET'])
+def market_summary():
+    """
+    Market aggregates over the consumption history, served from rolling rollups.
+    
+    Returns:
+    {
+        "overall": {"total_consumption", "avg_price", "growth_pct", "latest_month"},
+        "products": {product: {"total_consumption", "avg_price", "growth_pct",
+                               "avg_genz_ratio", "avg_google_trends_score", "share_pct"}},
+        "regions": {region: {"total_consumption", "avg_price", "growth_pct"}},
+        "monthly": [{"month": "YYYY-MM", "consumption", "avg_price"}],
+        "region_products": {region: {product: {"consumption", "avg_price"}}}
+    }
+    growth_pct compares the latest month with the previous one.
+    """
+    timer = metrics.RequestTimer('market_summary')
+    if market_aggregates is None:
+        timer.error('data_not_loaded', model='market_aggregates')
+        return jsonify({"error": "Data not loaded"}), 500
+    
+    summary = market_aggregates.summary()
+    timer.lap('filter_merge')
+    response = jsonify(summary)
+    timer.lap('serialize')
+    timer.finish()
+    return response, 200
+
+@app.route('/district_profiles', methods=['GET'])
+def list_district_profiles():
+    """
+    District profile versions, and with ?district= that district's profile.
+    
+    Returns:
+    {
+        "versions": [{"version", "created_at", "districts", "current"}],
+        "profile": {"soil_ph", "soil_type", "rainfall", "temperature",
+                    "irrigation", "distance_to_city"}      # with ?district=
+    }
+    ?profile_version= selects the version the profile is read from.
+    """
+    timer = metrics.RequestTimer('district_profiles')
+    if district_profiles is None:
+        timer.error('data_not_loaded', model='district_profiles')
+        return jsonify({"error": "Data not loaded"}), 500
+    
+    try:
+        result = {"versions": district_profiles.versions()}
+        district = request.args.get('district')
+        if district is not None:
+            profiles = district_profiles.get(request.args.get('profile_version'))
+            result["profile"] = {"district": district, "version": profiles.version, **profiles.profile(district)}
+        timer.lap('filter_merge')
+    except feature_store.ProfileError as e:
+        timer.error(e, model='district_profiles')
+        return jsonify({"error": str(e)}), 404
+    
+    response = jsonify(result)
+    timer.lap('serialize')
+    timer.finish()
+    return response, 200
+
+@app.route('/district_profiles', methods=['POST'])
+def reload_district_profiles():
+    """
+    Rebuild the district profiles from crop_suitability.csv (requires X-Admin-Token).
+    
+    Returns:
+    {
+        "version": str,      # current version after the rebuild
+        "changed": bool,     # false when the CSV gives the same profiles
+        "versions": [{"version", "created_at", "districts", "current"}]
+    }
+    Earlier versions stay available to profile_version (see feature_store.py).
+    Each worker process rebuilds its own store.
+    """
+    timer = metrics.RequestTimer('district_profiles_reload')
+    if not profiling.is_admin(request.headers):
+        timer.error('forbidden', model='district_profiles')
+        return jsonify({"error": "Forbidden"}), 403
+    if district_profiles is None:
+        timer.error('data_not_loaded', model='district_profiles')
+        return jsonify({"error": "Data not loaded"}), 500
+    
+    try:
+        version, changed = district_profiles.reload()
+        timer.lap('allocate')
+        
+        response = jsonify({"version": version, "changed": changed, "versions": district_profiles.versions()})
+        timer.lap('serialize')
+        timer.finish()
+        return response, 200
         
     except Exception as e:
+        timer.error(e, model='district_profiles')
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
@@ -527,8 +1524,22 @@ if __name__ == '__main__':
     print("  POST /recommend_crop - Crop recommendation")
     print("  POST /predict_suitability - Crop suitability scoring")
     print("  POST /forecast_vegan_demand - Enhanced demand forecasting")
+    print("  POST /scenario_sweep - What-if demand surface over two features")
     print("  POST /optimize_supply_chain - Supply chain optimization")
+    print("  POST /optimize_supply_chain/delta - Apply supply/demand changes to kept solutions")
+    print("  POST /simulate_plan - Monte Carlo shortfall and cost risk of a supply plan")
+    print("  POST /optimize_network - District -> hub -> city min-cost flow plan")
+    print("  POST /plan_supply - Weekly/monthly shipment plan within shelf life")
+    print("  POST /nearest_sources - Nearest source districts to a place")
+    print("  POST /sources_within - Source districts within a road distance")
     print("  POST /combined_intelligence - Combined AI decision engine")
+    print("  GET  /market_summary - Market rollups by product, region and month")
+    print("  GET  /district_profiles - District profile versions and values")
+    print("  POST /district_profiles - Rebuild district profiles from the CSV (admin)")
+    print("  POST /ingest/consumption - Append consumption rows (admin)")
+    print("  POST /ingest/logistics - Append logistics rows (admin)")
+    print("  GET  /metrics - Prometheus latency and error metrics")
+    print("  GET  /admin/profiles - Slow-request profiles (admin)")
     print("=" * 60)
     
     # Get port from environment variable (for Heroku, Cloud platforms)
@@ -0,0 +1,138 @@
+"""
+VOIS Bulk Scoring
+Columnar batch input/output for /predict_suitability and /forecast_vegan_demand.
+
+Batch requests are recognised by their Content-Type:
+
+- application/vnd.apache.arrow.stream: an Arrow IPC stream with one column
+  per input field. Numeric columns are read with to_numpy(), which is
+  zero-copy for single-chunk columns without nulls. The response is the same
+  table with the prediction appended as a column (requires pyarrow).
+- application/x-npy: a NumPy structured array (np.save) with one field per
+  input field, loaded with allow_pickle=False. The response is a 1-D float64
+  .npy array of predictions in row order.
+- application/json with {"rows": [{...}, ...]}: the same batch as JSON, for
+  clients without Arrow/NumPy (or to compare against).
+
+Categorical fields may be sent as strings (encoded with one vectorised
+lookup) or as the model's integer codes. The whole batch goes through a
+single model.predict() call with no per-row Python conversions.
+
+benchmarks/bench_bulk_scoring.py compares the formats at 100k rows.
+"""
+
+import io
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+NPY = 'application/x-npy'
+BINARY_MIMETYPES = (ARROW_STREAM, NPY)
+
+# Input fields in model feature order: (field, 'num' | 'cat')
+SUITABILITY_FIELDS = (
+    ('soil_ph', 'num'), ('soil_type', 'cat'), ('rainfall', 'num'), ('temperature', 'num'),
+    ('irrigation', 'num'), ('distance_to_city', 'num'), ('crop', 'cat'), ('district', 'cat')
+)
+VEGAN_DEMAND_FIELDS = (
+    ('price', 'num'), ('genz_ratio', 'num'), ('google_trends_score', 'num'),
+    ('region', 'cat'), ('product', 'cat'), ('month', 'num'), ('quarter', 'num')
+)
+
+class BulkFormatError(ValueError):
+    """Malformed batch payload (reported as a 400)."""
+
+def media_type(content_type):
+    return (content_type or '').split(';')[0].strip().lower()
+
+def is_batch(content_type, json_body=None):
+    """True for Arrow/.npy bodies, or JSON bodies carrying a "rows" list."""
+    if media_type(content_type) in BINARY_MIMETYPES:
+        return True
+    return isinstance(json_body, dict) and isinstance(json_body.get('rows'), list)
+
+def read_columns(body, content_type, json_body=None):
+    """
+    Decode a batch into ({field: 1-D array}, source) where source is the
+    Arrow table for Arrow input (reused for the response) and None otherwise.
+    """
+    kind = media_type(content_type)
+    if kind == ARROW_STREAM:
+        if pa is None:
+            raise BulkFormatError("Arrow input requires pyarrow on the server; send application/x-npy instead")
+        try:
+            table = pa.ipc.open_stream(body).read_all()
+        except pa.ArrowInvalid as e:
+            raise BulkFormatError(f"Invalid Arrow IPC stream: {e}")
+        return {name: table.column(name).to_numpy() for name in table.column_names}, table
+
+    if kind == NPY:
+        try:
+            array = np.load(io.BytesIO(body), allow_pickle=False)
+        except ValueError as e:
+            raise BulkFormatError(f"Invalid .npy payload: {e}")
+        if array.dtype.names is None or array.ndim != 1:
+            raise BulkFormatError("Expected a 1-D structured array with one field per input column")
+        return {name: array[name] for name in array.dtype.names}, None
+
+    rows = json_body['rows']
+    if not rows:
+        raise BulkFormatError("No rows to score")
+    frame = pd.DataFrame.from_records(rows)
+    return {name: frame[name].to_numpy() for name in frame.columns}, None
+
+def feature_matrix(columns, fields, lookups):
+    """
+    Assemble the (n_rows, n_features) float matrix from decoded columns.
+    String categories are encoded with lookups ({field: {value: code}}).
+    """
+    missing = [name for name, _ in fields if name not in columns]
+    if missing:
+        raise BulkFormatError(f"Missing columns: {', '.join(missing)}")
+    lengths = {len(columns[name]) for name, _ in fields}
+    if len(lengths) != 1:
+        raise BulkFormatError("All columns must have the same length")
+
+    features = np.empty((lengths.pop(), len(fields)))
+    for position, (name, kind) in enumerate(fields):
+        values = columns[name]
+        if kind == 'cat' and np.issubdtype(values.dtype, np.integer):
+            # Model codes: must index the training vocabulary
+            invalid = (values < 0) | (values >= len(lookups[name]))
+            if invalid.any():
+                unknown = sorted(set(values[invalid].tolist()))[:10]
+                raise BulkFormatError(f"Unknown {name} code: {', '.join(map(str, unknown))}")
+        elif kind == 'cat':
+            vocabulary = list(lookups[name])
+            codes = pd.Categorical(values, categories=vocabulary).codes
+            if (codes < 0).any():
+                unknown = sorted(set(values[codes < 0].tolist()), key=str)[:10]
+                raise BulkFormatError(f"Unknown {name}: {', '.join(map(str, unknown))}")
+            values = codes
+        try:
+            features[:, position] = values
+        except (TypeError, ValueError):
+            raise BulkFormatError(f"Column {name} must be numeric")
+    if np.isnan(features).any():
+        raise BulkFormatError("Input columns must not contain nulls or NaN")
+    return features
+
+def write_predictions(predictions, output_field, content_type, source=None):
+    """Encode predictions as (body bytes, mimetype) in the request's binary format."""
+    kind = media_type(content_type)
+    if kind == ARROW_STREAM:
+        table = source.append_column(output_field, pa.array(predictions, type=pa.float64()))
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes(), ARROW_STREAM
+
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(predictions, dtype=np.float64), allow_pickle=False)
+    return buffer.getvalue(), NPY
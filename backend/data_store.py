@@ -0,0 +1,296 @@
+"""
+VOIS Data Store
+Append-only in-memory columnar tables for incremental data ingestion.
+
+Each ColumnarTable keeps one NumPy array per column with spare capacity
+(doubled when full), so appending k rows costs O(k) amortised. Readers call
+snapshot() and get an immutable DataFrame of the rows visible at that time:
+
+- Writers fill rows past the published size and then publish a new
+  (columns, size) state with a single reference swap. Rows a reader can see
+  are never modified, so readers take no lock (copy-on-write at the row level).
+- snapshot() materialises a DataFrame once per published size and caches it.
+
+Tables notify listeners of every append so dependent indexes (RouteIndex,
+market aggregates) are updated with just the new rows. Appended rows are
+flushed to the backing CSV by a background compaction every
+COMPACT_EVERY_ROWS rows or COMPACT_INTERVAL_SECONDS, whichever comes first:
+a daemon timer flushes a batch that no later append follows, and pending
+rows are flushed at interpreter exit.
+
+State is per process: with several gunicorn workers, each worker sees only
+the rows appended through it (until restart reloads the compacted CSV).
+"""
+
+import os
+import io
+import json
+import time
+import atexit
+import threading
+import numpy as np
+import pandas as pd
+
+COMPACT_EVERY_ROWS = int(os.environ.get('VOIS_COMPACT_ROWS', '1000'))
+COMPACT_INTERVAL_SECONDS = float(os.environ.get('VOIS_COMPACT_INTERVAL_SECONDS', '60'))
+
+# Column kinds: 'str', 'float', 'int' or 'date' (stored as 'YYYY-MM-DD' strings)
+CONSUMPTION_SCHEMA = {
+    'date': 'date',
+    'region': 'str',
+    'product': 'str',
+    'consumption': 'int',
+    'price': 'float',
+    'genz_ratio': 'float',
+    'google_trends_score': 'float'
+}
+
+LOGISTICS_SCHEMA = {
+    'source_district': 'str',
+    'destination_city': 'str',
+    'crop': 'str',
+    'transport_cost': 'float',
+    'distance': 'float',
+    'processing_capacity': 'float',
+    'storage_cost': 'float',
+    'supply_quantity': 'float'
+}
+
+NUMPY_DTYPES = {'str': object, 'date': object, 'float': np.float64, 'int': np.int64}
+
+# Largest number of row errors reported back for a rejected batch
+MAX_REPORTED_ERRORS = 20
+
+class ValidationError(ValueError):
+    """Rejected ingestion batch; errors lists per-row problems."""
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors or []
+
+def parse_records(body, content_type):
+    """
+    Parse an ingestion request body into a DataFrame.
+    Accepts NDJSON (application/x-ndjson), a JSON array of objects
+    (application/json) or CSV with a header row (text/csv).
+    """
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    text = body.decode('utf-8') if isinstance(body, bytes) else body
+
+    try:
+        if content_type in ('application/x-ndjson', 'application/jsonl', 'application/json-lines'):
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        elif content_type == 'application/json':
+            records = json.loads(text)
+            if isinstance(records, dict):
+                records = records.get('rows', [records])
+        elif content_type in ('text/csv', 'application/csv'):
+            return pd.read_csv(io.StringIO(text))
+        else:
+            raise ValidationError(
+                f"Unsupported content type '{content_type}'; "
+                "use application/x-ndjson, application/json or text/csv"
+            )
+    except (ValueError, pd.errors.ParserError) as e:
+        if isinstance(e, ValidationError):
+            raise
+        raise ValidationError(f"Could not parse body: {e}")
+
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise ValidationError("Expected a list of JSON objects")
+    return pd.DataFrame.from_records(records)
+
+def validate_rows(df, schema):
+    """
+    Check columns and coerce types in one vectorised pass per column.
+    Returns a DataFrame with exactly the schema's columns; raises ValidationError.
+    """
+    missing = [column for column in schema if column not in df.columns]
+    if missing:
+        raise ValidationError(f"Missing required columns: {', '.join(missing)}")
+    if len(df) == 0:
+        raise ValidationError("No rows to ingest")
+
+    clean = {}
+    invalid = np.zeros(len(df), dtype=bool)
+    errors = []
+    for column, kind in schema.items():
+        values = df[column]
+        if kind in ('float', 'int'):
+            coerced = pd.to_numeric(values, errors='coerce')
+            bad = coerced.isna().to_numpy()
+            if kind == 'int':
+                bad |= ~np.isclose(coerced.fillna(0) % 1, 0)
+        elif kind == 'date':
+            parsed = pd.to_datetime(values, errors='coerce', format='%Y-%m-%d')
+            bad = parsed.isna().to_numpy()
+            coerced = parsed.dt.strftime('%Y-%m-%d')
+        else:
+            bad = (values.isna() | (values.astype(str).str.strip() == '')).to_numpy()
+            coerced = values.astype(str).str.strip()
+
+        for row in np.flatnonzero(bad)[:MAX_REPORTED_ERRORS - len(errors)]:
+            errors.append({"row": int(row), "column": column, "value": str(values.iloc[row])})
+        invalid |= bad
+        clean[column] = coerced
+
+    if invalid.any():
+        raise ValidationError(f"{int(invalid.sum())} invalid row(s)", errors)
+
+    result = pd.DataFrame(clean)
+    for column, kind in schema.items():
+        if kind == 'int':
+            result[column] = result[column].round().astype(np.int64)
+    return result
+
+class ColumnarTable:
+    """Append-only columnar table with lock-free snapshots for readers."""
+
+    def __init__(self, name, df, schema, csv_path=None):
+        self.name = name
+        self.schema = schema
+        self.csv_path = csv_path
+        self._listeners = []
+        self._write_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._timer_lock = threading.Lock()
+        self._flush_timer = None  # threading.Timer flushing rows once the interval is due
+
+        size = len(df)
+        capacity = max(16, size * 2)
+        columns = {}
+        for column, kind in schema.items():
+            array = np.empty(capacity, dtype=NUMPY_DTYPES[kind])
+            array[:size] = df[column].to_numpy()
+            columns[column] = array
+
+        # Published state: readers only ever see rows [0, size)
+        self._state = (columns, size)
+        self._snapshot = (size, df.reset_index(drop=True)[list(schema)])
+        self._persisted_size = size
+        self._last_compaction = time.monotonic()
+        if csv_path:
+            atexit.register(self.compact, blocking=True)
+
+    def __len__(self):
+        return self._state[1]
+
+    def add_listener(self, callback):
+        """Register callback(new_rows_df, start_position), called after every append."""
+        self._listeners.append(callback)
+
+    def snapshot(self):
+        """Immutable DataFrame of all published rows (cached per published size)."""
+        columns, size = self._state
+        cached_size, cached = self._snapshot
+        if cached_size == size:
+            return cached
+        frame = pd.DataFrame({column: array[:size] for column, array in columns.items()})
+        self._snapshot = (size, frame)
+        return frame
+
+    def append(self, rows):
+        """
+        Append validated rows (a DataFrame with the schema's columns).
+        Returns the new row count.
+        """
+        count = len(rows)
+        with self._write_lock:
+            columns, size = self._state
+            capacity = len(next(iter(columns.values())))
+            if size + count > capacity:
+                new_capacity = max(capacity * 2, size + count)
+                grown = {}
+                for column, array in columns.items():
+                    new_array = np.empty(new_capacity, dtype=array.dtype)
+                    new_array[:size] = array[:size]
+                    grown[column] = new_array
+                columns = grown
+
+            for column in self.schema:
+                columns[column][size:size + count] = rows[column].to_numpy()
+
+            self._state = (columns, size + count)
+            for callback in self._listeners:
+                callback(rows, size)
+
+        self._maybe_compact()
+        return size + count
+
+    def _maybe_compact(self):
+        pending = len(self) - self._persisted_size
+        if not self.csv_path or pending <= 0:
+            return
+        elapsed = time.monotonic() - self._last_compaction
+        if pending >= COMPACT_EVERY_ROWS or elapsed >= COMPACT_INTERVAL_SECONDS:
+            threading.Thread(target=self._compact_pending, daemon=True).start()
+            return
+        # Nothing may be appended after this batch; flush it when the interval is due
+        with self._timer_lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(COMPACT_INTERVAL_SECONDS - elapsed, self._compact_pending)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _compact_pending(self):
+        with self._timer_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        # Waits for a compaction already running, so rows it missed are written here
+        self.compact(blocking=True)
+        # Rows appended meanwhile get their own flush
+        self._maybe_compact()
+
+    def compact(self, blocking=False):
+        """Append rows not yet on disk to the backing CSV. Returns rows written."""
+        if not self.csv_path or not self._compact_lock.acquire(blocking=blocking):
+            return 0
+        try:
+            columns, size = self._state
+            start = self._persisted_size
+            if size <= start:
+                return 0
+            pending = pd.DataFrame({column: array[start:size] for column, array in columns.items()})
+            pending.to_csv(self.csv_path, mode='a', header=False, index=False)
+            self._persisted_size = size
+            self._last_compaction = time.monotonic()
+            return size - start
+        finally:
+            self._compact_lock.release()
+
+class RouteIndex:
+    """
+    Row positions of a ColumnarTable grouped by key columns, e.g.
+    (destination_city, crop) -> positions of matching logistics rows.
+    Each key's positions are replaced (not mutated) on update, so lookups
+    need no lock.
+    """
+
+    def __init__(self, table, key_columns):
+        self.key_columns = key_columns
+        self._positions = {}
+        self.add_rows(table.snapshot(), 0)
+        table.add_listener(self.add_rows)
+
+    def add_rows(self, rows, start):
+        keys = list(zip(*(rows[column].to_numpy() for column in self.key_columns)))
+        positions = np.arange(start, start + len(rows))
+        grouped = {}
+        for key, position in zip(keys, positions):
+            grouped.setdefault(key, []).append(position)
+        for key, new_positions in grouped.items():
+            existing = self._positions.get(key)
+            combined = np.asarray(new_positions, dtype=np.int64)
+            if existing is not None:
+                combined = np.concatenate([existing, combined])
+            self._positions[key] = combined
+
+    def lookup(self, key, visible_rows=None):
+        """Positions for a key, limited to rows visible in a snapshot of visible_rows rows."""
+        positions = self._positions.get(key)
+        if positions is None:
+            return np.empty(0, dtype=np.int64)
+        if visible_rows is not None and len(positions) and positions[-1] >= visible_rows:
+            positions = positions[positions < visible_rows]
+        return positions
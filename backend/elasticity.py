@@ -0,0 +1,109 @@
+"""
+VOIS Price Elasticity
+Price elasticity of demand estimated from the vegan demand model itself.
+
+For a base scenario the model is scored at prices scaled by PRICE_STEPS
+(±10%, ±20%) and the elasticity is the least-squares slope of log(demand)
+against log(price), i.e. a finite-difference estimate that is robust to the
+step-shaped response of tree models. Many scenarios are estimated with one
+model.predict() call.
+
+build_table() runs after training for every (region, product, month) seen
+in the data, at the median price / GenZ ratio / trends score of that cell,
+and the table is saved to models/price_elasticity.json. At serving time
+ElasticityTable.lookup() is a dict lookup; combinations missing from the
+table are estimated on first use from the request's own features and
+cached in memory.
+"""
+
+import json
+import threading
+import numpy as np
+
+# Relative price changes evaluated around the base price
+PRICE_STEPS = (-0.2, -0.1, 0.0, 0.1, 0.2)
+
+# Column of the price feature in the vegan demand model's feature matrix
+PRICE_COLUMN = 0
+
+# Demand floor before taking logs (predictions are clipped at 0 elsewhere)
+MIN_DEMAND = 1.0
+
+def estimate(model, base_rows):
+    """
+    Elasticities for an (n, n_features) array of base scenarios.
+    Returns an array of n values (typically negative: demand falls as price rises).
+    """
+    base_rows = np.atleast_2d(np.asarray(base_rows, dtype=float))
+    multipliers = 1.0 + np.asarray(PRICE_STEPS)
+
+    # (n, steps, features) grid with only the price column varying
+    grid = np.repeat(base_rows[:, np.newaxis, :], len(multipliers), axis=1)
+    grid[:, :, PRICE_COLUMN] *= multipliers[np.newaxis, :]
+
+    demand = model.predict(grid.reshape(-1, base_rows.shape[1])).reshape(len(base_rows), -1)
+    log_demand = np.log(np.maximum(demand, MIN_DEMAND))
+    log_price = np.log(multipliers)  # log(p * m) - log(p) = log(m); slope is unchanged
+
+    centered_price = log_price - log_price.mean()
+    centered_demand = log_demand - log_demand.mean(axis=1, keepdims=True)
+    return centered_demand @ centered_price / (centered_price @ centered_price)
+
+def score(elasticity):
+    """Map an elasticity to a 0-1 score where 1 means demand ignores price."""
+    return 1.0 / (1.0 + abs(elasticity))
+
+def table_key(region, product, month):
+    return f"{region}|{product}|{int(month)}"
+
+def build_table(model, df, categories, feature_columns):
+    """
+    Estimate elasticities for every (region, product, month) cell in df.
+    df holds the model's feature columns (region/product integer-coded);
+    categories maps 'region'/'product' to their vocabularies.
+    """
+    keys = ['region_encoded', 'product_encoded', 'month']
+    others = [column for column in feature_columns if column not in keys]
+    medians = df.groupby(keys)[others].median().reset_index()
+    values = estimate(model, medians[list(feature_columns)].to_numpy(dtype=float))
+
+    entries = {}
+    for (region_code, product_code, month, price), value in zip(
+            medians[keys + ['price']].itertuples(index=False), values):
+        key = table_key(categories['region'][int(region_code)], categories['product'][int(product_code)], month)
+        entries[key] = {"elasticity": round(float(value), 4), "base_price": round(float(price), 2)}
+    return {"price_steps": list(PRICE_STEPS), "entries": entries}
+
+def save_table(table, path):
+    with open(path, 'w') as f:
+        json.dump(table, f, indent=2, sort_keys=True)
+
+class ElasticityTable:
+    """O(1) elasticity lookups with lazy estimation of unseen combinations."""
+
+    def __init__(self, entries=None):
+        self._entries = {key: entry['elasticity'] for key, entry in (entries or {}).items()}
+        self._lock = threading.Lock()
+        self.lazy_fills = 0
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f).get('entries'))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, model, region, product, month, base_row):
+        """
+        Elasticity for (region, product, month); base_row (the request's
+        feature row) is used to estimate it if the combination is not in the table.
+        """
+        key = table_key(region, product, month)
+        value = self._entries.get(key)
+        if value is None:
+            value = round(float(estimate(model, base_row)[0]), 4)
+            with self._lock:
+                value = self._entries.setdefault(key, value)
+                self.lazy_fills += 1
+        return value
@@ -0,0 +1,157 @@
+"""
+VOIS District Profiles
+Precomputed per-district crop suitability features for /predict_suitability.
+
+Soil pH, soil type, rainfall, temperature, irrigation and distance to city
+are properties of the district, not of the request, so clients may send just
+district and crop and have the rest filled from a profile built from
+crop_suitability.csv: the median of each numeric field and the most frequent
+soil type and irrigation value over the district's rows.
+
+Profiles are versioned: the version id is a hash of the profile table, so
+every worker building from the same CSV agrees on it. reload() (POST
+/district_profiles) rebuilds them from the CSV; a changed table becomes the
+new current version while the last PROFILE_VERSIONS stay available for
+clients that pin one. Each version caches the encoded feature row of every
+(district, crop) it has served, so a repeat request skips encoding
+entirely, and batches fill their missing columns with one vectorized join.
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Profile fields in model feature order: (field, 'median' | 'mode')
+PROFILE_FIELDS = (
+    ('soil_ph', 'median'), ('soil_type', 'mode'), ('rainfall', 'median'),
+    ('temperature', 'median'), ('irrigation', 'mode'), ('distance_to_city', 'median')
+)
+
+# Profile versions kept for clients that pin profile_version (oldest are dropped)
+PROFILE_VERSIONS = int(os.environ.get('VOIS_DISTRICT_PROFILE_VERSIONS', '3'))
+
+class ProfileError(ValueError):
+    """Unknown district or profile version (reported as a 400)."""
+
+def _mode(values):
+    modes = values.mode()
+    return modes.iloc[0] if len(modes) else None
+
+class DistrictProfiles:
+    """One version of the district profile table plus its encoded-row cache."""
+
+    def __init__(self, df):
+        grouped = df.groupby('district')
+        self.table = pd.DataFrame({
+            field: grouped[field].median() if how == 'median' else grouped[field].agg(_mode)
+            for field, how in PROFILE_FIELDS
+        })
+        self.table['irrigation'] = self.table['irrigation'].astype(int)
+        self.version = hashlib.sha1(self.table.to_csv().encode()).hexdigest()[:12]
+        self.created_at = datetime.now().isoformat(timespec='seconds')
+        self._records = self.table.to_dict('index')
+        self._rows = {}  # (district, crop) -> encoded feature row; at most districts x crops entries
+
+    def __len__(self):
+        return len(self.table)
+
+    def profile(self, district):
+        """{field: value} for district; ProfileError if it has no profile."""
+        record = self._records.get(district)
+        if record is None:
+            raise ProfileError(f"No profile for district: {district}")
+        return record
+
+    def encoded_row(self, district, crop, encode):
+        """
+        (1, 8) feature row for district and crop from the profile, encoded
+        with encode(feature, value) -> code on first use and cached after.
+        """
+        key = (district, crop)
+        row = self._rows.get(key)
+        if row is None:
+            record = self.profile(district)
+            row = np.array([[
+                record['soil_ph'], encode('soil_type', record['soil_type']), record['rainfall'],
+                record['temperature'], record['irrigation'], record['distance_to_city'],
+                encode('crop', crop), encode('district', district)
+            ]])
+            self._rows[key] = row
+        return row
+
+    def fill_columns(self, columns, district_vocabulary):
+        """
+        Add the profile fields missing from a batch's {field: array} columns,
+        joined on its district column (names, or model codes indexing
+        district_vocabulary). Columns sent by the client are kept.
+        """
+        missing = [field for field, _ in PROFILE_FIELDS if field not in columns]
+        if not missing or 'district' not in columns:
+            return columns
+        districts = np.asarray(columns['district'])
+        if np.issubdtype(districts.dtype, np.integer):
+            invalid = (districts < 0) | (districts >= len(district_vocabulary))
+            if invalid.any():
+                unknown = sorted(set(districts[invalid].tolist()))[:10]
+                raise ProfileError(f"Unknown district code: {', '.join(map(str, unknown))}")
+            districts = np.asarray(district_vocabulary, dtype=object)[districts]
+        positions = pd.Categorical(districts, categories=self.table.index).codes
+        if (positions < 0).any():
+            unknown = sorted(set(districts[positions < 0].tolist()), key=str)[:10]
+            raise ProfileError(f"No profile for district: {', '.join(map(str, unknown))}")
+        filled = dict(columns)
+        for field in missing:
+            filled[field] = self.table[field].to_numpy()[positions]
+        return filled
+
+    def info(self):
+        return {"version": self.version, "created_at": self.created_at, "districts": len(self)}
+
+class DistrictProfileStore:
+    """Versions of DistrictProfiles; the latest built is current."""
+
+    def __init__(self, source_path=None, max_versions=PROFILE_VERSIONS):
+        self.source_path = source_path  # crop_suitability.csv, re-read by reload()
+        self.max_versions = max(1, max_versions)
+        self._versions = OrderedDict()  # version -> DistrictProfiles, oldest first
+        self._lock = threading.Lock()
+
+    def update(self, df):
+        """Build profiles from crop_suitability rows; returns the current version id."""
+        profiles = DistrictProfiles(df)
+        with self._lock:
+            # An unchanged table keeps its version (and warm row cache)
+            if profiles.version not in self._versions:
+                self._versions[profiles.version] = profiles
+            self._versions.move_to_end(profiles.version)
+            while len(self._versions) > self.max_versions:
+                self._versions.popitem(last=False)
+            return profiles.version
+
+    def reload(self):
+        """Rebuild from source_path; returns (current version id, whether it is a new version)."""
+        previous = self.get().version if self._versions else None
+        version = self.update(pd.read_csv(self.source_path))
+        return version, version != previous
+
+    def get(self, version=None):
+        """DistrictProfiles of version (current when None); ProfileError if unknown."""
+        with self._lock:
+            if version is None:
+                if not self._versions:
+                    raise ProfileError("No district profiles loaded")
+                return next(reversed(self._versions.values()))
+            profiles = self._versions.get(version)
+        if profiles is None:
+            raise ProfileError(f"Unknown profile_version: {version}")
+        return profiles
+
+    def versions(self):
+        """[{"version", "created_at", "districts", "current"}], newest first."""
+        with self._lock:
+            entries = list(self._versions.values())
+        return [{**profiles.info(), "current": i == 0} for i, profiles in enumerate(reversed(entries))]
@@ -0,0 +1,125 @@
+"""
+VOIS Inference Pool
+Optional process pool that runs model predictions outside the web process.
+
+sklearn forest prediction only partly releases the GIL, so under a threaded
+server concurrent heavy requests mostly take turns on one core. With
+VOIS_INFERENCE_WORKERS=N (N > 0), load_models() starts N worker processes
+that each load every model once, and replaces the served models with
+PooledModel proxies whose predict() runs in a pool worker. Handlers,
+scenario sweeps, elasticity estimates and batch scoring all go through
+model.predict(), so they use the pool without changes.
+
+Feature matrices of at least VOIS_INFERENCE_SHM_BYTES (default 1 MiB) are
+handed over in a multiprocessing.shared_memory block instead of being
+pickled through the pool's pipe; smaller ones are sent inline.
+
+The pool is forked at startup, before the server starts its request
+threads, and its workers are started eagerly for the same reason. With
+VOIS_SHARED_MODELS=true the pool workers attach to the shared
+memory-mapped forests too (see shared_models.py).
+"""
+
+import os
+import sys
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+import shared_models
+
+POOL_WORKERS = int(os.environ.get('VOIS_INFERENCE_WORKERS', '0'))
+SHM_MIN_BYTES = int(os.environ.get('VOIS_INFERENCE_SHM_BYTES', str(1 << 20)))
+
+# Models loaded in a pool worker process: name -> estimator
+_worker_models = {}
+
+def _init_worker(model_paths, use_shared):
+    for name, path in model_paths.items():
+        artifact = None
+        if use_shared:
+            artifact = shared_models.load(os.path.basename(path)[:-len('.pkl')], path)
+        if artifact is None:
+            with open(path, 'rb') as f:
+                artifact = pickle.load(f)
+        _worker_models[name] = artifact['model'] if isinstance(artifact, dict) else artifact
+
+def _ping(_):
+    return os.getpid()
+
+def _attach_block(block_name):
+    """Open an existing shared memory block without registering it for cleanup in this process."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=block_name, track=False)
+    block = shared_memory.SharedMemory(name=block_name)
+    from multiprocessing import resource_tracker
+    resource_tracker.unregister(block._name, 'shared_memory')  # the parent owns and unlinks it
+    return block
+
+def _predict(name, features):
+    """Run in a pool worker; features is an array or (block name, shape, dtype)."""
+    if not isinstance(features, tuple):
+        return _worker_models[name].predict(features)
+
+    block_name, shape, dtype = features
+    block = _attach_block(block_name)
+    try:
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        predictions = _worker_models[name].predict(array)
+        del array
+        return predictions
+    finally:
+        block.close()
+
+class InferencePool:
+    """Process pool hosting one copy of every model per worker."""
+
+    def __init__(self, model_paths, workers=POOL_WORKERS, use_shared=None):
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        use_shared = shared_models.ENABLED if use_shared is None else use_shared
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context,
+            initializer=_init_worker, initargs=(dict(model_paths), use_shared)
+        )
+        # Start every worker now rather than on first use from a request thread
+        list(self._executor.map(_ping, range(workers * 2)))
+
+    def predict(self, name, features):
+        features = np.ascontiguousarray(features, dtype=np.float64)
+        if features.nbytes < SHM_MIN_BYTES:
+            return self._executor.submit(_predict, name, features).result()
+
+        block = shared_memory.SharedMemory(create=True, size=features.nbytes)
+        try:
+            view = np.ndarray(features.shape, dtype=features.dtype, buffer=block.buf)
+            view[...] = features
+            del view
+            return self._executor.submit(
+                _predict, name, (block.name, features.shape, features.dtype.str)
+            ).result()
+        finally:
+            block.close()
+            block.unlink()
+
+    def model(self, name):
+        return PooledModel(self, name)
+
+    def shutdown(self):
+        self._executor.shutdown()
+
+class PooledModel:
+    """Stand-in for a served model whose predict() runs in the inference pool."""
+
+    def __init__(self, pool, name):
+        self.pool = pool
+        self.name = name
+
+    def predict(self, X):
+        return self.pool.predict(self.name, X)
+
+    def __repr__(self):
+        return f"PooledModel({self.name!r}, workers={self.pool.workers})"
@@ -0,0 +1,406 @@
+"""
+VOIS Logistics Engine
+Geo-aware lane costs for any (source district, destination city, crop).
+
+logistics_supply.csv records a distance and transport cost only for the
+lanes that happen to be sampled, so a destination/crop pair without rows
+has no routes at all. The engine instead keeps coordinates for every known
+district and city and precomputes a dense road-distance matrix
+
+    distance[source, city] = haversine(source, city) * ROAD_FACTOR
+
+once at load time. Lane cost is then computed on demand as
+distance * cost-per-km of the crop, where the per-crop rates are the median
+transport_cost / distance observed in the CSV. Per-(district, crop) supply
+quantity, processing capacity, storage cost and suitability score are held
+in dense arrays too, so candidates() builds every source's lane for a
+destination with a few NumPy indexing operations.
+
+/optimize_supply_chain uses the recorded lanes when the CSV covers the
+destination and crop, and the engine's estimated lanes otherwise.
+
+network_plan() routes supply through processing hubs instead of shipping
+farm -> city directly. It solves a min-cost flow (see min_cost_flow.py) over
+
+    source -> district (supply) -> hub in -> hub out (processing capacity,
+    storage cost) -> city (demand) -> sink
+
+where every district with processing capacity for the crop is a hub and
+each district connects only to its HUBS_PER_SOURCE nearest hubs, so the
+graph stays sparse.
+
+nearest() and within() answer "the k closest sources" and "every source
+within r km" from a SpatialIndex (a haversine BallTree over the district
+coordinates) instead of scanning the logistics rows. Crop and role filters
+are boolean masks over the districts, precomputed per (role, crop) by
+update(), applied to the tree's candidates.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+from min_cost_flow import MinCostFlow, EPSILON
+
+# Road distance relative to great-circle distance (typical for Indian highways)
+ROAD_FACTOR = float(os.environ.get('VOIS_ROAD_FACTOR', '1.3'))
+EARTH_RADIUS_KM = 6371.0
+
+# transport_cost per km for crops with no recorded lanes
+DEFAULT_COST_PER_KM = 1.25
+
+# transport_cost (logistics_supply.csv, and every lane the API reports) is a
+# lane's cost per 1000 tons shipped; quantities are tons. Costs of shipped
+# quantities all go through shipping_cost() / per_ton().
+TONS_PER_TRANSPORT_COST = 1000
+
+# Processing hubs each source district may ship to in network plans (nearest first)
+HUBS_PER_SOURCE = 5
+
+# (latitude, longitude) of the source districts in the datasets
+DISTRICT_COORDINATES = {
+    'Adilabad': (19.6641, 78.5320),
+    'Anantapur': (14.6819, 77.6006),
+    'Hindupur': (13.8290, 77.4910),
+    'Karimnagar': (18.4386, 79.1288),
+    'Kurnool': (15.8281, 78.0373),
+    'Mahabubnagar': (16.7488, 78.0035),
+    'Medak': (18.0453, 78.2608),
+    'Nalgonda': (17.0575, 79.2671),
+    'Nizamabad': (18.6725, 78.0941),
+    'Warangal': (17.9689, 79.5941)
+}
+
+# (latitude, longitude) of the destination cities and consumption regions
+CITY_COORDINATES = {
+    'Bengaluru': (12.9716, 77.5946),
+    'Chennai': (13.0827, 80.2707),
+    'Delhi': (28.7041, 77.1025),
+    'Hyderabad': (17.3850, 78.4867),
+    'Kolkata': (22.5726, 88.3639),
+    'Mumbai': (19.0760, 72.8777),
+    'Pune': (18.5204, 73.8567)
+}
+
+def haversine_matrix(origins, destinations):
+    """Great-circle distances in km between every (lat, lon) origin and destination."""
+    origins = np.radians(np.asarray(origins, dtype=float))[:, np.newaxis, :]
+    destinations = np.radians(np.asarray(destinations, dtype=float))[np.newaxis, :, :]
+    delta = destinations - origins
+    a = (np.sin(delta[..., 0] / 2) ** 2 +
+         np.cos(origins[..., 0]) * np.cos(destinations[..., 0]) * np.sin(delta[..., 1] / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+# Site roles for spatial queries: districts with supply and/or processing capacity
+SITE_ROLES = ('source', 'processing', 'any')
+
+class NetworkError(ValueError):
+    """A network plan or query that cannot be answered (unknown crop or place)."""
+
+class SpatialIndex:
+    """BallTree over (lat, lon) sites; queries return road distances in km, nearest first."""
+
+    def __init__(self, coordinates, road_factor=ROAD_FACTOR):
+        self.size = len(coordinates)
+        self.tree = BallTree(np.radians(np.asarray(coordinates, dtype=float)), metric='haversine')
+        self.km_per_radian = EARTH_RADIUS_KM * road_factor
+
+    def nearest(self, point, k, mask=None):
+        """(indices, km) of the k nearest sites where mask is true."""
+        point = np.radians([point])
+        wanted = k
+        while True:
+            distance, index = self.tree.query(point, k=min(wanted, self.size))
+            distance, index = distance[0], index[0]
+            if mask is not None:
+                keep = mask[index]
+                distance, index = distance[keep], index[keep]
+            # Masked-out sites take slots, so widen the search until k pass
+            if len(index) >= k or wanted >= self.size:
+                return index[:k], distance[:k] * self.km_per_radian
+            wanted *= 4
+
+    def within(self, point, radius_km, mask=None):
+        """(indices, km) of the sites within radius_km where mask is true."""
+        index, distance = self.tree.query_radius(
+            np.radians([point]), r=radius_km / self.km_per_radian, return_distance=True, sort_results=True
+        )
+        index, distance = index[0], distance[0]
+        if mask is not None:
+            keep = mask[index]
+            index, distance = index[keep], distance[keep]
+        return index, distance * self.km_per_radian
+
+def per_ton(transport_cost):
+    """Cost of one ton on a lane with the given transport_cost."""
+    return transport_cost / TONS_PER_TRANSPORT_COST
+
+def shipping_cost(transport_cost, tons):
+    """Cost of shipping tons on a lane with the given transport_cost."""
+    return transport_cost * tons / TONS_PER_TRANSPORT_COST
+
+def lane_aggregates(logistics_df):
+    """
+    (crops, cost per km by crop, per-(source_district, crop) medians of
+    LogisticsEngine.SUPPLY_FIELDS) from logistics rows; what update() needs.
+    sql_store.SQLiteStore.lane_aggregates() computes the same inside SQLite.
+    """
+    lanes = logistics_df[logistics_df['distance'] > 0]
+    rates = (lanes['transport_cost'] / lanes['distance']).groupby(lanes['crop']).median()
+    medians = logistics_df.groupby(['source_district', 'crop'])[list(LogisticsEngine.SUPPLY_FIELDS)].median()
+    return set(logistics_df['crop'].unique()), rates, medians
+
+class LogisticsEngine:
+    """Dense distance matrix plus per-(district, crop) supply attributes."""
+
+    # Per-(district, crop) attributes taken from the logistics rows (median over lanes)
+    SUPPLY_FIELDS = ('supply_quantity', 'processing_capacity', 'storage_cost')
+
+    def __init__(self, district_coordinates=DISTRICT_COORDINATES, city_coordinates=CITY_COORDINATES,
+                 road_factor=ROAD_FACTOR):
+        self.sources = list(district_coordinates)
+        self.cities = list(city_coordinates)
+        self.source_index = {name: i for i, name in enumerate(self.sources)}
+        self.city_index = {name: j for j, name in enumerate(self.cities)}
+        self.coordinates = np.array([district_coordinates[name] for name in self.sources])
+        self.city_coordinates = np.array([city_coordinates[name] for name in self.cities])
+        self.distance = np.round(
+            haversine_matrix(self.coordinates, self.city_coordinates) * road_factor, 1
+        )
+        # District -> district road distance, for farm -> processing hub legs
+        self.hub_distance = np.round(
+            haversine_matrix(self.coordinates, self.coordinates) * road_factor, 1
+        )
+        self.sites = SpatialIndex(self.coordinates, road_factor)
+        # Crop-dependent arrays, replaced together by update() so readers see one version
+        self.tables = {
+            'crop_index': {},
+            'cost_per_km': np.empty(0),
+            'suitability': np.empty((len(self.sources), 0)),
+            **{field: np.empty((len(self.sources), 0)) for field in self.SUPPLY_FIELDS}
+        }
+        self.tables['site_masks'] = self._site_masks(self.tables)
+
+    @property
+    def crops(self):
+        return list(self.tables['crop_index'])
+
+    def update(self, logistics_df, suitability_df=None):
+        """
+        (Re)derive cost rates and supply attributes from the logistics rows.
+        Suitability scores are replaced when suitability_df is given and kept otherwise.
+        """
+        return self.update_aggregates(*lane_aggregates(logistics_df), suitability_df)
+
+    def update_aggregates(self, crops, rates, medians, suitability_df=None):
+        """
+        update() from precomputed lane_aggregates(), so the logistics rows
+        themselves need not be loaded (see sql_store.SQLiteStore.lane_aggregates).
+        """
+        previous = self.tables
+        crops = set(crops)
+        if suitability_df is not None:
+            crops |= set(suitability_df['crop'].unique())
+        # Existing crops keep their column; new ones are appended
+        crop_index = dict(previous['crop_index'])
+        for crop in sorted(crops - set(crop_index)):
+            crop_index[crop] = len(crop_index)
+        shape = (len(self.sources), len(crop_index))
+
+        tables = {
+            'crop_index': crop_index,
+            'cost_per_km': np.array([rates.get(crop, DEFAULT_COST_PER_KM) for crop in crop_index])
+        }
+
+        medians = medians[medians.index.get_level_values(0).isin(list(self.source_index))]
+        rows = [self.source_index[d] for d in medians.index.get_level_values(0)]
+        cols = [crop_index[c] for c in medians.index.get_level_values(1)]
+        for field in self.SUPPLY_FIELDS:
+            tables[field] = np.full(shape, np.nan)
+            tables[field][rows, cols] = medians[field].to_numpy()
+
+        tables['suitability'] = np.full(shape, np.nan)
+        if suitability_df is not None:
+            known = suitability_df[suitability_df['district'].isin(self.source_index)]
+            scores = known.groupby(['district', 'crop'])['suitability_score'].median()
+            tables['suitability'][
+                [self.source_index[d] for d in scores.index.get_level_values(0)],
+                [crop_index[c] for c in scores.index.get_level_values(1)]
+            ] = scores.to_numpy()
+        else:
+            tables['suitability'][:, :previous['suitability'].shape[1]] = previous['suitability']
+
+        tables['site_masks'] = self._site_masks(tables)
+        self.tables = tables
+        return self
+
+    @staticmethod
+    def _site_masks(tables):
+        """{(role, crop or None): districts mask}; None matches a role for any crop."""
+        source = ~np.isnan(tables['supply_quantity'])
+        processing = ~np.isnan(tables['processing_capacity'])
+        masks = {}
+        for role, by_crop in (('source', source), ('processing', processing), ('any', source | processing)):
+            masks[role, None] = by_crop.any(axis=1)
+            for crop, k in tables['crop_index'].items():
+                masks[role, crop] = by_crop[:, k]
+        return masks
+
+    def locate(self, place):
+        """(lat, lon) of a known city or district; None if unknown."""
+        if place in self.city_index:
+            return tuple(map(float, self.city_coordinates[self.city_index[place]]))
+        if place in self.source_index:
+            return tuple(map(float, self.coordinates[self.source_index[place]]))
+        return None
+
+    def _site_mask(self, crop, role):
+        tables = self.tables
+        if crop is not None and crop not in tables['crop_index']:
+            raise NetworkError(f"No supply data for crop: {crop}")
+        return tables, tables['site_masks'][role, crop]
+
+    def nearest(self, point, k=5, crop=None, role='source'):
+        """The k districts nearest to (lat, lon) with the role (for crop, if given)."""
+        tables, mask = self._site_mask(crop, role)
+        return self._site_records(tables, crop, *self.sites.nearest(point, k, mask))
+
+    def within(self, point, radius_km, crop=None, role='source'):
+        """Districts with the role (for crop, if given) within radius_km road distance of (lat, lon)."""
+        tables, mask = self._site_mask(crop, role)
+        return self._site_records(tables, crop, *self.sites.within(point, radius_km, mask))
+
+    def _site_records(self, tables, crop, indices, distances):
+        k = tables['crop_index'].get(crop)
+        records = []
+        for i, distance in zip(indices, distances):
+            record = {
+                "district": self.sources[i], "distance_km": round(float(distance), 1),
+                "latitude": float(self.coordinates[i, 0]), "longitude": float(self.coordinates[i, 1])
+            }
+            if k is not None:
+                for field, name in [(field, field) for field in self.SUPPLY_FIELDS] + [('suitability', 'suitability_score')]:
+                    value = tables[field][i, k]
+                    record[name] = None if np.isnan(value) else round(float(value), 3)
+            records.append(record)
+        return records
+
+    def lane_cost(self, source, destination, crop):
+        """transport_cost (per 1000 tons) of one lane; None if a place is unknown."""
+        i, j = self.source_index.get(source), self.city_index.get(destination)
+        if i is None or j is None:
+            return None
+        tables = self.tables
+        k = tables['crop_index'].get(crop)
+        rate = tables['cost_per_km'][k] if k is not None else DEFAULT_COST_PER_KM
+        return float(self.distance[i, j] * rate)
+
+    def candidates(self, destination, crop):
+        """
+        Estimated lanes from every district with supply of crop to destination,
+        with the columns of the recorded supply candidates (empty if unknown).
+        """
+        tables = self.tables
+        j, k = self.city_index.get(destination), tables['crop_index'].get(crop)
+        if j is None or k is None:
+            return pd.DataFrame()
+        sources = np.flatnonzero(~np.isnan(tables['supply_quantity'][:, k]))
+        distance = self.distance[sources, j]
+        names = [self.sources[i] for i in sources]
+        return pd.DataFrame({
+            'source_district': names,
+            'destination_city': destination,
+            'crop': crop,
+            'transport_cost': np.round(distance * tables['cost_per_km'][k], 2),
+            'distance': distance,
+            **{field: tables[field][sources, k] for field in self.SUPPLY_FIELDS},
+            'district': names,
+            'suitability_score': tables['suitability'][sources, k]
+        })
+
+    def network_plan(self, crop, demands, storage_months=1.0):
+        """
+        Min-cost district -> hub -> city plan for {city: required tons} of crop.
+        Legs cost per_ton() of their transport_cost; hubs charge storage_cost
+        per ton per month for storage_months.
+        Raises NetworkError for an unknown crop or city.
+        """
+        tables = self.tables
+        k = tables['crop_index'].get(crop)
+        if k is None:
+            raise NetworkError(f"No supply data for crop: {crop}")
+        unknown = [city for city in demands if city not in self.city_index]
+        if unknown:
+            raise NetworkError(f"Unknown destination city: {', '.join(unknown)}")
+
+        supply = tables['supply_quantity'][:, k]
+        capacity = tables['processing_capacity'][:, k]
+        storage = tables['storage_cost'][:, k] * storage_months
+        rate = float(tables['cost_per_km'][k])
+        farms = np.flatnonzero(~np.isnan(supply))
+        hubs = np.flatnonzero(~np.isnan(capacity))
+
+        graph = MinCostFlow()
+        source, sink = graph.add_node(), graph.add_node()
+        hub_in = {h: graph.add_node() for h in hubs}
+        hub_out = {h: graph.add_node() for h in hubs}
+        city_node = {city: graph.add_node() for city in demands}
+
+        legs = {'farm_to_hub': [], 'hub_processing': [], 'hub_to_city': []}
+        for i in farms:
+            farm = graph.add_node()
+            graph.add_edge(source, farm, supply[i], 0.0)
+            nearest = hubs[np.argsort(self.hub_distance[i, hubs], kind='stable')[:HUBS_PER_SOURCE]]
+            for h in nearest:
+                unit_cost = per_ton(float(self.hub_distance[i, h]) * rate)
+                legs['farm_to_hub'].append((graph.add_edge(farm, hub_in[h], np.inf, unit_cost), i, h, unit_cost))
+        for h in hubs:
+            unit_cost = float(storage[h])
+            legs['hub_processing'].append((graph.add_edge(hub_in[h], hub_out[h], capacity[h], unit_cost), h, None, unit_cost))
+            for city in demands:
+                unit_cost = per_ton(float(self.distance[h, self.city_index[city]]) * rate)
+                legs['hub_to_city'].append((graph.add_edge(hub_out[h], city_node[city], np.inf, unit_cost), h, city, unit_cost))
+        demand_edges = {city: graph.add_edge(city_node[city], sink, quantity, 0.0)
+                        for city, quantity in demands.items()}
+
+        delivered, total_cost = graph.solve(source, sink)
+        return self._network_report(graph, legs, demand_edges, capacity, delivered, total_cost)
+
+    def _network_report(self, graph, legs, demand_edges, capacity, delivered, total_cost):
+        stage_costs = {stage: 0.0 for stage in legs}
+        stages = {stage: [] for stage in legs}
+        for stage, entries in legs.items():
+            for edge, a, b, unit_cost in entries:
+                quantity = graph.flow(edge)
+                if quantity <= EPSILON:
+                    continue
+                cost = quantity * unit_cost
+                stage_costs[stage] += cost
+                if stage == 'farm_to_hub':
+                    entry = {"source_district": self.sources[a], "hub": self.sources[b]}
+                elif stage == 'hub_processing':
+                    entry = {"hub": self.sources[a], "capacity": round(float(capacity[a]), 1),
+                             "utilization_pct": round(quantity / capacity[a] * 100, 1)}
+                else:
+                    entry = {"hub": self.sources[a], "destination_city": b}
+                entry.update(quantity=round(quantity, 2), cost=round(cost, 2))
+                stages[stage].append(entry)
+
+        deliveries = {}
+        for city, edge in demand_edges.items():
+            required, shipped = graph.capacity[edge // 2], graph.flow(edge)
+            deliveries[city] = {"required": round(required, 2), "delivered": round(shipped, 2),
+                                "unmet": round(required - shipped, 2)}
+        return {
+            "stages": stages,
+            "deliveries": deliveries,
+            "costs": {
+                "transport_to_hubs": round(stage_costs['farm_to_hub'], 2),
+                "storage": round(stage_costs['hub_processing'], 2),
+                "transport_to_cities": round(stage_costs['hub_to_city'], 2),
+                "total": round(total_cost, 2)
+            },
+            "delivered": round(delivered, 2),
+            "graph": {"nodes": graph.node_count, "edges": graph.edge_count}
+        }
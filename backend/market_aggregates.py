@@ -0,0 +1,136 @@
+"""
+VOIS Market Aggregates
+Rolling rollups over vegan consumption data for the /market_summary endpoint.
+
+Rows are folded into per-(product, region, month) cells holding running
+sums, so the summary is built from at most products x regions x months
+cells instead of scanning the full consumption history. update() folds in
+only the new rows, making it cheap to call as data arrives. The built
+summary is cached until the next update.
+"""
+
+import threading
+import pandas as pd
+
+# Running sums kept per (product, region, month) cell
+CELL_FIELDS = ('consumption', 'price_sum', 'genz_sum', 'trends_sum', 'rows')
+
+def _growth_pct(monthly_consumption):
+    """Growth of the latest month over the previous one, in percent (None if unknown)."""
+    months = sorted(monthly_consumption)
+    if len(months) < 2 or monthly_consumption[months[-2]] == 0:
+        return None
+    latest, previous = monthly_consumption[months[-1]], monthly_consumption[months[-2]]
+    return round((latest - previous) / previous * 100, 2)
+
+class _Accumulator:
+    """Sums of the cell fields over a group of cells, plus consumption by month."""
+
+    __slots__ = ('sums', 'by_month')
+
+    def __init__(self):
+        self.sums = [0.0] * len(CELL_FIELDS)
+        self.by_month = {}
+
+    def add(self, month, cell):
+        for i, value in enumerate(cell):
+            self.sums[i] += value
+        self.by_month[month] = self.by_month.get(month, 0.0) + cell[0]
+
+    def to_dict(self, include_genz=False):
+        consumption, price_sum, genz_sum, trends_sum, rows = self.sums
+        result = {
+            "total_consumption": round(consumption, 2),
+            "avg_price": round(price_sum / rows, 2) if rows else None,
+            "growth_pct": _growth_pct(self.by_month)
+        }
+        if include_genz:
+            result["avg_genz_ratio"] = round(genz_sum / rows, 3) if rows else None
+            result["avg_google_trends_score"] = round(trends_sum / rows, 1) if rows else None
+        return result
+
+class MarketAggregates:
+    """Incrementally maintained consumption rollups by product, region and month."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cells = {}  # (product, region, 'YYYY-MM') -> [sums in CELL_FIELDS order]
+        self._summary = None
+        self.rows = 0
+        self.version = 0
+
+    def update(self, df):
+        """Fold new consumption rows (vegan_consumption.csv columns) into the rollups."""
+        if len(df) == 0:
+            return
+        grouped = (
+            df.assign(month=pd.to_datetime(df['date']).dt.strftime('%Y-%m'))
+            .groupby(['product', 'region', 'month'])
+            .agg(
+                consumption=('consumption', 'sum'),
+                price_sum=('price', 'sum'),
+                genz_sum=('genz_ratio', 'sum'),
+                trends_sum=('google_trends_score', 'sum'),
+                rows=('price', 'size')
+            )
+        )
+
+        with self._lock:
+            for key, values in zip(grouped.index, grouped.itertuples(index=False)):
+                cell = self._cells.get(key)
+                if cell is None:
+                    self._cells[key] = [float(value) for value in values]
+                else:
+                    for i, value in enumerate(values):
+                        cell[i] += float(value)
+            self.rows += len(df)
+            self.version += 1
+            self._summary = None
+
+    def summary(self):
+        """Market summary built from the rollup cells (cached until the next update)."""
+        with self._lock:
+            if self._summary is None:
+                self._summary = self._build_summary()
+            return self._summary
+
+    def _build_summary(self):
+        overall = _Accumulator()
+        products, regions, months, region_products = {}, {}, {}, {}
+
+        for (product, region, month), cell in self._cells.items():
+            overall.add(month, cell)
+            products.setdefault(product, _Accumulator()).add(month, cell)
+            regions.setdefault(region, _Accumulator()).add(month, cell)
+            months.setdefault(month, _Accumulator()).add(month, cell)
+            region_products.setdefault(region, {}).setdefault(product, _Accumulator()).add(month, cell)
+
+        total = overall.sums[0]
+        product_summary = {}
+        for product, acc in sorted(products.items()):
+            product_summary[product] = acc.to_dict(include_genz=True)
+            product_summary[product]["share_pct"] = round(acc.sums[0] / total * 100, 2) if total else 0.0
+
+        return {
+            "rows": self.rows,
+            "version": self.version,
+            "overall": {**overall.to_dict(), "latest_month": max(months) if months else None},
+            "products": product_summary,
+            "regions": {region: acc.to_dict() for region, acc in sorted(regions.items())},
+            "monthly": [
+                {"month": month,
+                 "consumption": round(acc.sums[0], 2),
+                 "avg_price": round(acc.sums[1] / acc.sums[4], 2)}
+                for month, acc in sorted(months.items())
+            ],
+            "region_products": {
+                region: {
+                    product: {
+                        "consumption": round(acc.sums[0], 2),
+                        "avg_price": round(acc.sums[1] / acc.sums[4], 2)
+                    }
+                    for product, acc in sorted(by_product.items())
+                }
+                for region, by_product in sorted(region_products.items())
+            }
+        }
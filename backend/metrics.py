@@ -0,0 +1,134 @@
+"""
+VOIS Request Metrics
+Per-endpoint, per-stage latency histograms and error counters, rendered in
+Prometheus text exposition format for the /metrics endpoint.
+
+Handlers time their stages with a RequestTimer:
+
+    timer = metrics.RequestTimer('predict_suitability')
+    data = request.get_json()
+    timer.lap('parse')
+    ...
+    timer.lap('predict')
+    ...
+    timer.finish()
+
+Each lap() is one perf_counter() call plus a bucket increment under a lock
+(about a microsecond), so a request with five stages adds roughly 5µs.
+
+Metrics are kept per process; with several gunicorn workers each worker
+reports its own series (scrape them individually or aggregate by instance).
+"""
+
+import time
+import threading
+from bisect import bisect_left
+
+# Histogram bucket upper bounds (seconds), from 50µs up to 2.5s
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+# Stage names used by the handlers
+STAGES = ('parse', 'encode', 'predict', 'filter_merge', 'allocate', 'serialize', 'total')
+
+_lock = threading.Lock()
+_histograms = {}  # (endpoint, stage) -> Histogram
+_errors = {}      # (endpoint, error_type, model) -> count
+
+class Histogram:
+    """Fixed-bucket latency histogram (non-cumulative counts; cumulated on render)."""
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+def observe(endpoint, stage, seconds):
+    """Record one stage duration for an endpoint."""
+    key = (endpoint, stage)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+def count_error(endpoint, error, model='none'):
+    """
+    Count an error for an endpoint. error is an exception (counted by class
+    name) or a short string such as 'missing_field'.
+    """
+    error_type = error if isinstance(error, str) else type(error).__name__
+    key = (endpoint, error_type, model)
+    with _lock:
+        _errors[key] = _errors.get(key, 0) + 1
+
+class RequestTimer:
+    """Lap timer for one request; each lap() records the time since the previous lap."""
+
+    __slots__ = ('endpoint', 'start', 'last')
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        observe(self.endpoint, stage, now - self.last)
+        self.last = now
+
+    def finish(self):
+        """Record the total request time; returns it in seconds."""
+        elapsed = time.perf_counter() - self.start
+        observe(self.endpoint, 'total', elapsed)
+        return elapsed
+
+    def error(self, error, model='none'):
+        """Count an error and record the total time of the failed request."""
+        count_error(self.endpoint, error, model)
+        return self.finish()
+
+def _labels(**labels):
+    return ','.join(f'{name}="{value}"' for name, value in labels.items())
+
+def render():
+    """Render all metrics in Prometheus text exposition format (version 0.0.4)."""
+    with _lock:
+        histograms = {key: (list(h.counts), h.total, h.count) for key, h in _histograms.items()}
+        errors = dict(_errors)
+
+    lines = [
+        '# HELP vois_request_stage_seconds Request latency by endpoint and processing stage.',
+        '# TYPE vois_request_stage_seconds histogram',
+    ]
+    for (endpoint, stage), (counts, total, count) in sorted(histograms.items()):
+        labels = _labels(endpoint=endpoint, stage=stage)
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, counts):
+            cumulative += bucket_count
+            lines.append(f'vois_request_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'vois_request_stage_seconds_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f'vois_request_stage_seconds_sum{{{labels}}} {total:.9f}')
+        lines.append(f'vois_request_stage_seconds_count{{{labels}}} {count}')
+
+    lines.append('# HELP vois_request_errors_total Request errors by endpoint, error type and model.')
+    lines.append('# TYPE vois_request_errors_total counter')
+    for (endpoint, error_type, model), count in sorted(errors.items()):
+        labels = _labels(endpoint=endpoint, error_type=error_type, model=model)
+        lines.append(f'vois_request_errors_total{{{labels}}} {count}')
+
+    return '\n'.join(lines) + '\n'
+
+def reset():
+    """Clear all recorded metrics."""
+    with _lock:
+        _histograms.clear()
+        _errors.clear()
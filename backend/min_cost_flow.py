@@ -0,0 +1,244 @@
+"""
+VOIS Min-Cost Flow
+Successive-shortest-path min-cost flow over a sparse adjacency-list graph.
+
+Edges are stored in flat lists: edge e goes to `to[e]` with residual
+capacity `cap[e]` and cost `cost[e]`, and its reverse edge is e ^ 1. Each
+node keeps the ids of its outgoing edges, so memory is O(nodes + edges) and
+the district -> hub -> city networks stay small even with thousands of
+nodes.
+
+Each augmentation finds a shortest path in the residual graph with
+Dijkstra on reduced costs (Johnson potentials keep them non-negative, since
+every edge cost added is non-negative). The search stops as soon as the sink
+is settled, and the path's bottleneck capacity is pushed. The number of
+augmentations is roughly the number of edges that become saturated, so
+solve time grows with the number of binding supplies, capacities and
+demands. Capacities and costs are floats; residuals below EPSILON are
+treated as saturated.
+
+Warm starts: after a solve, set_capacity() changes edge capacities in
+place (unrouting flow that no longer fits), and solve(warm=True) resumes
+from the current flow instead of zero. It first repairs the edges whose
+reduced cost the changes made negative under the last solve's potentials,
+re-routing existing flow around any negative-cost cycle they close, and
+then augments only the missing flow. After a small change (one city's demand) that takes a
+handful of augmentations instead of a full solve.
+"""
+
+import heapq
+
+EPSILON = 1e-9
+INFINITY = float('inf')
+
+class MinCostFlow:
+    """Directed flow network; add edges, then solve(source, sink)."""
+
+    def __init__(self, node_count=0):
+        self.adjacency = [[] for _ in range(node_count)]
+        self.to, self.cap, self.cost = [], [], []
+        self.capacity = []  # original capacity of each forward edge (by edge // 2)
+        self.source = self.sink = None  # of the last solve, used by set_capacity()
+        self.potential = []  # node potentials of the last solve, reused by warm solves
+
+    @property
+    def node_count(self):
+        return len(self.adjacency)
+
+    @property
+    def edge_count(self):
+        return len(self.capacity)
+
+    def add_node(self):
+        self.adjacency.append([])
+        return len(self.adjacency) - 1
+
+    def add_edge(self, u, v, capacity, cost):
+        """Add u -> v with capacity and non-negative unit cost; returns the edge id."""
+        if cost < 0:
+            raise ValueError("Edge costs must be non-negative")
+        edge = len(self.to)
+        self.to += [v, u]
+        self.cap += [float(capacity), 0.0]
+        self.cost += [float(cost), -float(cost)]
+        self.adjacency[u].append(edge)
+        self.adjacency[v].append(edge + 1)
+        self.capacity.append(float(capacity))
+        return edge
+
+    def flow(self, edge):
+        """Flow currently on a forward edge returned by add_edge()."""
+        # The reverse residual is exactly the flow pushed; capacity - cap[edge]
+        # loses it to rounding for very large (or infinite) capacities
+        return self.cap[edge ^ 1]
+
+    def set_capacity(self, edge, capacity):
+        """
+        Change a forward edge's capacity. Flow above the new capacity is
+        removed along flow-carrying paths back to the source and on to the sink.
+        """
+        capacity = float(capacity)
+        excess = self.flow(edge) - capacity
+        if excess > EPSILON:
+            self._unroute(edge, excess)
+        self.cap[edge] = capacity - self.flow(edge)
+        self.capacity[edge // 2] = capacity
+
+    def _flow_path(self, start, goal, backwards):
+        """Edges of a flow-carrying path from start to goal (following flow backwards if asked), or None."""
+        to, adjacency = self.to, self.adjacency
+        via = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            if node == goal:
+                path = []
+                while via[node] is not None:
+                    edge = via[node]
+                    path.append(edge)
+                    node = to[edge ^ 1] if not backwards else to[edge]
+                return path
+            for edge in adjacency[node]:
+                # Odd ids are reverse edges: one at `node` means flow arrives via edge ^ 1
+                forward = edge ^ 1 if backwards else edge
+                if forward & 1 or self.flow(forward) <= EPSILON:
+                    continue
+                nxt = to[edge]
+                if nxt not in via:
+                    via[nxt] = forward
+                    stack.append(nxt)
+        return None
+
+    def _unroute(self, edge, amount):
+        """Remove `amount` of flow through edge, along with its source and sink legs."""
+        u, v = self.to[edge ^ 1], self.to[edge]
+        while amount > EPSILON:
+            upstream = self._flow_path(u, self.source, backwards=True) if u != self.source else []
+            downstream = self._flow_path(v, self.sink, backwards=False) if v != self.sink else []
+            if upstream is None or downstream is None:
+                break
+            path = upstream + [edge] + downstream
+            push = min([amount] + [self.flow(e) for e in path])
+            for e in path:
+                self.cap[e] += push
+                self.cap[e ^ 1] -= push
+            amount -= push
+
+    def _repair(self, potential):
+        """
+        Restore optimality after capacity changes. Only residual edges with a
+        negative reduced cost under the previous potentials can lie on a
+        negative-cost cycle; for each such edge a -> b, Dijkstra from b (over
+        the edges that are still fine) either finds a path back to a that
+        closes a negative cycle, which gets flow pushed around it, or shows
+        there is none, and the potentials are shifted so the edge is no
+        longer negative. Both keep every other edge's reduced cost
+        non-negative, so one pass over the edges negative at the start suffices.
+        """
+        to, cap, cost = self.to, self.cap, self.cost
+
+        def violation(edge):
+            return cap[edge] > EPSILON and cost[edge] + potential[to[edge ^ 1]] - potential[to[edge]] < -EPSILON
+
+        for bad in [edge for edge in range(len(to)) if violation(edge)]:
+            while violation(bad):
+                a, b = to[bad ^ 1], to[bad]
+                gap = -(cost[bad] + potential[a] - potential[b])
+                distance, via = self._shortest_path(b, a, potential, bound=gap)
+                reach = min(distance[a], gap)
+                for node, d in enumerate(distance):
+                    potential[node] += min(d, reach)
+                if distance[a] >= gap:
+                    break
+                cycle, node = [bad], a
+                while node != b:
+                    cycle.append(via[node])
+                    node = to[via[node] ^ 1]
+                push = min(cap[edge] for edge in cycle)
+                for edge in cycle:
+                    cap[edge] -= push
+                    cap[edge ^ 1] += push
+        return potential
+
+    def _shortest_path(self, source, sink, potential, bound=INFINITY):
+        """
+        Dijkstra on reduced costs, stopped once the sink is settled (or the
+        search passes `bound`). Edges with a negative reduced cost are
+        skipped. Returns (distances, edge used to reach each node). Unsettled
+        nodes get the sink's distance, which keeps every reduced cost
+        non-negative once the distances are added to the potentials.
+        """
+        to, cap, cost, adjacency = self.to, self.cap, self.cost, self.adjacency
+        distance = [INFINITY] * len(adjacency)
+        via = [-1] * len(adjacency)
+        distance[source] = 0.0
+        settled = []
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > distance[u]:
+                continue
+            if d >= bound:
+                break
+            settled.append(u)
+            if u == sink:
+                break
+            base = d + potential[u]
+            for edge in adjacency[u]:
+                if cap[edge] > EPSILON:
+                    v = to[edge]
+                    candidate = base + cost[edge] - potential[v]
+                    if d - EPSILON <= candidate < distance[v] - EPSILON:
+                        distance[v] = candidate
+                        via[v] = edge
+                        heapq.heappush(heap, (candidate, v))
+
+        reach = min(distance[sink], bound)
+        if reach == INFINITY:
+            return distance, via
+        capped = [reach] * len(adjacency)
+        for u in settled:
+            capped[u] = distance[u]
+        return capped, via
+
+    def total_cost(self):
+        return sum(self.flow(2 * i) * self.cost[2 * i] for i in range(len(self.capacity)))
+
+    def solve(self, source, sink, limit=INFINITY, warm=False):
+        """
+        Push up to `limit` units from source to sink at minimum cost. Returns
+        (flow, cost) in total, including flow kept from a previous solve when warm.
+        """
+        to, cap, cost = self.to, self.cap, self.cost
+        self.source, self.sink = source, sink
+        if warm:
+            potential = self._repair(self.potential + [0.0] * (len(self.adjacency) - len(self.potential)))
+            total_flow = sum(self.flow(edge) for edge in self.adjacency[source] if not edge & 1)
+            total_cost = self.total_cost()
+        else:
+            potential = [0.0] * len(self.adjacency)
+            total_flow = total_cost = 0.0
+
+        while total_flow < limit - EPSILON:
+            distance, via = self._shortest_path(source, sink, potential)
+            if distance[sink] == INFINITY:
+                break
+            for node, d in enumerate(distance):
+                potential[node] += d
+
+            push, node = limit - total_flow, sink
+            while node != source:
+                edge = via[node]
+                push = min(push, cap[edge])
+                node = to[edge ^ 1]
+            node = sink
+            while node != source:
+                edge = via[node]
+                cap[edge] -= push
+                cap[edge ^ 1] += push
+                total_cost += push * cost[edge]
+                node = to[edge ^ 1]
+            total_flow += push
+
+        self.potential = potential
+        return total_flow, total_cost
@@ -0,0 +1,145 @@
+"""
+VOIS Slow-Request Profiler
+Opt-in cProfile capture for requests that exceed a latency threshold.
+
+Profiling is enabled for a request when either:
+- VOIS_PROFILE=true (a VOIS_PROFILE_SAMPLE_RATE fraction of all requests), or
+- the request carries an X-VOIS-Profile header equal to VOIS_ADMIN_TOKEN.
+
+Captured profiles of requests slower than VOIS_PROFILE_THRESHOLD_MS are
+written as pstats files to VOIS_PROFILE_DIR, a ring buffer holding at most
+VOIS_PROFILE_MAX_FILES files (oldest removed first). Only one request is
+profiled at a time; concurrent candidates are skipped rather than queued.
+"""
+
+import os
+import io
+import time
+import random
+import pstats
+import cProfile
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILE_ENABLED = os.environ.get('VOIS_PROFILE', 'false').lower() == 'true'
+SAMPLE_RATE = float(os.environ.get('VOIS_PROFILE_SAMPLE_RATE', '0.1'))
+THRESHOLD_MS = float(os.environ.get('VOIS_PROFILE_THRESHOLD_MS', '200'))
+PROFILE_DIR = os.environ.get('VOIS_PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+MAX_FILES = int(os.environ.get('VOIS_PROFILE_MAX_FILES', '50'))
+ADMIN_TOKEN = os.environ.get('VOIS_ADMIN_TOKEN') or None
+
+PROFILE_HEADER = 'X-VOIS-Profile'
+ADMIN_HEADER = 'X-Admin-Token'
+
+# cProfile cannot run two profilers at once on Python 3.12+, and overlapping
+# profiles would be hard to read anyway
+_profiler_lock = threading.Lock()
+
+def is_admin(headers, header=ADMIN_HEADER):
+    """True when the given header carries the configured admin token."""
+    return ADMIN_TOKEN is not None and headers.get(header) == ADMIN_TOKEN
+
+def should_profile(headers):
+    """Decide whether to profile a request (cheap when profiling is off)."""
+    if PROFILE_HEADER in headers:
+        return is_admin(headers, PROFILE_HEADER)
+    return PROFILE_ENABLED and random.random() < SAMPLE_RATE
+
+class Session:
+    """One request's profiler; holds _profiler_lock until stop()."""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.started = time.perf_counter()
+        self.duration_ms = None
+
+    def stop(self):
+        """Disable the profiler and release the lock (once; later calls do nothing)."""
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+        try:
+            self.profiler.disable()
+        finally:
+            _profiler_lock.release()
+
+def start(headers):
+    """
+    Start profiling the current request if it qualifies.
+    Returns a Session, or None when not profiling.
+    """
+    if not should_profile(headers):
+        return None
+    if not _profiler_lock.acquire(blocking=False):
+        return None
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiling tool is active in this process
+        _profiler_lock.release()
+        return None
+    return Session(profiler)
+
+def finish(session, endpoint):
+    """
+    Stop a profiling session and keep the profile if the request was slow.
+    Returns the saved profile name, or None.
+    """
+    session.stop()
+    if session.duration_ms < THRESHOLD_MS:
+        return None
+    return _save(session.profiler, endpoint, session.duration_ms)
+
+def _save(profiler, endpoint, duration_ms):
+    """Write a profile into the ring buffer directory and evict the oldest files."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = f"{int(time.time() * 1000)}_{endpoint or 'unknown'}_{duration_ms:.0f}ms.prof"
+    path = os.path.join(PROFILE_DIR, name)
+
+    temp_path = path + '.tmp'
+    profiler.dump_stats(temp_path)
+    os.replace(temp_path, path)
+
+    for old_name in list_profile_names()[:-MAX_FILES]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old_name))
+        except FileNotFoundError:
+            pass
+    return name
+
+def list_profile_names():
+    """Profile file names, oldest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    return sorted(name for name in os.listdir(PROFILE_DIR) if name.endswith('.prof'))
+
+def list_profiles():
+    """Metadata for every stored profile, newest first."""
+    profiles = []
+    for name in reversed(list_profile_names()):
+        timestamp, _, rest = name[:-len('.prof')].partition('_')
+        endpoint, _, duration = rest.rpartition('_')
+        profiles.append({
+            "name": name,
+            "endpoint": endpoint,
+            "duration_ms": float(duration.rstrip('ms') or 0),
+            "captured_at": int(timestamp) / 1000,
+            "size_bytes": os.path.getsize(os.path.join(PROFILE_DIR, name))
+        })
+    return profiles
+
+def profile_path(name):
+    """Absolute path of a stored profile, or None if the name is not a stored profile."""
+    if name not in list_profile_names():
+        return None
+    return os.path.join(PROFILE_DIR, name)
+
+def summarize(name, limit=30):
+    """Text summary of a stored profile: top functions by cumulative time."""
+    stream = io.StringIO()
+    stats = pstats.Stats(profile_path(name), stream=stream)
+    stats.sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
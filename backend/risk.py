@@ -0,0 +1,127 @@
+"""
+VOIS Plan Risk
+Monte Carlo shortfall and cost distributions for /optimize_supply_chain
+plans (/simulate_plan).
+
+/optimize_supply_chain assumes the required quantity and every lane's
+supply_quantity are exact. Each simulated scenario instead draws
+
+- demand: the required quantity scaled by one tree's forecast relative to
+  the forest mean, for the request's forecast features, so the spread of
+  the vegan demand forest's trees sets the demand uncertainty (a normal
+  with DEMAND_CV when the served model has no per-tree predictions, e.g.
+  through the inference pool or for boosted models)
+- supply: each source district's supply times a yield factor
+  ~ Normal(1, yield_cv), clipped at 0 and shared by all lanes of the district
+
+and evaluates two policies on (scenarios x lanes) matrices:
+
+- plan: the allocation as made; each lane delivers min(planned, shocked supply)
+- reoptimized: the optimizer's greedy fill re-run on the shocked supply and
+  demand, computed for all scenarios at once from cumulative sums of supply
+  in rank order
+
+Scenarios run in chunks of about SIMULATION_CHUNK_CELLS matrix cells, so
+memory stays bounded whatever the scenario count, and the run stops after
+the chunk that exhausts the latency budget, reporting percentiles over the
+scenarios completed.
+"""
+
+import os
+import time
+import numpy as np
+
+from logistics import per_ton
+
+SIMULATION_MAX_SCENARIOS = int(os.environ.get('VOIS_SIMULATION_MAX_SCENARIOS', '100000'))
+SIMULATION_CHUNK_CELLS = int(os.environ.get('VOIS_SIMULATION_CHUNK_CELLS', '1000000'))
+SIMULATION_BUDGET_MS = float(os.environ.get('VOIS_SIMULATION_BUDGET_MS', '500'))
+
+# Demand coefficient of variation when the model has no per-tree predictions
+DEMAND_CV = 0.1
+
+PERCENTILES = (5, 50, 95, 99)
+
+def tree_predictions(model, features):
+    """Per-tree predictions for one feature row, or None if the model is not a forest."""
+    features = np.asarray(features, dtype=np.float32).reshape(1, -1)
+    if hasattr(model, 'predict_trees'):  # shared_models.FlatForest
+        return np.asarray(model.predict_trees(features))[0]
+    estimators = getattr(model, 'estimators_', None)
+    if not estimators or not all(hasattr(tree, 'tree_') for tree in estimators):
+        return None
+    return np.array([tree.predict(features)[0] for tree in estimators])
+
+def demand_ratios(predictions):
+    """Each tree's forecast over the forest mean (all ones when the mean is not positive)."""
+    mean = predictions.mean()
+    if mean <= 0:
+        return np.ones(1)
+    return np.maximum(predictions, 0) / mean
+
+def distribution(values):
+    return {
+        "mean": round(float(values.mean()), 2),
+        **{f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+    }
+
+def _policy_summary(shortfall, cost, demand):
+    return {
+        "shortfall": distribution(shortfall),
+        "shortfall_probability": round(float((shortfall > 1e-9).mean()), 4),
+        "fill_rate_pct": round(float((1 - shortfall / demand).mean() * 100), 2),
+        "cost": distribution(cost)
+    }
+
+def simulate(lanes, required, scenarios, yield_cv, ratios=None, demand_cv=DEMAND_CV,
+             seed=None, budget_ms=SIMULATION_BUDGET_MS):
+    """
+    Simulate a plan. lanes holds the ranked lanes' "sources", "supply",
+    "transport_cost" and planned "allocated" quantities. Demand is drawn
+    from ratios (per-tree forecast / mean) when given, else Normal(1, demand_cv).
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    supply = np.asarray(lanes['supply'], dtype=float)
+    planned = np.asarray(lanes['allocated'], dtype=float)
+    unit_cost = per_ton(np.asarray(lanes['transport_cost'], dtype=float))
+    districts, lane_district = np.unique(lanes['sources'], return_inverse=True)
+    chunk = max(1, SIMULATION_CHUNK_CELLS // max(len(supply), len(districts)))
+
+    results = {name: [] for name in ('demand', 'plan_shortfall', 'plan_cost', 'reopt_shortfall', 'reopt_cost')}
+    done = 0
+    while done < scenarios:
+        size = min(chunk, scenarios - done)
+        if ratios is not None:
+            demand = required * rng.choice(ratios, size=size)
+        else:
+            demand = required * np.maximum(rng.normal(1.0, demand_cv, size=size), 0)
+        yields = np.maximum(rng.normal(1.0, yield_cv, size=(size, len(districts))), 0)
+        shocked = supply * yields[:, lane_district]
+
+        delivered = np.minimum(planned, shocked)
+        results['plan_shortfall'].append(np.maximum(demand - delivered.sum(axis=1), 0))
+        results['plan_cost'].append(delivered @ unit_cost)
+
+        # Greedy fill in rank order: lane i gets min(cum_i, demand) - min(cum_{i-1}, demand)
+        filled = np.minimum(np.cumsum(shocked, axis=1), demand[:, np.newaxis])
+        allocation = np.diff(filled, axis=1, prepend=0.0)
+        results['reopt_shortfall'].append(demand - filled[:, -1])
+        results['reopt_cost'].append(allocation @ unit_cost)
+        results['demand'].append(demand)
+
+        done += size
+        if (time.perf_counter() - started) * 1000 >= budget_ms:
+            break
+
+    values = {name: np.concatenate(parts) for name, parts in results.items()}
+    demand = np.maximum(values['demand'], 1e-9)
+    return {
+        "scenarios": done,
+        "truncated": done < scenarios,
+        "demand_spread": "trees" if ratios is not None else "normal",
+        "demand": distribution(values['demand']),
+        "plan": _policy_summary(values['plan_shortfall'], values['plan_cost'], demand),
+        "reoptimized": _policy_summary(values['reopt_shortfall'], values['reopt_cost'], demand),
+        "seconds": round(time.perf_counter() - started, 4)
+    }
@@ -0,0 +1,175 @@
+"""
+VOIS Scenario Sweeps
+Vectorised what-if grids for the vegan demand model (/scenario_sweep).
+
+A sweep varies two of the numeric demand features over ranges, e.g.
+
+    price 100-500 step 10  x  genz_ratio 0-1 step 0.05   (41 x 21 = 861 cells)
+
+The feature grid is built with NumPy broadcasting from one base row and
+scored with one model.predict() per chunk of SWEEP_CHUNK_ROWS rows (instead
+of one request per slider position), so memory stays bounded for large grids.
+Grids larger than SWEEP_MAX_CELLS are rejected; streamed sweeps (NDJSON,
+one line per y value) are evaluated a band of rows at a time and may go up
+to SWEEP_MAX_STREAM_CELLS.
+"""
+
+import os
+import math
+import numpy as np
+
+SWEEP_MAX_CELLS = int(os.environ.get('VOIS_SWEEP_MAX_CELLS', '20000'))
+SWEEP_MAX_STREAM_CELLS = int(os.environ.get('VOIS_SWEEP_MAX_STREAM_CELLS', '1000000'))
+SWEEP_CHUNK_ROWS = int(os.environ.get('VOIS_SWEEP_CHUNK_ROWS', '4096'))
+
+# Column order of the vegan demand model's feature matrix
+VEGAN_DEMAND_FEATURES = (
+    'price', 'genz_ratio', 'google_trends_score', 'region_encoded',
+    'product_encoded', 'month', 'quarter'
+)
+
+# Features a sweep axis may vary, with their valid ranges
+SWEEPABLE_FEATURES = {
+    'price': (0.0, float('inf')),
+    'genz_ratio': (0.0, 1.0),
+    'google_trends_score': (0.0, 100.0)
+}
+
+class SweepError(ValueError):
+    """Invalid sweep request (reported as a 400)."""
+
+def axis_values(spec, max_cells=SWEEP_MAX_CELLS):
+    """
+    Values of one sweep axis {"feature", "start", "stop", "step"}, stop inclusive.
+    Returns (feature, values).
+    """
+    if not isinstance(spec, dict):
+        raise SweepError("Each axis must be an object with feature, start, stop and step")
+    feature = spec.get('feature')
+    if feature not in SWEEPABLE_FEATURES:
+        raise SweepError(f"Axis feature must be one of {', '.join(SWEEPABLE_FEATURES)}; got {feature!r}")
+    try:
+        start, stop, step = float(spec['start']), float(spec['stop']), float(spec['step'])
+    except KeyError as e:
+        raise SweepError(f"Axis '{feature}' is missing {e.args[0]!r}")
+    except (TypeError, ValueError):
+        raise SweepError(f"Axis '{feature}' start, stop and step must be numbers")
+    if not all(math.isfinite(value) for value in (start, stop, step)):
+        raise SweepError(f"Axis '{feature}' start, stop and step must be finite")
+    if step <= 0 or stop < start:
+        raise SweepError(f"Axis '{feature}' needs step > 0 and stop >= start")
+
+    points = (stop - start) / step
+    if not math.isfinite(points):  # step too small for the range
+        raise SweepError(f"Axis '{feature}' has too many points; the grid limit is {max_cells} cells")
+    count = int(np.floor(points + 1e-9)) + 1
+    if count > max_cells:
+        raise SweepError(f"Axis '{feature}' has {count} points; the grid limit is {max_cells} cells")
+
+    low, high = SWEEPABLE_FEATURES[feature]
+    values = start + step * np.arange(count)
+    if values[0] < low or values[-1] > high:
+        raise SweepError(f"Axis '{feature}' must stay within [{low}, {high}]")
+    return feature, values
+
+def build_grid(base_row, x_feature, x_values, y_feature, y_values):
+    """
+    Feature matrix for every (y, x) cell, shape (len(y) * len(x), n_features),
+    row-major in y so predictions reshape to (len(y), len(x)).
+    """
+    grid = np.empty((len(y_values), len(x_values), len(base_row)))
+    grid[...] = base_row
+    grid[:, :, VEGAN_DEMAND_FEATURES.index(x_feature)] = x_values[np.newaxis, :]
+    grid[:, :, VEGAN_DEMAND_FEATURES.index(y_feature)] = y_values[:, np.newaxis]
+    return grid.reshape(-1, len(base_row))
+
+def predict_chunked(model, features, chunk_rows=None):
+    """model.predict over row chunks of at most chunk_rows rows."""
+    chunk_rows = chunk_rows or SWEEP_CHUNK_ROWS
+    predictions = np.empty(len(features))
+    for start in range(0, len(features), chunk_rows):
+        predictions[start:start + chunk_rows] = model.predict(features[start:start + chunk_rows])
+    return predictions
+
+def plan_sweep(x_spec, y_spec, max_cells=SWEEP_MAX_CELLS):
+    """Validate both axes. Returns (x_feature, x_values, y_feature, y_values)."""
+    x_feature, x_values = axis_values(x_spec, max_cells)
+    y_feature, y_values = axis_values(y_spec, max_cells)
+    if x_feature == y_feature:
+        raise SweepError("x and y must sweep different features")
+    cells = len(x_values) * len(y_values)
+    if cells > max_cells:
+        raise SweepError(f"Grid has {cells} cells; the limit is {max_cells}")
+    return x_feature, x_values, y_feature, y_values
+
+def iter_surface_rows(model, base_row, plan):
+    """
+    Yield (y_value, consumption over x) for each y value, building and scoring
+    the grid in bands of about SWEEP_CHUNK_ROWS cells.
+    """
+    x_feature, x_values, y_feature, y_values = plan
+    base_row = np.asarray(base_row, dtype=float)
+    band = max(1, SWEEP_CHUNK_ROWS // len(x_values))
+    for start in range(0, len(y_values), band):
+        y_band = y_values[start:start + band]
+        features = build_grid(base_row, x_feature, x_values, y_feature, y_band)
+        surface = np.maximum(predict_chunked(model, features), 0).reshape(len(y_band), len(x_values))
+        yield from zip(y_band, surface)
+
+def _best_cell(plan, best):
+    x_feature, x_values, y_feature, _ = plan
+    consumption, y_value, x_index = best
+    return {
+        x_feature: round(float(x_values[x_index]), 4),
+        y_feature: round(float(y_value), 4),
+        "consumption": round(float(consumption), 2)
+    }
+
+def response_surface(model, base_row, x_spec, y_spec):
+    """
+    Evaluate a two-axis sweep around base_row. Returns a dict with the axis
+    values, the consumption surface (rows follow y, columns follow x) and
+    its best cell.
+    """
+    plan = plan_sweep(x_spec, y_spec)
+    x_feature, x_values, y_feature, y_values = plan
+    surface = np.vstack([row for _, row in iter_surface_rows(model, base_row, plan)])
+
+    best_y, best_x = np.unravel_index(np.argmax(surface), surface.shape)
+    return {
+        "x": {"feature": x_feature, "values": np.round(x_values, 4).tolist()},
+        "y": {"feature": y_feature, "values": np.round(y_values, 4).tolist()},
+        "consumption": np.round(surface, 2).tolist(),
+        "cells": int(surface.size),
+        "min": round(float(surface.min()), 2),
+        "max": round(float(surface.max()), 2),
+        "best": _best_cell(plan, (surface[best_y, best_x], y_values[best_y], best_x))
+    }
+
+def stream_surface(model, base_row, plan):
+    """
+    NDJSON records for a sweep: an axes header, one {"y", "consumption"} line
+    per y value, then a summary line with min, max and the best cell.
+    """
+    x_feature, x_values, y_feature, y_values = plan
+    yield {
+        "type": "axes",
+        "x": {"feature": x_feature, "values": np.round(x_values, 4).tolist()},
+        "y": {"feature": y_feature, "count": len(y_values)}
+    }
+
+    low, high, best = float('inf'), float('-inf'), None
+    for y_value, row in iter_surface_rows(model, base_row, plan):
+        x_index = int(np.argmax(row))
+        if best is None or row[x_index] > best[0]:
+            best = (row[x_index], y_value, x_index)
+        low, high = min(low, float(row.min())), max(high, float(row.max()))
+        yield {"type": "row", "y": round(float(y_value), 4), "consumption": np.round(row, 2).tolist()}
+
+    yield {
+        "type": "summary",
+        "cells": len(x_values) * len(y_values),
+        "min": round(low, 2),
+        "max": round(high, 2),
+        "best": _best_cell(plan, best)
+    }
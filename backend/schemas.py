@@ -0,0 +1,372 @@
+"""
+VOIS Request Schemas
+Declarative request validation for the JSON endpoints.
+
+Each endpoint declares its fields once:
+
+    PREDICT_DEMAND = Schema(
+        base_price=Field(float, minimum=0),
+        center_id=Field(int),
+        ...
+    )
+
+and the Schema compiles them at import time into a list of per-field
+checkers. validate() then makes a single pass over the fields, coercing
+values and collecting every problem, and returns a plain dict of typed
+values. Failures raise SchemaError, which handlers turn into a 400 with
+per-field details instead of a 500 from a stray float()/KeyError.
+
+Categorical values (region, crop, ...) are checked against the model
+vocabularies by encode_category() in app.py, which raises SchemaError too.
+"""
+
+import math
+from datetime import date
+
+class SchemaError(ValueError):
+    """Invalid request payload; details lists {"field", "message"} problems."""
+
+    def __init__(self, details):
+        super().__init__(details[0]['message'] if details else "Invalid request")
+        self.details = details
+
+    @property
+    def kind(self):
+        """'missing_field' when every problem is a missing field, else 'invalid_field' (metrics label)."""
+        return 'missing_field' if all(d.get('missing') for d in self.details) else 'invalid_field'
+
+    def to_dict(self):
+        return {
+            "error": str(self),
+            "details": [{"field": d['field'], "message": d['message']} for d in self.details]
+        }
+
+class _Invalid(Exception):
+    pass
+
+def _to_float(value):
+    # Fast paths for the types JSON decoding produces
+    kind = type(value)
+    if kind is int:
+        return float(value)
+    if kind is not float:
+        if kind is bool:
+            raise _Invalid("must be a number")
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise _Invalid("must be a number")
+    if not math.isfinite(value):
+        raise _Invalid("must be a finite number")
+    return value
+
+def _to_int(value):
+    if type(value) is int:
+        return value
+    number = _to_float(value)
+    if not number.is_integer():
+        raise _Invalid("must be an integer")
+    return int(number)
+
+def _to_str(value):
+    if type(value) is not str:
+        raise _Invalid("must be a non-empty string")
+    stripped = value.strip()
+    if not stripped:
+        raise _Invalid("must be a non-empty string")
+    return stripped
+
+def _to_dict(value):
+    if not isinstance(value, dict):
+        raise _Invalid("must be an object")
+    return value
+
+def _to_list(value):
+    if not isinstance(value, list):
+        raise _Invalid("must be a list")
+    return value
+
+def _to_date(value):
+    try:
+        return date.fromisoformat(_to_str(value))
+    except ValueError:
+        raise _Invalid("must be an ISO date (YYYY-MM-DD)")
+
+COERCERS = {float: _to_float, int: _to_int, str: _to_str, dict: _to_dict, list: _to_list, date: _to_date}
+
+class Field:
+    """One request field: type, whether it is required (or its default) and bounds."""
+
+    __slots__ = ('type', 'required', 'default', 'minimum', 'maximum', 'choices')
+
+    def __init__(self, type, required=None, default=None, minimum=None, maximum=None, choices=None):
+        self.type = type
+        # A field with a default is optional unless stated otherwise
+        self.required = default is None if required is None else required
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = choices
+
+    def compile(self, name):
+        """Return check(value) -> coerced value, raising _Invalid."""
+        coerce = COERCERS[self.type]
+        minimum, maximum, choices = self.minimum, self.maximum, self.choices
+        if minimum is None and maximum is None and choices is None:
+            return coerce
+
+        if choices is not None:
+            def check(value):
+                value = coerce(value)
+                if value not in choices:
+                    raise _Invalid(f"must be one of {', '.join(map(str, choices))}")
+                return value
+            return check
+
+        low = -math.inf if minimum is None else minimum
+        high = math.inf if maximum is None else maximum
+
+        def check(value):
+            value = coerce(value)
+            if not low <= value <= high:
+                raise _Invalid(f"must be >= {minimum}" if value < low else f"must be <= {maximum}")
+            return value
+        return check
+
+class Schema:
+    """A compiled set of fields; validate() returns the coerced payload."""
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self._compiled = tuple(
+            (name, field.compile(name), field.required, field.default)
+            for name, field in fields.items()
+        )
+
+    def validate(self, data):
+        if not isinstance(data, dict):
+            raise SchemaError([{"field": None, "message": "Request body must be a JSON object"}])
+
+        result, errors = {}, []
+        for name, check, required, default in self._compiled:
+            value = data.get(name)
+            if value is None:
+                if required:
+                    errors.append({"field": name, "message": f"Missing required field: {name}", "missing": True})
+                else:
+                    result[name] = default
+                continue
+            try:
+                result[name] = check(value)
+            except _Invalid as e:
+                errors.append({"field": name, "message": f"{name} {e}"})
+
+        if errors:
+            raise SchemaError(errors)
+        return result
+
+def unknown_category(field, value):
+    """SchemaError for a categorical value the model was not trained on."""
+    return SchemaError([{"field": field, "message": f"Unknown {field}: {value}"}])
+
+# ==================== ENDPOINT SCHEMAS ====================
+
+PREDICT_DEMAND = Schema(
+    base_price=Field(float, minimum=0),
+    checkout_price=Field(float, minimum=0),
+    center_id=Field(int),
+    meal_id=Field(int)
+)
+
+RECOMMEND_CROP = Schema(
+    N=Field(float, minimum=0),
+    P=Field(float, minimum=0),
+    K=Field(float, minimum=0),
+    temperature=Field(float),
+    humidity=Field(float, minimum=0, maximum=100),
+    ph=Field(float, minimum=0, maximum=14),
+    rainfall=Field(float, minimum=0)
+)
+
+# District fields left out are filled from the district's profile (see feature_store.py)
+PREDICT_SUITABILITY = Schema(
+    district=Field(str),
+    crop=Field(str),
+    soil_ph=Field(float, required=False, minimum=0, maximum=14),
+    soil_type=Field(str, required=False),
+    rainfall=Field(float, required=False, minimum=0),
+    temperature=Field(float, required=False),
+    irrigation=Field(int, required=False, choices=(0, 1)),
+    distance_to_city=Field(float, required=False, minimum=0),
+    profile_version=Field(str, required=False)  # current profiles when omitted
+)
+
+FORECAST_VEGAN_DEMAND = Schema(
+    region=Field(str),
+    product=Field(str),
+    price=Field(float, minimum=0),
+    genz_ratio=Field(float, minimum=0, maximum=1),
+    google_trends_score=Field(float, minimum=0, maximum=100),
+    month=Field(int, minimum=1, maximum=12),
+    quarter=Field(int, required=False, minimum=1, maximum=4)  # derived from month when omitted
+)
+
+SCENARIO_SWEEP = Schema(
+    region=Field(str),
+    product=Field(str),
+    # Baselines of the features not swept; defaults match the dashboard's
+    price=Field(float, default=200.0, minimum=0),
+    genz_ratio=Field(float, default=0.5, minimum=0, maximum=1),
+    google_trends_score=Field(float, default=70.0, minimum=0, maximum=100),
+    month=Field(int, minimum=1, maximum=12),
+    quarter=Field(int, required=False, minimum=1, maximum=4),
+    x=Field(dict),
+    y=Field(dict)
+)
+
+OPTIMIZE_SUPPLY_CHAIN = Schema(
+    destination_city=Field(str),
+    product=Field(str),
+    required_quantity=Field(float, minimum=1)
+)
+
+SIMULATE_PLAN = Schema(
+    destination_city=Field(str),
+    product=Field(str),
+    required_quantity=Field(float, minimum=1),
+    scenarios=Field(int, default=10000, minimum=1),  # capped at VOIS_SIMULATION_MAX_SCENARIOS
+    yield_cv=Field(float, default=0.15, minimum=0, maximum=1),
+    demand_cv=Field(float, required=False, minimum=0, maximum=1),  # replaces the per-tree spread
+    budget_ms=Field(float, required=False, minimum=1),
+    seed=Field(int, required=False),
+    price=Field(float, default=200.0, minimum=0),
+    genz_ratio=Field(float, default=0.5, minimum=0, maximum=1),
+    google_trends_score=Field(float, default=70.0, minimum=0, maximum=100),
+    month=Field(int, required=False, minimum=1, maximum=12)  # current month when omitted
+)
+
+SUPPLY_DELTA = Schema(
+    product=Field(str),
+    destination_city=Field(str, required=False),
+    required_quantity=Field(float, required=False, minimum=1),
+    supply=Field(dict, required=False)
+)
+
+def supply_changes(data):
+    """{district: new supply_quantity} of a validated SUPPLY_DELTA payload ({} when absent)."""
+    if data['required_quantity'] is not None and data['destination_city'] is None:
+        raise SchemaError([{"field": "destination_city", "message": "Missing required field: destination_city",
+                            "missing": True}])
+    if data['supply'] is None:
+        if data['required_quantity'] is None:
+            raise SchemaError([{"field": "supply", "message": "Provide supply or required_quantity", "missing": True}])
+        return {}
+    return _quantities(data['supply'], 'supply', allow_zero=True)
+
+_SITE_QUERY_FIELDS = dict(
+    location=Field(str, required=False),  # a city or district name
+    latitude=Field(float, required=False, minimum=-90, maximum=90),
+    longitude=Field(float, required=False, minimum=-180, maximum=180),
+    product=Field(str, required=False),
+    crop=Field(str, required=False),  # or derived from product; any crop when both are omitted
+    role=Field(str, default='source', choices=('source', 'processing', 'any'))
+)
+
+NEAREST_SOURCES = Schema(k=Field(int, default=5, minimum=1, maximum=100), **_SITE_QUERY_FIELDS)
+
+SOURCES_WITHIN = Schema(radius_km=Field(float, minimum=0), **_SITE_QUERY_FIELDS)
+
+def query_point(data):
+    """location name or (latitude, longitude) of a validated site query."""
+    if data['latitude'] is not None and data['longitude'] is not None:
+        return (data['latitude'], data['longitude'])
+    if data['location'] is None:
+        raise SchemaError([{"field": "location", "message": "Provide location or latitude and longitude",
+                            "missing": True}])
+    return data['location']
+
+OPTIMIZE_NETWORK = Schema(
+    product=Field(str),
+    demands=Field(dict, required=False),
+    destination_city=Field(str, required=False),
+    required_quantity=Field(float, required=False, minimum=1),
+    storage_months=Field(float, default=1.0, minimum=0)
+)
+
+def demand_map(data):
+    """
+    {city: tons} from a validated OPTIMIZE_NETWORK payload: "demands", or
+    the single destination_city + required_quantity.
+    """
+    if data['demands'] is None:
+        missing = [name for name in ('destination_city', 'required_quantity') if data[name] is None]
+        if missing:
+            raise SchemaError([{"field": "demands", "message": "Provide demands or destination_city and required_quantity",
+                                "missing": True}])
+        return {data['destination_city']: data['required_quantity']}
+
+    return _quantities(data['demands'], 'demands', allow_zero=False)
+
+def _quantities(values, field, allow_zero):
+    """{name: float} from a JSON object of quantities, collecting per-key problems."""
+    quantities, errors = {}, []
+    for name, quantity in values.items():
+        try:
+            quantity = _to_float(quantity)
+            if quantity < 0 or (quantity == 0 and not allow_zero):
+                raise _Invalid("must be >= 0" if allow_zero else "must be > 0")
+            quantities[_to_str(name)] = quantity
+        except _Invalid as e:
+            errors.append({"field": f"{field}.{name}", "message": f"{field}.{name} {e}"})
+    if errors or not quantities:
+        raise SchemaError(errors or [{"field": field, "message": f"{field} must not be empty"}])
+    return quantities
+
+PLAN_SUPPLY = Schema(
+    product=Field(str),
+    cities=Field(list, required=False),
+    destination_city=Field(str, required=False),
+    period=Field(str, default='week', choices=('week', 'month')),
+    horizon=Field(int, default=12, minimum=1, maximum=52),  # periods
+    start=Field(date, required=False),  # today when omitted
+    shelf_life_days=Field(int, required=False, minimum=1),  # per-product default when omitted
+    price=Field(float, default=200.0, minimum=0),
+    genz_ratio=Field(float, default=0.5, minimum=0, maximum=1),
+    google_trends_score=Field(float, default=70.0, minimum=0, maximum=100)
+)
+
+def plan_cities(data):
+    """Destination cities of a validated PLAN_SUPPLY payload: "cities", or the single destination_city."""
+    if data['cities'] is None:
+        if data['destination_city'] is None:
+            raise SchemaError([{"field": "cities", "message": "Provide cities or destination_city", "missing": True}])
+        return [data['destination_city']]
+
+    cities, errors = [], []
+    for position, city in enumerate(data['cities']):
+        try:
+            city = _to_str(city)
+            if city not in cities:
+                cities.append(city)
+        except _Invalid as e:
+            errors.append({"field": f"cities.{position}", "message": f"cities.{position} {e}"})
+    if errors or not cities:
+        raise SchemaError(errors or [{"field": "cities", "message": "cities must not be empty"}])
+    return cities
+
+COMBINED_INTELLIGENCE = Schema(
+    region=Field(str),
+    product=Field(str),
+    district=Field(str),
+    crop=Field(str),
+    price=Field(float, default=200.0, minimum=0),
+    genz_ratio=Field(float, default=0.5, minimum=0, maximum=1),
+    google_trends_score=Field(float, default=70.0, minimum=0, maximum=100),
+    month=Field(int, required=False, minimum=1, maximum=12),  # current month when omitted
+    soil_type=Field(str, default='Loamy'),
+    soil_ph=Field(float, default=7.0, minimum=0, maximum=14),
+    rainfall=Field(float, default=600.0, minimum=0),
+    temperature=Field(float, default=25.0),
+    irrigation=Field(int, default=1, choices=(0, 1)),
+    distance_to_city=Field(float, default=50.0, minimum=0)
+)
@@ -0,0 +1,235 @@
+"""
+VOIS Shared Models
+Serve random forests from flat, memory-mapped arrays shared by all workers.
+
+Unpickled sklearn forests live in each worker's private heap (Tree
+__setstate__ copies its node arrays, and refcount updates dirty any pages
+inherited from a pre-forking parent), so N workers hold N copies of every
+model. With VOIS_SHARED_MODELS=true, each forest is instead exported once
+into plain arrays:
+
+    feature, threshold, left, right   one entry per node, all trees concatenated
+    value                             leaf value (regressors) or class probabilities
+    roots                             first node of each tree
+
+stored as .npy files under VOIS_SHARED_MODELS_DIR (default models/shared)
+plus a meta.json holding the model kind, depth, classes and category
+vocabularies. Workers open the arrays with np.load(mmap_mode='r'): the pages
+are read-only views of the OS page cache, so every worker shares one physical
+copy and a worker's private memory stays near the interpreter baseline.
+
+FlatForest.predict() walks all trees for a batch of rows at once with NumPy
+indexing (one step per tree level), comparing float32 features against the
+float64 thresholds exactly as sklearn does, so predictions match the
+original forest.
+
+The first process to load a model exports it (atomically, keyed by the
+pickle's modification time, so retraining creates a new export). Models
+other than tree forests, e.g. the hist_gb family, are reported as
+unsupported and loaded from their pickle as usual.
+"""
+
+import os
+import json
+import pickle
+import shutil
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENABLED = os.environ.get('VOIS_SHARED_MODELS', 'false').lower() == 'true'
+SHARED_DIR = os.environ.get('VOIS_SHARED_MODELS_DIR', os.path.join(BASE_DIR, 'models', 'shared'))
+
+# Rows evaluated per traversal batch (bounds the rows x trees index arrays)
+PREDICT_CHUNK_ROWS = 8192
+
+ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'value', 'roots')
+
+class UnsupportedModel(TypeError):
+    """The model cannot be flattened (not a single-output tree forest)."""
+
+def flatten_forest(model):
+    """Flatten a fitted RandomForest/ExtraTrees model into ({name: array}, meta)."""
+    estimators = getattr(model, 'estimators_', None)
+    if not estimators or not all(hasattr(estimator, 'tree_') for estimator in estimators):
+        raise UnsupportedModel(f"{type(model).__name__} is not a tree forest")
+    if getattr(model, 'n_outputs_', 1) != 1:
+        raise UnsupportedModel("Multi-output forests are not supported")
+
+    classifier = hasattr(model, 'classes_')
+    parts = {name: [] for name in ARRAY_NAMES}
+    offset, depth = 0, 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        nodes = np.arange(tree.node_count)
+        leaf = tree.children_left == -1
+
+        # Leaves point to themselves and always go "left", so every row can
+        # take exactly `depth` steps regardless of where its leaf is
+        parts['left'].append(np.where(leaf, nodes, tree.children_left) + offset)
+        parts['right'].append(np.where(leaf, nodes, tree.children_right) + offset)
+        parts['feature'].append(np.where(leaf, 0, tree.feature))
+        parts['threshold'].append(np.where(leaf, np.inf, tree.threshold))
+
+        value = tree.value[:, 0, :]
+        if classifier:
+            value = value / value.sum(axis=1, keepdims=True)
+        else:
+            value = value[:, 0]
+        parts['value'].append(value)
+        parts['roots'].append([offset])
+
+        offset += tree.node_count
+        depth = max(depth, tree.max_depth)
+
+    arrays = {
+        'feature': np.concatenate(parts['feature']).astype(np.int32),
+        'threshold': np.concatenate(parts['threshold']).astype(np.float64),
+        'left': np.concatenate(parts['left']).astype(np.int32),
+        'right': np.concatenate(parts['right']).astype(np.int32),
+        'value': np.concatenate(parts['value']).astype(np.float64),
+        'roots': np.concatenate(parts['roots']).astype(np.int32)
+    }
+    meta = {
+        'kind': 'classifier' if classifier else 'regressor',
+        'estimator': type(model).__name__,
+        'depth': int(depth),
+        'n_features': int(model.n_features_in_),
+        'classes': model.classes_.tolist() if classifier else None
+    }
+    return arrays, meta
+
+class FlatForest:
+    """Forest predictor over flat node arrays (typically read-only memory maps)."""
+
+    def __init__(self, arrays, meta):
+        for name in ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+        self.kind = meta['kind']
+        self.depth = meta['depth']
+        self.n_features_in_ = meta['n_features']
+        self.classes_ = np.asarray(meta['classes']) if meta['classes'] is not None else None
+
+    def _leaf_values(self, X):
+        """Leaf value of every tree for each row: (rows, trees[, classes])."""
+        rows = np.arange(len(X))[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes]
+
+    def _leaf_means(self, X):
+        return self._leaf_values(X).mean(axis=1)
+
+    def predict_trees(self, X):
+        """Per-tree predictions of a regressor forest, shape (rows, trees)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        return self._leaf_values(X)
+
+    def predict(self, X):
+        # sklearn trees compare float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        means = np.concatenate([
+            self._leaf_means(X[start:start + PREDICT_CHUNK_ROWS])
+            for start in range(0, len(X), PREDICT_CHUNK_ROWS)
+        ]) if len(X) else np.empty(0)
+        if self.kind == 'classifier':
+            return self.classes_[np.argmax(means, axis=1)]
+        return means
+
+def _split_artifact(artifact):
+    """(model, extra meta) for a raw model or a {'model', 'family', 'categories'} dict."""
+    if not isinstance(artifact, dict):
+        return artifact, {'wrapped': False}
+
+    categories = dict(artifact.get('categories') or {})
+    for key, value in artifact.items():
+        # Legacy artifacts store LabelEncoders as '<feature>_encoder'
+        if key.endswith('_encoder') and hasattr(value, 'classes_'):
+            categories.setdefault(key[:-len('_encoder')], [v.item() if hasattr(v, 'item') else v
+                                                           for v in value.classes_])
+    return artifact['model'], {
+        'wrapped': True,
+        'family': artifact.get('family'),
+        'categories': {feature: list(values) for feature, values in categories.items()}
+    }
+
+def export(artifact, directory):
+    """Write the flat arrays and meta.json for an artifact into directory (atomically)."""
+    temp_dir = f"{directory}.tmp{os.getpid()}"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+
+    model, extra = _split_artifact(artifact)
+    try:
+        arrays, meta = flatten_forest(model)
+        meta.update(extra, supported=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_dir, f'{name}.npy'), array, allow_pickle=False)
+    except UnsupportedModel as e:
+        meta = {'supported': False, 'reason': str(e)}
+
+    with open(os.path.join(temp_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    try:
+        os.rename(temp_dir, directory)
+    except OSError:
+        # Another worker finished the same export first
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def attach(directory):
+    """Open an export read-only. Returns the served artifact, or None if unsupported."""
+    with open(os.path.join(directory, 'meta.json')) as f:
+        meta = json.load(f)
+    if not meta['supported']:
+        return None
+
+    arrays = {
+        name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r', allow_pickle=False)
+        for name in ARRAY_NAMES
+    }
+    model = FlatForest(arrays, meta)
+    if not meta['wrapped']:
+        return model
+    return {'model': model, 'family': meta['family'], 'categories': meta['categories']}
+
+def _remove_stale_exports(name, keep):
+    prefix = f"{name}-"
+    for entry in os.listdir(SHARED_DIR):
+        if entry.startswith(prefix) and entry != keep and '.tmp' not in entry:
+            # Workers still mapping the old files keep their pages until they exit
+            shutil.rmtree(os.path.join(SHARED_DIR, entry), ignore_errors=True)
+
+def load(name, source_path):
+    """
+    Shared, memory-mapped version of the pickled model at source_path,
+    exporting it first if needed. Returns None if the model is not supported.
+    """
+    version = f"{name}-{os.stat(source_path).st_mtime_ns}"
+    directory = os.path.join(SHARED_DIR, version)
+    if not os.path.exists(os.path.join(directory, 'meta.json')):
+        os.makedirs(SHARED_DIR, exist_ok=True)
+        with open(source_path, 'rb') as f:
+            export(pickle.load(f), directory)
+        _remove_stale_exports(name, version)
+    return attach(directory)
+
+def main():
+    """Export every models/*.pkl ahead of time (e.g. before starting the workers)."""
+    models_dir = os.path.join(BASE_DIR, 'models')
+    for filename in sorted(os.listdir(models_dir)):
+        if not filename.endswith('.pkl'):
+            continue
+        name = filename[:-len('.pkl')]
+        shared = load(name, os.path.join(models_dir, filename))
+        status = "shared" if shared is not None else "unsupported (served from pickle)"
+        print(f"  {name:36s} {status}")
+    print(f"✓ Shared model exports in {SHARED_DIR}")
+
+if __name__ == "__main__":
+    main()
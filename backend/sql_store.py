@@ -0,0 +1,164 @@
+"""
+VOIS SQL Store
+File-backed SQLite store for the logistics and crop suitability tables.
+
+Enabled with VOIS_DATA_BACKEND=sqlite. Instead of every worker holding the
+tables as DataFrames, all workers share one on-disk database (VOIS_DB_PATH,
+default data/vois.db) and query it through the indexes
+
+    logistics(destination_city, crop)
+    crop_suitability(district, crop)
+
+so /optimize_supply_chain's filter and suitability join run inside SQLite
+and only the matching routes are loaded into pandas. The logistics engine's
+per-(district, crop) medians are aggregated in SQL too (window functions,
+SQLite 3.25+). Worker memory stays constant as the tables grow.
+
+The database is built from the CSVs on first start, and rebuilt whenever a
+CSV is newer than it (rows ingested through /ingest/logistics live only in
+the database, so regenerating the CSVs discards them). The database runs in
+WAL mode, so one worker's ingestion does not block other workers' reads.
+"""
+
+import os
+import sqlite3
+import threading
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_BACKEND = os.environ.get('VOIS_DATA_BACKEND', 'memory').lower()
+DB_PATH = os.environ.get('VOIS_DB_PATH', os.path.join(BASE_DIR, 'data', 'vois.db'))
+
+# table name -> (source CSV, index columns)
+TABLES = {
+    'logistics': ('logistics_supply.csv', ('destination_city', 'crop')),
+    'crop_suitability': ('crop_suitability.csv', ('district', 'crop'))
+}
+
+# Routes for a (destination, crop) joined with the source district's suitability;
+# same rows as logistics.merge(suitability, left_on='source_district', right_on='district', how='left')
+SUPPLY_CANDIDATES_SQL = """
+    SELECT l.*, s.district, s.soil_ph, s.soil_type, s.rainfall, s.temperature,
+           s.irrigation, s.yield_per_acre, s.distance_to_city, s.suitability_score
+    FROM logistics AS l
+    LEFT JOIN crop_suitability AS s
+        ON s.district = l.source_district AND s.crop = l.crop
+    WHERE l.destination_city = ? AND l.crop = ?
+"""
+
+# Median of `value` per `keys` group (NULLs skipped, as pandas does): the average
+# of the middle one or two rows of each ordered group
+MEDIAN_SQL = """
+    WITH ranked AS (
+        SELECT {keys}, {value} AS value,
+               ROW_NUMBER() OVER (PARTITION BY {keys} ORDER BY {value}) AS position,
+               COUNT(*) OVER (PARTITION BY {keys}) AS size
+        FROM logistics
+        WHERE {value} IS NOT NULL{where}
+    )
+    SELECT {keys}, AVG(value) AS value FROM ranked
+    WHERE position IN ((size + 1) / 2, (size + 2) / 2)
+    GROUP BY {keys}
+"""
+
+def _needs_build(db_path, data_dir):
+    if not os.path.exists(db_path):
+        return True
+    db_mtime = os.path.getmtime(db_path)
+    return any(
+        os.path.getmtime(os.path.join(data_dir, csv_name)) > db_mtime
+        for csv_name, _ in TABLES.values()
+    )
+
+def build_database(db_path, data_dir):
+    """Load the CSVs into a fresh database file and swap it into place."""
+    temp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    conn = sqlite3.connect(temp_path)
+    try:
+        for table, (csv_name, index_columns) in TABLES.items():
+            df = pd.read_csv(os.path.join(data_dir, csv_name))
+            df.to_sql(table, conn, index=False)
+            conn.execute(
+                f"CREATE INDEX idx_{table}_{'_'.join(index_columns)} "
+                f"ON {table} ({', '.join(index_columns)})"
+            )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(temp_path, db_path)
+
+class SQLiteTable:
+    """Appendable table in a SQLiteStore (same interface as data_store.ColumnarTable.append)."""
+
+    def __init__(self, store, name, schema):
+        self.store = store
+        self.name = name
+        self.schema = schema
+        self._listeners = []
+
+    def __len__(self):
+        return self.store.query_scalar(f"SELECT COUNT(*) FROM {self.name}")
+
+    def add_listener(self, callback):
+        """Register callback(new_rows_df, start_position), called after appends made by this process."""
+        self._listeners.append(callback)
+
+    def append(self, rows):
+        """Insert validated rows in one transaction; returns the new row count."""
+        conn = self.store.connection()
+        with conn:
+            rows[list(self.schema)].to_sql(self.name, conn, if_exists='append', index=False)
+        total = len(self)
+        for callback in self._listeners:
+            callback(rows, total - len(rows))
+        return total
+
+class SQLiteStore:
+    """Shared on-disk store; one connection per thread."""
+
+    def __init__(self, db_path=DB_PATH, data_dir=None):
+        data_dir = data_dir or os.path.join(BASE_DIR, 'data')
+        if _needs_build(db_path, data_dir):
+            build_database(db_path, data_dir)
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute('PRAGMA busy_timeout=10000')
+            self._local.conn = conn
+        return conn
+
+    def query_scalar(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchone()[0]
+
+    def table(self, name, schema):
+        return SQLiteTable(self, name, schema)
+
+    def _median(self, keys, value, where=''):
+        sql = MEDIAN_SQL.format(keys=', '.join(keys), value=value, where=where)
+        return pd.read_sql_query(sql, self.connection()).set_index(list(keys))['value']
+
+    def lane_aggregates(self, supply_fields):
+        """
+        logistics.lane_aggregates() computed in SQLite: (crops, cost per km by
+        crop, per-(source_district, crop) medians of supply_fields). Only the
+        aggregates (districts x crops rows) are loaded, never the table.
+        """
+        crops = {row[0] for row in self.connection().execute('SELECT DISTINCT crop FROM logistics')}
+        rates = self._median(('crop',), 'transport_cost / distance', ' AND distance > 0')
+        medians = pd.DataFrame({
+            field: self._median(('source_district', 'crop'), field) for field in supply_fields
+        })
+        return crops, rates, medians
+
+    def supply_candidates(self, destination, crop):
+        """Logistics routes to destination for crop, left-joined with suitability."""
+        return pd.read_sql_query(SUPPLY_CANDIDATES_SQL, self.connection(), params=(destination, crop))
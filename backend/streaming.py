@@ -0,0 +1,65 @@
+"""
+VOIS Streaming Responses
+NDJSON (newline-delimited JSON) streaming for endpoints with large results.
+
+Clients opt in with "Accept: application/x-ndjson". The handler then passes
+a generator of records to ndjson_response(); each record is encoded on its
+own as it is produced and records are flushed in chunks of about
+STREAM_CHUNK_BYTES. The full result is never held in memory as one JSON
+document, and the first bytes go out before the last rows are computed.
+
+Once streaming has started the status code can no longer change, so an
+exception raised by the generator is reported as a final
+{"type": "error", "error": ...} line.
+
+Records are encoded with orjson when it is installed (pip install orjson),
+otherwise with the standard json module.
+"""
+
+import os
+import json
+from flask import Response, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_CHUNK_BYTES = int(os.environ.get('VOIS_STREAM_CHUNK_BYTES', '65536'))
+
+try:
+    import orjson
+
+    def encode_line(record):
+        return orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    _encoder = json.JSONEncoder(separators=(',', ':'), default=lambda value: value.item())
+
+    def encode_line(record):
+        return (_encoder.encode(record) + '\n').encode('utf-8')
+
+def wants_ndjson(request):
+    """True when the client explicitly asks for NDJSON (a bare */* keeps plain JSON)."""
+    accept = request.accept_mimetypes
+    explicit = any(mimetype == NDJSON_MIMETYPE and quality > 0 for mimetype, quality in accept)
+    return explicit and accept.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def _chunks(records, on_error=None):
+    buffer, size = [], 0
+    try:
+        for record in records:
+            line = encode_line(record)
+            buffer.append(line)
+            size += len(line)
+            if size >= STREAM_CHUNK_BYTES:
+                yield b''.join(buffer)
+                buffer, size = [], 0
+    except Exception as e:
+        if on_error is not None:
+            on_error(e)
+        buffer.append(encode_line({"type": "error", "error": str(e)}))
+    if buffer:
+        yield b''.join(buffer)
+
+def ndjson_response(records, status=200, on_error=None):
+    """
+    Chunked streaming Response with one JSON line per record.
+    on_error(exception) is called if the generator fails mid-stream.
+    """
+    return Response(stream_with_context(_chunks(records, on_error)), status=status, mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,241 @@
+"""
+VOIS Supply Planner
+Time-phased, perishability-aware shipment plans over a rolling horizon.
+
+/optimize_network plans one static allocation, but processed products
+spoil, so the planner expands the district -> hub -> city network over
+weekly or monthly periods:
+
+    source -> farm(i, t) -> hub in(h, t) -> hub out(h, t) -> city(c, t') -> sink
+
+Farm supply and hub processing capacity are the per-month figures of
+logistics_supply.csv scaled to the period length, available again every
+period (unused supply does not carry over). Goods processed at hub h in
+period t may reach a city in any period t' with t <= t' <= t + shelf life,
+paying transport (per ton, see logistics.per_ton) plus the hub's storage
+cost for the periods they wait;
+there is no arc past the shelf life, so nothing is delivered spoiled. City
+demand per period is the monthly vegan demand forecast scaled the same way.
+A min-cost flow (see min_cost_flow.py) then meets as much demand as
+possible at the lowest transport and storage cost.
+
+Rolling horizon: a plan covers `horizon` periods from the start of the
+current week or month, and only the first period is firm. Plans are cached
+per (crop, cities, period, horizon, start, shelf life), so re-planning the
+same window after a forecast or supply update only changes the affected
+demand, supply and capacity edges and warm-starts the solver from the
+previous schedule instead of solving from scratch.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+import numpy as np
+
+from min_cost_flow import MinCostFlow, EPSILON
+from logistics import NetworkError, HUBS_PER_SOURCE, per_ton
+
+# Shelf life of the processed product; DEFAULT_SHELF_LIFE_DAYS for the rest
+SHELF_LIFE_DAYS = {
+    'Tofu': 14,
+    'Oat Milk': 60,
+    'Soy Products': 180,
+    'Chickpea Flour': 180,
+    'Quinoa': 365
+}
+DEFAULT_SHELF_LIFE_DAYS = 90
+
+PERIOD_DAYS = {'week': 7, 'month': 30}
+
+# Supply quantity, processing capacity, storage cost and demand forecasts are per month
+DAYS_PER_MONTH = 30
+
+# Time-expanded plans kept for warm re-planning (least recently used are dropped)
+PLAN_CACHE_SIZE = int(os.environ.get('VOIS_PLAN_CACHE_SIZE', '32'))
+
+def shelf_life_days(product):
+    return SHELF_LIFE_DAYS.get(product, DEFAULT_SHELF_LIFE_DAYS)
+
+def period_starts(start, period, horizon):
+    """First day of each of `horizon` periods, from the week (Monday) or month containing start."""
+    if period == 'week':
+        first = start - timedelta(days=start.weekday())
+        return [first + timedelta(days=7 * t) for t in range(horizon)]
+    months = start.year * 12 + start.month - 1
+    return [date((months + t) // 12, (months + t) % 12 + 1, 1) for t in range(horizon)]
+
+class TimePhasedPlan:
+    """One time-expanded network; solve() re-plans it for new demands or supply."""
+
+    def __init__(self, engine, crop, cities, starts, period, shelf_periods):
+        tables = engine.tables
+        k = tables['crop_index'].get(crop)
+        if k is None:
+            raise NetworkError(f"No supply data for crop: {crop}")
+        unknown = [city for city in cities if city not in engine.city_index]
+        if unknown:
+            raise NetworkError(f"Unknown destination city: {', '.join(unknown)}")
+
+        self.engine, self.crop, self.k = engine, crop, k
+        self.cities, self.starts = list(cities), list(starts)
+        self.scale = PERIOD_DAYS[period] / DAYS_PER_MONTH
+        self.lock = threading.Lock()  # the graph is re-solved in place
+        self.solved = False
+        self._build(tables, shelf_periods)
+
+    def _supply_arrays(self, tables):
+        k = self.k
+        return (tables['supply_quantity'][:, k], tables['processing_capacity'][:, k],
+                tables['storage_cost'][:, k], float(tables['cost_per_km'][k]))
+
+    def matches(self, tables):
+        """Whether tables keep this graph's farms, hubs and lane rate (else it is rebuilt)."""
+        if tables is self.tables:
+            return True
+        supply, capacity, _, rate = self._supply_arrays(tables)
+        return (np.array_equal(np.flatnonzero(~np.isnan(supply)), self.farms) and
+                np.array_equal(np.flatnonzero(~np.isnan(capacity)), self.hubs) and
+                rate == self.rate and np.array_equal(tables['storage_cost'][:, self.k], self.storage,
+                                                     equal_nan=True))
+
+    def _build(self, tables, shelf_periods):
+        engine, periods = self.engine, len(self.starts)
+        supply, capacity, storage, rate = self._supply_arrays(tables)
+        self.tables, self.rate, self.storage = tables, rate, storage.copy()
+        self.farms = np.flatnonzero(~np.isnan(supply))
+        self.hubs = np.flatnonzero(~np.isnan(capacity))
+
+        graph = self.graph = MinCostFlow()
+        self.source, self.sink = graph.add_node(), graph.add_node()
+        city_node = {(city, t): graph.add_node() for city in self.cities for t in range(periods)}
+        self.demand_edges = {key: graph.add_edge(node, self.sink, 0.0, 0.0) for key, node in city_node.items()}
+        nearest = {
+            i: self.hubs[np.argsort(engine.hub_distance[i, self.hubs], kind='stable')[:HUBS_PER_SOURCE]]
+            for i in self.farms
+        }
+
+        self.supply_edges, self.processing_edges = {}, {}
+        self.farm_legs, self.delivery_legs = [], []
+        for t in range(periods):
+            hub_in = {h: graph.add_node() for h in self.hubs}
+            hub_out = {h: graph.add_node() for h in self.hubs}
+            for i in self.farms:
+                farm = graph.add_node()
+                self.supply_edges[i, t] = graph.add_edge(self.source, farm, supply[i] * self.scale, 0.0)
+                for h in nearest[i]:
+                    unit_cost = per_ton(float(engine.hub_distance[i, h]) * rate)
+                    self.farm_legs.append((graph.add_edge(farm, hub_in[h], np.inf, unit_cost), i, h, t, unit_cost))
+            for h in self.hubs:
+                self.processing_edges[h, t] = graph.add_edge(hub_in[h], hub_out[h], capacity[h] * self.scale, 0.0)
+                # Storage is charged per period waited, so each delivery period is its own arc
+                holding = float(storage[h]) * self.scale
+                for city in self.cities:
+                    transport = per_ton(float(engine.distance[h, engine.city_index[city]]) * rate)
+                    for arrival in range(t, min(t + shelf_periods, periods - 1) + 1):
+                        stored = holding * (arrival - t)
+                        edge = graph.add_edge(hub_out[h], city_node[city, arrival], np.inf, transport + stored)
+                        self.delivery_legs.append((edge, h, city, t, arrival, transport, stored))
+
+    def _update_supply(self, tables):
+        supply, capacity, _, _ = self._supply_arrays(tables)
+        for (i, _), edge in self.supply_edges.items():
+            self.graph.set_capacity(edge, supply[i] * self.scale)
+        for (h, _), edge in self.processing_edges.items():
+            self.graph.set_capacity(edge, capacity[h] * self.scale)
+        self.tables = tables
+
+    def solve(self, demands, tables):
+        """Plan for {city: [tons per period]}; returns (report, warm)."""
+        warm = self.solved
+        if tables is not self.tables:
+            self._update_supply(tables)
+        for (city, t), edge in self.demand_edges.items():
+            self.graph.set_capacity(edge, demands[city][t])
+        delivered, total_cost = self.graph.solve(self.source, self.sink, warm=warm)
+        self.solved = True
+        return self._report(demands, delivered, total_cost), warm
+
+    def _report(self, demands, delivered, total_cost):
+        graph, sources = self.graph, self.engine.sources
+        schedule = [{
+            "period": t, "start": start.isoformat(), "firm": t == 0,
+            "demand": {}, "delivered": {}, "farm_to_hub": [], "shipments": []
+        } for t, start in enumerate(self.starts)]
+        costs = {"transport_to_hubs": 0.0, "transport_to_cities": 0.0, "storage": 0.0}
+
+        for edge, i, h, t, unit_cost in self.farm_legs:
+            quantity = graph.flow(edge)
+            if quantity > EPSILON:
+                costs["transport_to_hubs"] += quantity * unit_cost
+                schedule[t]["farm_to_hub"].append({
+                    "source_district": sources[i], "hub": sources[h],
+                    "quantity": round(quantity, 2), "cost": round(quantity * unit_cost, 2)
+                })
+        for edge, h, city, t, arrival, transport, stored in self.delivery_legs:
+            quantity = graph.flow(edge)
+            if quantity > EPSILON:
+                costs["transport_to_cities"] += quantity * transport
+                costs["storage"] += quantity * stored
+                schedule[t]["shipments"].append({
+                    "hub": sources[h], "destination_city": city, "arrival_period": arrival,
+                    "held_periods": arrival - t, "quantity": round(quantity, 2),
+                    "transport_cost": round(quantity * transport, 2), "storage_cost": round(quantity * stored, 2)
+                })
+
+        required = 0.0
+        for (city, t), edge in self.demand_edges.items():
+            required += demands[city][t]
+            schedule[t]["demand"][city] = round(demands[city][t], 2)
+            schedule[t]["delivered"][city] = round(graph.flow(edge), 2)
+        return {
+            "schedule": schedule,
+            "costs": {**{name: round(value, 2) for name, value in costs.items()}, "total": round(total_cost, 2)},
+            "required": round(required, 2),
+            "delivered": round(delivered, 2),
+            "unmet": round(max(required - delivered, 0.0), 2),
+            "graph": {"nodes": graph.node_count, "edges": graph.edge_count}
+        }
+
+class SupplyPlanner:
+    """Cache of TimePhasedPlans over a LogisticsEngine, re-planned warm."""
+
+    def __init__(self, engine, cache_size=PLAN_CACHE_SIZE):
+        self.engine = engine
+        self.cache_size = cache_size
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _plan_for(self, key, crop, cities, starts, period, shelf_periods):
+        tables = self.engine.tables
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None and plan.matches(tables):
+                self._plans.move_to_end(key)
+                return plan
+        plan = TimePhasedPlan(self.engine, crop, cities, starts, period, shelf_periods)
+        if self.cache_size > 0:
+            with self._lock:
+                self._plans[key] = plan
+                while len(self._plans) > self.cache_size:
+                    self._plans.popitem(last=False)
+        return plan
+
+    def plan(self, crop, demands, starts, period='week', shelf_life=DEFAULT_SHELF_LIFE_DAYS):
+        """
+        Shipment schedule for {city: [tons per period]} of crop over the
+        periods beginning at starts (see period_starts()). Raises NetworkError
+        for an unknown crop or city.
+        """
+        shelf_periods = int(shelf_life // PERIOD_DAYS[period])
+        cities = tuple(sorted(demands))
+        key = (crop, cities, period, tuple(starts), shelf_periods)
+        plan = self._plan_for(key, crop, cities, starts, period, shelf_periods)
+
+        started = time.perf_counter()
+        with plan.lock:
+            report, warm = plan.solve(demands, self.engine.tables)
+        report["solve"] = {"warm": warm, "seconds": round(time.perf_counter() - started, 4)}
+        report["shelf_life_periods"] = shelf_periods
+        return report
@@ -0,0 +1,164 @@
+"""
+Bulk Scoring Benchmark
+Throughput of batch scoring through the Flask app for /predict_suitability
+and /forecast_vegan_demand with JSON rows, NumPy .npy and Arrow IPC payloads
+(Arrow only when pyarrow is installed), plus single-row JSON requests as a
+baseline (timed on a sample and extrapolated).
+
+Usage:
+    python benchmarks/bench_bulk_scoring.py            # 100k rows
+    python benchmarks/bench_bulk_scoring.py --rows 10000
+
+Client-side encoding/decoding is included in each timing. Results are
+written to benchmarks/results/bulk_scoring.json.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'backend'))
+
+import app as backend  # noqa: E402  (loads models and data)
+import bulk  # noqa: E402
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+RESULTS_PATH = os.path.join(BASE_DIR, 'benchmarks', 'results', 'bulk_scoring.json')
+SINGLE_ROW_SAMPLE = 500
+
+NUMERIC_RANGES = {
+    'soil_ph': (5.5, 8.5), 'rainfall': (300, 1200), 'temperature': (18, 38),
+    'irrigation': (0, 1), 'distance_to_city': (5, 300),
+    'price': (80, 600), 'genz_ratio': (0, 1), 'google_trends_score': (0, 100),
+    'month': (1, 12), 'quarter': (1, 4)
+}
+INTEGER_FIELDS = {'irrigation', 'month', 'quarter'}
+
+def generate_columns(fields, lookups, n_rows, seed=42):
+    """Random input columns; categorical fields hold strings from the model vocabulary."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, kind in fields:
+        if kind == 'cat':
+            columns[name] = rng.choice(np.array(list(lookups[name]), dtype=object), n_rows)
+        elif name in INTEGER_FIELDS:
+            low, high = NUMERIC_RANGES[name]
+            columns[name] = rng.integers(low, high + 1, n_rows)
+        else:
+            low, high = NUMERIC_RANGES[name]
+            columns[name] = np.round(rng.uniform(low, high, n_rows), 3)
+    if 'month' in columns:
+        columns['quarter'] = (columns['month'] - 1) // 3 + 1
+    return columns
+
+def encode_json(columns):
+    names = list(columns)
+    rows = [dict(zip(names, values)) for values in zip(*(columns[name].tolist() for name in names))]
+    return json.dumps({"rows": rows}), 'application/json'
+
+def encode_npy(columns):
+    dtype = [
+        (name, f'U{max(len(v) for v in values)}' if values.dtype == object else values.dtype)
+        for name, values in columns.items()
+    ]
+    array = np.empty(len(next(iter(columns.values()))), dtype=dtype)
+    for name, values in columns.items():
+        array[name] = values
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue(), bulk.NPY
+
+def encode_arrow(columns):
+    table = pa.table({name: pa.array(values.tolist() if values.dtype == object else values)
+                      for name, values in columns.items()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes(), bulk.ARROW_STREAM
+
+def decode(response, output_field):
+    if response.mimetype == bulk.NPY:
+        return np.load(io.BytesIO(response.data), allow_pickle=False)
+    if response.mimetype == bulk.ARROW_STREAM:
+        return pa.ipc.open_stream(response.data).read_all().column(output_field).to_numpy()
+    return np.asarray(response.get_json()[output_field])
+
+def time_batch(client, endpoint, columns, encoder, output_field):
+    start = time.perf_counter()
+    body, content_type = encoder(columns)
+    response = client.post(endpoint, data=body, content_type=content_type)
+    if response.status_code != 200:
+        raise RuntimeError(f"{endpoint} returned {response.status_code}: {response.data[:200]}")
+    predictions = decode(response, output_field)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(body), predictions
+
+def time_single_rows(client, endpoint, columns, n_rows):
+    names = list(columns)
+    sample = min(SINGLE_ROW_SAMPLE, n_rows)
+    start = time.perf_counter()
+    for i in range(sample):
+        client.post(endpoint, json={name: columns[name][i].item() if hasattr(columns[name][i], 'item')
+                                    else columns[name][i] for name in names})
+    return (time.perf_counter() - start) / sample * n_rows
+
+def run(n_rows):
+    client = backend.app.test_client()
+    targets = [
+        ('/predict_suitability', backend.crop_suitability_model, bulk.SUITABILITY_FIELDS, 'suitability_score'),
+        ('/forecast_vegan_demand', backend.vegan_demand_model, bulk.VEGAN_DEMAND_FIELDS, 'predicted_consumption')
+    ]
+    encoders = [('json', encode_json), ('npy', encode_npy)]
+    if pa is not None:
+        encoders.append(('arrow', encode_arrow))
+
+    results = {"rows": n_rows, "endpoints": {}}
+    for endpoint, model_data, fields, output_field in targets:
+        columns = generate_columns(fields, model_data['lookups'], n_rows)
+        endpoint_results = {}
+
+        reference = None
+        for name, encoder in encoders:
+            elapsed, size, predictions = time_batch(client, endpoint, columns, encoder, output_field)
+            if reference is None:
+                reference = predictions
+            endpoint_results[name] = {
+                "seconds": round(elapsed, 4),
+                "rows_per_second": round(n_rows / elapsed),
+                "request_bytes": size,
+                "max_abs_diff_vs_json": float(np.max(np.abs(np.round(predictions, 3) - reference)))
+            }
+
+        projected = time_single_rows(client, endpoint, columns, n_rows)
+        endpoint_results['json_single_row_projected'] = {
+            "seconds": round(projected, 2),
+            "rows_per_second": round(n_rows / projected)
+        }
+        results["endpoints"][endpoint] = endpoint_results
+
+        print(f"\n{endpoint} ({n_rows:,} rows)")
+        for name, stats in endpoint_results.items():
+            print(f"  {name:26s} {stats['seconds']:9.3f}s  {stats['rows_per_second']:>10,} rows/s")
+    return results
+
+def main():
+    args = sys.argv[1:]
+    n_rows = int(args[args.index('--rows') + 1]) if '--rows' in args else 100_000
+    results = run(n_rows)
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✓ Results saved to {RESULTS_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Endpoint Benchmark
+Latency distribution and throughput of every API endpoint through Flask's
+test client (in-process, no server or network needed).
+
+For each endpoint:
+- latency: --requests sequential requests (after a short warm-up), each with
+  a payload drawn from a random CSV row; reports mean/p50/p90/p95/p99/max
+- throughput: requests per second with 1, 2, 4, ... client threads
+  (--concurrency), each thread using its own test client
+
+Usage:
+    python benchmarks/bench_endpoints.py
+    python benchmarks/bench_endpoints.py --requests 500 --concurrency 1 4 16
+    python benchmarks/bench_endpoints.py --endpoints forecast_vegan_demand optimize_supply_chain
+
+Results are written to benchmarks/results/endpoints.json.
+"""
+
+import time
+import argparse
+import threading
+import numpy as np
+
+import harness
+import payloads
+import app as backend  # loads models and data
+
+WARMUP_REQUESTS = 20
+
+def call(client, endpoint, payload):
+    method, path = payloads.ENDPOINTS[endpoint]
+    if method == 'GET':
+        return client.get(path)
+    return client.post(path, json=payload)
+
+def measure_latency(endpoint, frames, requests, seed=0):
+    rng = np.random.default_rng(seed)
+    client = backend.app.test_client()
+    bodies = [payloads.recorded_payload(endpoint, frames, rng) for _ in range(WARMUP_REQUESTS + requests)]
+
+    durations, errors = [], 0
+    for position, body in enumerate(bodies):
+        start = time.perf_counter()
+        response = call(client, endpoint, body)
+        elapsed = time.perf_counter() - start
+        if position < WARMUP_REQUESTS:
+            continue
+        durations.append(elapsed)
+        errors += response.status_code >= 400
+    return {**harness.latency_summary(durations), "errors": errors}
+
+def measure_throughput(endpoint, frames, threads, seconds, seed=0):
+    """Requests per second with `threads` concurrent clients for `seconds`."""
+    rng = np.random.default_rng(seed)
+    bodies = [payloads.recorded_payload(endpoint, frames, rng) for _ in range(256)]
+    counts = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def client_loop(slot):
+        client = backend.app.test_client()
+        while time.perf_counter() < deadline:
+            call(client, endpoint, bodies[(counts[slot] * threads + slot) % len(bodies)])
+            counts[slot] += 1
+
+    workers = [threading.Thread(target=client_loop, args=(slot,)) for slot in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return round(sum(counts) / (time.perf_counter() - start), 1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--seconds', type=float, default=2.0, help="duration of each throughput run")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--endpoints', nargs='+', choices=list(payloads.ENDPOINTS), default=list(payloads.ENDPOINTS))
+    args = parser.parse_args()
+
+    frames = payloads.load_frames()
+    results = {"requests": args.requests, "seconds": args.seconds, "endpoints": {}}
+
+    print(f"{'endpoint':24s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}  "
+          + ''.join(f"{f'{c} thr rps':>12s}" for c in args.concurrency))
+    for endpoint in args.endpoints:
+        latency = measure_latency(endpoint, frames, args.requests)
+        throughput = {
+            str(threads): measure_throughput(endpoint, frames, threads, args.seconds)
+            for threads in args.concurrency
+        }
+        results["endpoints"][endpoint] = {"latency": latency, "requests_per_second": throughput}
+        print(f"{endpoint:24s} {latency['p50_ms']:9.2f} {latency['p95_ms']:9.2f} {latency['p99_ms']:9.2f}  "
+              + ''.join(f"{throughput[str(c)]:12.1f}" for c in args.concurrency)
+              + (f"  ({latency['errors']} errors)" if latency['errors'] else ''))
+
+    harness.save_results('endpoints', results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Inference Pool Benchmark
+Prediction throughput of the served models under concurrent request threads,
+in-process (the default threaded server: predictions contend for the GIL)
+vs backend/inference_pool.py with 1, 2, 4, ... worker processes.
+
+Each client thread repeatedly predicts a batch of feature rows, as
+/forecast_vegan_demand (1 row), a scenario sweep chunk (--batch) and a
+bulk request above the shared-memory threshold (--large) would.
+
+Usage:
+    python benchmarks/bench_inference_pool.py
+    python benchmarks/bench_inference_pool.py --threads 8 --seconds 3
+
+Throughput should scale with the pool size up to the number of cores.
+Results are written to benchmarks/results/inference_pool.json.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'backend'))
+
+import app as backend  # noqa: E402  (loads models and data)
+import inference_pool  # noqa: E402
+import scenarios  # noqa: E402
+
+RESULTS_PATH = os.path.join(BASE_DIR, 'benchmarks', 'results', 'inference_pool.json')
+MODEL = 'vegan_demand_forecast'
+
+def pool_sizes(cores):
+    sizes, size = [], 1
+    while size < cores:
+        sizes.append(size)
+        size *= 2
+    return sizes + [cores]
+
+def throughput(predict, features, threads, seconds):
+    """Predictions per second with `threads` clients calling predict(features) for `seconds`."""
+    counts = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def client(slot):
+        while time.perf_counter() < deadline:
+            predict(features)
+            counts[slot] += 1
+
+    workers = [threading.Thread(target=client, args=(slot,)) for slot in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=os.cpu_count() * 2)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--batch', type=int, default=scenarios.SWEEP_CHUNK_ROWS)
+    parser.add_argument('--large', type=int, default=50000)
+    args = parser.parse_args()
+
+    local_model = backend.vegan_demand_model['model']
+    if isinstance(local_model, inference_pool.PooledModel):
+        sys.exit("Unset VOIS_INFERENCE_WORKERS: the in-process baseline needs the local model")
+
+    rng = np.random.default_rng(0)
+    n_features = local_model.n_features_in_
+    payloads = {
+        'single_row': rng.random((1, n_features)),
+        f'batch_{args.batch}': rng.random((args.batch, n_features)),
+        f'large_{args.large}': rng.random((args.large, n_features))
+    }
+
+    cores = os.cpu_count()
+    results = {"cores": cores, "threads": args.threads, "seconds": args.seconds,
+               "shm_min_bytes": inference_pool.SHM_MIN_BYTES, "requests_per_second": {}}
+
+    configurations = [('in_process', None)] + [(f'pool_{size}', size) for size in pool_sizes(cores)]
+    for label, size in configurations:
+        pool = inference_pool.InferencePool(backend.model_paths, workers=size) if size else None
+        predict = pool.model(MODEL).predict if pool else local_model.predict
+        results["requests_per_second"][label] = {
+            name: round(throughput(predict, features, args.threads, args.seconds), 1)
+            for name, features in payloads.items()
+        }
+        if pool:
+            pool.shutdown()
+
+    print(f"Requests/s with {args.threads} client threads on {cores} cores")
+    header = ''.join(f"{name:>16s}" for name in payloads)
+    print(f"  {'':12s}{header}")
+    for label, rates in results["requests_per_second"].items():
+        print(f"  {label:12s}" + ''.join(f"{rates[name]:16.1f}" for name in payloads))
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✓ Results saved to {RESULTS_PATH}")
+
+if __name__ == "__main__":
+    main()
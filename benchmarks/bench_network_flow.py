@@ -0,0 +1,90 @@
+"""
+Network Flow Benchmark
+Solve time of backend/min_cost_flow.py on synthetic district -> hub -> city
+networks of increasing size, shaped like logistics.network_plan(): every
+district ships to its 5 nearest hubs, hubs have processing capacity and
+storage cost, and each hub serves its 20 nearest cities.
+
+After each cold solve the demand of one city, then of every city, is
+raised by 20% and re-solved warm (as supply_planner.py does when a
+forecast changes).
+
+Usage:
+    python benchmarks/bench_network_flow.py
+    python benchmarks/bench_network_flow.py --districts 100 1000 5000
+
+Results are written to benchmarks/results/network_flow.json.
+"""
+
+import math
+import random
+import argparse
+
+import harness
+from min_cost_flow import MinCostFlow
+
+HUBS_PER_SOURCE = 5
+CITIES_PER_HUB = 20
+
+def nearest(point, others, count):
+    return sorted(range(len(others)), key=lambda j: math.dist(point, others[j]))[:count]
+
+def build_network(districts, seed=0):
+    """
+    Random network with districts sources, districts/8 hubs and districts/15
+    cities (km-scale costs). Returns (graph, source, sink, city demand edges).
+    """
+    rng = random.Random(seed)
+    hubs, cities = max(2, districts // 8), max(2, districts // 15)
+    place = lambda: (rng.uniform(0, 800), rng.uniform(0, 800))
+    district_xy = [place() for _ in range(districts)]
+    hub_xy = [place() for _ in range(hubs)]
+    city_xy = [place() for _ in range(cities)]
+
+    graph = MinCostFlow(2 + districts + 2 * hubs + cities)
+    source, sink = 0, 1
+    hub_in = lambda h: 2 + districts + h
+    hub_out = lambda h: 2 + districts + hubs + h
+    city = lambda c: 2 + districts + 2 * hubs + c
+
+    for d in range(districts):
+        graph.add_edge(source, 2 + d, rng.uniform(50, 2000), 0.0)
+        for h in nearest(district_xy[d], hub_xy, HUBS_PER_SOURCE):
+            graph.add_edge(2 + d, hub_in(h), math.inf, math.dist(district_xy[d], hub_xy[h]) * 1.25)
+    for h in range(hubs):
+        graph.add_edge(hub_in(h), hub_out(h), rng.uniform(1000, 8000), rng.uniform(10, 100))
+        for c in nearest(hub_xy[h], city_xy, CITIES_PER_HUB):
+            graph.add_edge(hub_out(h), city(c), math.inf, math.dist(hub_xy[h], city_xy[c]) * 1.25)
+    demand_edges = [graph.add_edge(city(c), sink, rng.uniform(2000, 8000), 0.0) for c in range(cities)]
+    return graph, source, sink, demand_edges
+
+def resolve_warm(graph, source, sink, edges, factor=1.2):
+    for edge in edges:
+        graph.set_capacity(edge, graph.capacity[edge // 2] * factor)
+    return graph.solve(source, sink, warm=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--districts', type=int, nargs='+', default=[10, 100, 500, 1000, 2000])
+    args = parser.parse_args()
+
+    results = {"networks": {}}
+    print(f"{'districts':>10s} {'nodes':>8s} {'edges':>8s} {'flow':>12s} {'solve s':>9s} "
+          f"{'warm 1 s':>9s} {'warm all s':>10s}")
+    for districts in args.districts:
+        graph, source, sink, demand_edges = build_network(districts)
+        (flow, cost), seconds = harness.timed(graph.solve, source, sink)
+        _, warm_one = harness.timed(resolve_warm, graph, source, sink, demand_edges[:1])
+        _, warm_all = harness.timed(resolve_warm, graph, source, sink, demand_edges)
+        results["networks"][str(districts)] = {
+            "nodes": graph.node_count, "edges": graph.edge_count,
+            "flow": round(flow, 1), "cost": round(cost, 1), "solve_seconds": round(seconds, 4),
+            "warm_one_city_seconds": round(warm_one, 4), "warm_all_cities_seconds": round(warm_all, 4)
+        }
+        print(f"{districts:10d} {graph.node_count:8d} {graph.edge_count:8d} {flow:12.1f} {seconds:9.4f} "
+              f"{warm_one:9.4f} {warm_all:10.4f}")
+
+    harness.save_results('network_flow', results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Plan Simulation Benchmark
+Throughput of the /simulate_plan Monte Carlo (backend/risk.py) for growing
+scenario counts and candidate lane counts, without a latency budget. Demand
+is spread by the per-tree forecasts of a simulated 100-tree forest; ms
+covers both policies and the percentiles.
+
+Usage:
+    python benchmarks/bench_simulation.py
+    python benchmarks/bench_simulation.py --scenarios 10000 100000 --lanes 10 1000
+
+Results are written to benchmarks/results/simulation.json.
+"""
+
+import argparse
+import numpy as np
+
+import harness
+import risk
+
+def plan_lanes(count, seed=0):
+    """count ranked lanes from count / 3 districts, filled for half the total supply."""
+    rng = np.random.default_rng(seed)
+    supply = rng.uniform(50, 2000, size=count)
+    required = supply.sum() / 2
+    allocated = np.clip(required - np.concatenate([[0], np.cumsum(supply)[:-1]]), 0, supply)
+    lanes = {
+        "sources": [f'District {i}' for i in rng.integers(0, max(1, count // 3), size=count)],
+        "supply": supply.tolist(),
+        "transport_cost": rng.uniform(100, 1500, size=count).tolist(),
+        "allocated": allocated.tolist()
+    }
+    return lanes, float(required)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scenarios', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--lanes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=3, help="runs per size (best is kept)")
+    args = parser.parse_args()
+
+    ratios = risk.demand_ratios(np.random.default_rng(1).normal(1000, 120, size=100))
+    results = {"runs": {}}
+    print(f"{'lanes':>8s} {'scenarios':>10s} {'ms':>10s} {'scenarios/s':>12s}")
+    for count in args.lanes:
+        lanes, required = plan_lanes(count)
+        for scenarios in args.scenarios:
+            best = min(
+                harness.timed(risk.simulate, lanes, required, scenarios, 0.15,
+                              ratios=ratios, seed=0, budget_ms=float('inf'))[1]
+                for _ in range(args.repeat)
+            )
+            results["runs"][f"{count}x{scenarios}"] = {
+                "lanes": count, "scenarios": scenarios,
+                "ms": round(best * 1e3, 3), "scenarios_per_second": round(scenarios / best)
+            }
+            print(f"{count:8d} {scenarios:10d} {best * 1e3:10.3f} {scenarios / best:12.0f}")
+
+    harness.save_results('simulation', results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Spatial Index Benchmark
+Nearest-k and radius query time of logistics.SpatialIndex (haversine
+BallTree) against a linear scan of every site, for site counts of 1k to 1M
+spread over India, with and without a crop mask that keeps 20% of sites.
+
+Usage:
+    python benchmarks/bench_spatial_index.py
+    python benchmarks/bench_spatial_index.py --sites 1000 100000 --queries 500
+
+Results are written to benchmarks/results/spatial_index.json.
+"""
+
+import time
+import argparse
+import numpy as np
+
+import harness
+from logistics import SpatialIndex, haversine_matrix, ROAD_FACTOR
+
+def random_sites(count, rng):
+    return np.column_stack([rng.uniform(8, 30, size=count), rng.uniform(70, 90, size=count)])
+
+def per_query_us(func, points):
+    start = time.perf_counter()
+    for point in points:
+        func(point)
+    return (time.perf_counter() - start) / len(points) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sites', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--radius-km', type=float, default=300)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    points = [tuple(point) for point in random_sites(args.queries, rng)]
+    results = {"sites": {}}
+    print(f"{'sites':>10s} {'build s':>8s} {'nearest us':>11s} {'masked us':>10s} {'within us':>10s} {'scan us':>10s}")
+    for count in args.sites:
+        sites = random_sites(count, rng)
+        mask = rng.random(count) < 0.2
+        index, build = harness.timed(SpatialIndex, sites)
+
+        def scan(point):
+            distance = haversine_matrix([point], sites)[0] * ROAD_FACTOR
+            return np.argsort(distance)[:args.k]
+
+        timings = {
+            "build_seconds": round(build, 4),
+            "nearest_us": per_query_us(lambda p: index.nearest(p, args.k), points),
+            "nearest_masked_us": per_query_us(lambda p: index.nearest(p, args.k, mask), points),
+            "within_us": per_query_us(lambda p: index.within(p, args.radius_km, mask), points),
+            "linear_scan_us": per_query_us(scan, points[:max(1, args.queries // 10)])
+        }
+        results["sites"][str(count)] = {key: round(value, 1) if key.endswith('_us') else value
+                                        for key, value in timings.items()}
+        print(f"{count:10d} {build:8.3f} {timings['nearest_us']:11.1f} {timings['nearest_masked_us']:10.1f} "
+              f"{timings['within_us']:10.1f} {timings['linear_scan_us']:10.1f}")
+
+    harness.save_results('spatial_index', results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Supply Delta Benchmark
+Time to re-optimize an /optimize_supply_chain allocation (backend/allocations.py)
+after a change, from scratch vs as a delta, for candidate lists of growing size:
+
+- full: rank-ordered greedy fill of the whole list, as a cold request does
+- demand: one destination's required quantity changes by 1%
+- supply: one district's supply_quantity halves (its lanes before the frontier)
+
+Delta times should stay flat as the list grows.
+
+Usage:
+    python benchmarks/bench_supply_delta.py
+    python benchmarks/bench_supply_delta.py --lanes 1000 100000 --repeat 200
+
+Results are written to benchmarks/results/supply_delta.json.
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+
+import harness
+from allocations import Allocation
+
+def ranked_lanes(count, seed=0):
+    """count candidate lanes from count / 10 districts, already in priority order."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'source_district': [f'District {i}' for i in rng.integers(0, max(1, count // 10), size=count)],
+        'supply_quantity': rng.uniform(50, 2000, size=count),
+        'transport_cost': rng.uniform(100, 1500, size=count),
+        'suitability_score': rng.uniform(0, 1, size=count)
+    })
+
+def best_of(repeat, func, *args):
+    return min(harness.timed(func, *args)[1] for _ in range(repeat))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lanes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=50, help="runs per delta (best is kept)")
+    args = parser.parse_args()
+
+    results = {"lanes": {}}
+    print(f"{'lanes':>10s} {'full ms':>10s} {'demand ms':>10s} {'supply ms':>10s}")
+    for count in args.lanes:
+        ranked = ranked_lanes(count)
+        solution = Allocation(ranked)
+        # Ask for about half the total supply so the frontier sits mid-list
+        required = float(ranked['supply_quantity'].sum()) / 2
+        full = harness.timed(solution.set_required, required)[1]
+
+        demand = best_of(args.repeat, lambda: (solution.set_required(required * 1.01),
+                                               solution.set_required(required))) / 2
+        district = solution.sources[solution.frontier // 2]
+        supply = solution.supply[solution.frontier // 2]
+        supply_delta = best_of(args.repeat, lambda: (solution.set_supply(district, supply / 2),
+                                                     solution.set_supply(district, supply))) / 2
+
+        results["lanes"][str(count)] = {
+            "full_ms": round(full * 1e3, 3), "demand_delta_ms": round(demand * 1e3, 4),
+            "supply_delta_ms": round(supply_delta * 1e3, 4)
+        }
+        print(f"{count:10d} {full * 1e3:10.3f} {demand * 1e3:10.4f} {supply_delta * 1e3:10.4f}")
+
+    harness.save_results('supply_delta', results)
+
+if __name__ == "__main__":
+    main()
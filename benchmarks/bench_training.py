@@ -0,0 +1,94 @@
+"""
+Startup, Training & Data Generation Benchmark
+Wall-clock time of the offline and startup stages:
+
+- startup: backend load_models() and load_data() (best of --repeat runs)
+- training: each train_* function in train_models.py with its configured
+  family, trained with save=False so the served models are left untouched
+- generation: each generate_* function in data/generate_data.py at 1k, 100k
+  and 1M rows (--sizes); nothing is written to data/
+
+Usage:
+    python benchmarks/bench_training.py
+    python benchmarks/bench_training.py --sizes 1000 100000 --skip-training
+
+Results are written to benchmarks/results/training.json.
+"""
+
+import io
+import os
+import sys
+import argparse
+import contextlib
+
+import harness
+
+sys.path.insert(0, harness.BASE_DIR)
+sys.path.insert(0, os.path.join(harness.BASE_DIR, 'data'))
+
+import generate_data  # noqa: E402
+
+TRAINERS = ('train_crop_advisor', 'train_demand_radar', 'train_crop_suitability', 'train_vegan_demand_forecast')
+GENERATORS = ('generate_crop_data', 'generate_demand_data', 'generate_vegan_consumption_data',
+              'generate_crop_suitability_data', 'generate_logistics_supply_data')
+
+def quietly(func, *args, **kwargs):
+    """timed() with the function's console output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return harness.timed(func, *args, **kwargs)
+
+def time_startup(repeat):
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as backend  # first import loads models and data once
+    return {
+        stage: round(min(quietly(getattr(backend, stage))[1] for _ in range(repeat)), 4)
+        for stage in ('load_models', 'load_data')
+    }
+
+def time_training():
+    import train_models
+    # train_models reads data/ and models/ relative to the repository root
+    os.chdir(harness.BASE_DIR)
+    return {
+        name: round(quietly(getattr(train_models, name), save=False)[1], 3)
+        for name in TRAINERS
+    }
+
+def time_generation(sizes):
+    results = {}
+    for name in GENERATORS:
+        results[name] = {}
+        for size in sizes:
+            results[name][str(size)] = round(quietly(getattr(generate_data, name), size)[1], 3)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3, help="startup runs (best is kept)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--skip-training', action='store_true')
+    parser.add_argument('--skip-generation', action='store_true')
+    args = parser.parse_args()
+
+    results = {"startup_seconds": time_startup(args.repeat)}
+    print("Startup (s)")
+    for stage, seconds in results["startup_seconds"].items():
+        print(f"  {stage:32s} {seconds:10.4f}")
+
+    if not args.skip_training:
+        results["training_seconds"] = time_training()
+        print("Training (s)")
+        for name, seconds in results["training_seconds"].items():
+            print(f"  {name:32s} {seconds:10.3f}")
+
+    if not args.skip_generation:
+        results["generation"] = time_generation(args.sizes)
+        print("Data generation (s)")
+        print(f"  {'':32s}" + ''.join(f"{size:>12,d}" for size in args.sizes))
+        for name, timings in results["generation"].items():
+            print(f"  {name:32s}" + ''.join(f"{timings[str(size)]:12.3f}" for size in args.sizes))
+
+    harness.save_results('training', results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Validation & Serialization Benchmark
+Per-request cost of payload validation and response encoding:
+
+- validation: the old handler pattern (get fields, required-field loop,
+  float()/int() per field) vs the compiled schemas in backend/schemas.py
+- encoding: Flask's default provider (json.dumps with sorted keys) vs
+  orjson (backend/json_provider.py), when orjson is installed
+
+Usage:
+    python benchmarks/bench_validation.py
+
+Results are written to benchmarks/results/validation.json.
+"""
+
+import os
+import sys
+import json
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'backend'))
+
+import schemas  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+RESULTS_PATH = os.path.join(BASE_DIR, 'benchmarks', 'results', 'validation.json')
+NUMBER = 20000
+
+SUITABILITY_PAYLOAD = {
+    "district": "Anantapur", "crop": "Millets", "soil_ph": 6.8, "soil_type": "Red Soil",
+    "rainfall": 550.0, "temperature": 28.0, "irrigation": 1, "distance_to_city": 50.0
+}
+FORECAST_PAYLOAD = {
+    "region": "Mumbai", "product": "Oat Milk", "price": 200.0, "genz_ratio": 0.5,
+    "google_trends_score": 70.0, "month": 6, "quarter": 2
+}
+
+def legacy_suitability(data):
+    required_fields = ['district', 'crop', 'soil_ph', 'soil_type', 'rainfall',
+                       'temperature', 'irrigation', 'distance_to_city']
+    for field in required_fields:
+        if field not in data:
+            raise KeyError(field)
+    return [
+        float(data['soil_ph']), data['soil_type'], float(data['rainfall']),
+        float(data['temperature']), int(data['irrigation']),
+        float(data['distance_to_city']), data['crop'], data['district']
+    ]
+
+def legacy_forecast(data):
+    required_fields = ['region', 'product', 'price', 'genz_ratio', 'google_trends_score', 'month', 'quarter']
+    for field in required_fields:
+        if field not in data:
+            raise KeyError(field)
+    return [
+        float(data['price']), float(data['genz_ratio']),
+        float(data['google_trends_score']), data['region'],
+        data['product'], int(data['month']), int(data['quarter'])
+    ]
+
+def sample_responses():
+    """Representative response bodies: single forecast, supply plan and a 41 x 21 sweep."""
+    forecast = {"predicted_consumption": 812.44, "genz_adoption_index": 0.35,
+                "price_elasticity": -0.412, "price_elasticity_score": 0.708}
+    plan = {
+        "optimal_sources": [
+            {"source_district": f"District {i}", "allocation_percentage": 12.5, "transport_cost": 412.3,
+             "total_cost": 51.54, "suitability_score": 0.731} for i in range(8)
+        ],
+        "total_cost": 412.32, "waste_reduction_percentage": 50.0
+    }
+    sweep = {
+        "x": {"feature": "price", "values": [100.0 + 10 * i for i in range(41)]},
+        "y": {"feature": "genz_ratio", "values": [0.05 * j for j in range(21)]},
+        "consumption": [[round(500 + 3.7 * i - 2.1 * j, 2) for i in range(41)] for j in range(21)]
+    }
+    return {"forecast": forecast, "supply_plan": plan, "scenario_sweep": sweep}
+
+def per_call_us(func, number=NUMBER):
+    return round(min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6, 3)
+
+def main():
+    results = {"validation_us": {}, "encoding_us": {}}
+
+    for name, payload, legacy, schema in (
+        ('predict_suitability', SUITABILITY_PAYLOAD, legacy_suitability, schemas.PREDICT_SUITABILITY),
+        ('forecast_vegan_demand', FORECAST_PAYLOAD, legacy_forecast, schemas.FORECAST_VEGAN_DEMAND)
+    ):
+        results["validation_us"][name] = {
+            "legacy": per_call_us(lambda: legacy(payload)),
+            "schema": per_call_us(lambda: schema.validate(payload))
+        }
+
+    for name, body in sample_responses().items():
+        timings = {"json_sorted": per_call_us(lambda: json.dumps(body, sort_keys=True), number=2000)}
+        if orjson is not None:
+            timings["orjson"] = per_call_us(
+                lambda: orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY).decode(), number=2000
+            )
+        results["encoding_us"][name] = timings
+
+    print("Validation (µs per request)")
+    for name, timings in results["validation_us"].items():
+        print(f"  {name:24s} legacy={timings['legacy']:7.2f}  schema={timings['schema']:7.2f}")
+    print("Response encoding (µs per response)")
+    for name, timings in results["encoding_us"].items():
+        line = f"  {name:24s} json={timings['json_sorted']:8.2f}"
+        if 'orjson' in timings:
+            line += f"  orjson={timings['orjson']:8.2f}  saved={timings['json_sorted'] - timings['orjson']:8.2f}"
+        print(line)
+    if orjson is None:
+        print("  (orjson not installed; pip install orjson to compare)")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✓ Results saved to {RESULTS_PATH}")
+
+if __name__ == "__main__":
+    main()
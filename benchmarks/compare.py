@@ -0,0 +1,72 @@
+"""
+Benchmark Comparison
+Compare two benchmark result files (or two history directories written by
+run_all.py) metric by metric:
+
+    python benchmarks/compare.py OLD NEW [--threshold 10]
+
+Every numeric value present in both runs is listed with its relative change.
+Metrics whose name mentions per-second rates are higher-is-better, all other
+timings lower-is-better; changes for the worse beyond --threshold percent
+are flagged as regressions and make the script exit with status 1.
+"""
+
+import os
+import sys
+import json
+import argparse
+
+HIGHER_IS_BETTER = ('per_second', 'rps', 'throughput', 'speedup')
+# Descriptive fields that are not measurements
+IGNORED_KEYS = {'count', 'rows', 'requests', 'seconds', 'threads', 'cores', 'shm_min_bytes', 'concurrency', 'rate'}
+SKIPPED_SECTIONS = {'environment', 'source'}
+
+def load(path):
+    """{file name: results} for a result file or a directory of them."""
+    if os.path.isdir(path):
+        return {
+            name: json.load(open(os.path.join(path, name)))
+            for name in sorted(os.listdir(path)) if name.endswith('.json')
+        }
+    return {os.path.basename(path): json.load(open(path))}
+
+def flatten(results, prefix=''):
+    """Yield (dotted key, value) for every numeric leaf."""
+    for key, value in results.items():
+        if key in SKIPPED_SECTIONS or (key in IGNORED_KEYS and not isinstance(value, dict)):
+            continue
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            yield from flatten(value, name)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    regressions = 0
+    for filename in sorted(set(old) & set(new)):
+        old_metrics, new_metrics = dict(flatten(old[filename])), dict(flatten(new[filename]))
+        commits = (old[filename].get('environment', {}).get('commit'),
+                   new[filename].get('environment', {}).get('commit'))
+        print(f"\n{filename}  ({commits[0]} → {commits[1]})")
+        for key in sorted(set(old_metrics) & set(new_metrics)):
+            before, after = old_metrics[key], new_metrics[key]
+            if before == 0:
+                continue
+            change = (after - before) / abs(before) * 100
+            worse = -change if any(marker in key for marker in HIGHER_IS_BETTER) else change
+            flag = "  ✗ regression" if worse > args.threshold else ""
+            regressions += bool(flag)
+            print(f"  {key:64s} {before:12.3f} → {after:12.3f}  {change:+7.1f}%{flag}")
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0f}%")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark Harness
+Shared helpers for the benchmark scripts: timing, latency summaries and
+result files.
+
+Every script saves benchmarks/results/<name>.json through save_results(),
+which adds the git commit, Python version and core count so runs can be
+compared with benchmarks/compare.py. benchmarks/run_all.py runs the suite and
+also keeps a copy of each run under benchmarks/results/history/<commit>/.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+from datetime import datetime
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BASE_DIR, 'benchmarks', 'results')
+
+PERCENTILES = (50, 90, 95, 99)
+
+sys.path.insert(0, os.path.join(BASE_DIR, 'backend'))
+
+def git_commit():
+    """Short hash of HEAD (with '-dirty' for uncommitted changes), or 'unknown'."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BASE_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{commit}-dirty" if dirty else commit
+
+def environment():
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cores": os.cpu_count()
+    }
+
+def timed(func, *args, **kwargs):
+    """(result, seconds) of one call."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def latency_summary(seconds):
+    """count, mean, percentiles and max of a list of durations, in milliseconds."""
+    samples = np.asarray(seconds, dtype=float) * 1000
+    if not len(samples):
+        return {"count": 0}
+    summary = {"count": int(len(samples)), "mean_ms": round(float(samples.mean()), 3)}
+    for percentile, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES)):
+        summary[f"p{percentile}_ms"] = round(float(value), 3)
+    summary["max_ms"] = round(float(samples.max()), 3)
+    return summary
+
+def save_results(name, results):
+    """Write results/<name>.json with the run environment; returns the path."""
+    path = os.path.join(RESULTS_DIR, f'{name}.json')
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({"environment": environment(), **results}, f, indent=2)
+    print(f"\n✓ Results saved to {path}")
+    return path
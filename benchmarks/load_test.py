@@ -0,0 +1,190 @@
+"""
+Load Test
+Replay recorded or synthetic API traffic with configurable concurrency and
+arrival rate, and report latency percentiles, error rates and throughput
+per endpoint.
+
+Traffic files are JSON lines, one request per line:
+
+    {"method": "POST", "path": "/forecast_vegan_demand", "body": {"region": "Mumbai", ...}}
+
+Lines without a "path" are skipped. Instead of a file, --mix synthesizes
+traffic for /forecast_vegan_demand and /optimize_supply_chain from the CSV
+value distributions (see payloads.synthetic_payload); --save-traffic writes
+it out for later replays.
+
+Requests go to the app in-process through Flask's test client, or to a
+running server with --url. With --rate, arrivals follow a Poisson process at
+that many requests/s (open loop) and latency is measured from each request's
+scheduled arrival, so queueing behind a saturated server shows up in the
+percentiles. Without --rate, every worker sends back to back (closed loop).
+
+Usage:
+    python benchmarks/load_test.py --mix forecast_vegan_demand=70 optimize_supply_chain=30 --requests 2000
+    python benchmarks/load_test.py --traffic traffic.jsonl --concurrency 16 --rate 200
+    python benchmarks/load_test.py --traffic traffic.jsonl --url http://localhost:5000
+
+Results are written to benchmarks/results/load_test.json.
+"""
+
+import json
+import time
+import argparse
+import threading
+from collections import defaultdict
+import numpy as np
+
+import harness
+import payloads
+
+def read_traffic(path):
+    records, skipped = [], 0
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict) or 'path' not in record:
+                skipped += 1
+                continue
+            records.append({"method": record.get('method', 'POST' if 'body' in record else 'GET').upper(),
+                            "path": record['path'], "body": record.get('body')})
+    if skipped:
+        print(f"Skipped {skipped} line(s) without a request path")
+    return records
+
+def parse_mix(items):
+    """['forecast_vegan_demand=70', ...] -> {endpoint: probability}"""
+    weights = {}
+    for item in items:
+        endpoint, _, weight = item.partition('=')
+        if endpoint not in payloads.SYNTHETIC_ENDPOINTS:
+            raise SystemExit(f"--mix endpoints must be among {', '.join(payloads.SYNTHETIC_ENDPOINTS)}")
+        weights[endpoint] = float(weight or 1)
+    total = sum(weights.values())
+    return {endpoint: weight / total for endpoint, weight in weights.items()}
+
+def synthesize_traffic(mix, count, seed):
+    rng = np.random.default_rng(seed)
+    distributions = payloads.fit_distributions(payloads.load_frames())
+    endpoints = list(mix)
+    chosen = rng.choice(len(endpoints), size=count, p=list(mix.values()))
+    return [
+        {"method": "POST", "path": payloads.ENDPOINTS[endpoints[i]][1],
+         "body": payloads.synthetic_payload(endpoints[i], distributions, rng)}
+        for i in chosen
+    ]
+
+def make_sender(url):
+    """Return new_client() -> send(record) -> status code."""
+    if url is None:
+        import app as backend  # loads models and data
+
+        def new_client():
+            client = backend.app.test_client()
+            return lambda r: client.open(r['path'], method=r['method'], json=r['body']).status_code
+        return new_client
+
+    import requests
+
+    def new_client():
+        session = requests.Session()
+        return lambda r: session.request(r['method'], url.rstrip('/') + r['path'], json=r['body']).status_code
+    return new_client
+
+def run(records, new_client, concurrency, rate, seed):
+    """Send every record; returns a list of (path, latency_s, ok) and the elapsed time."""
+    if rate:
+        arrivals = np.cumsum(np.random.default_rng(seed).exponential(1.0 / rate, size=len(records)))
+    samples, lock = [], threading.Lock()
+    next_index = iter(range(len(records)))
+    start = time.perf_counter()
+
+    def worker():
+        send, local = new_client(), []
+        while True:
+            with lock:
+                index = next(next_index, None)
+            if index is None:
+                break
+            scheduled = start + arrivals[index] if rate else time.perf_counter()
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                ok = send(records[index]) < 400
+            except Exception:
+                ok = False
+            local.append((records[index]['path'], time.perf_counter() - scheduled, ok))
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+def summarize(samples, elapsed):
+    by_path = defaultdict(list)
+    for path, latency, ok in samples:
+        by_path[path].append((latency, ok))
+    by_path['all'] = [(latency, ok) for _, latency, ok in samples]
+
+    report = {}
+    for path, entries in by_path.items():
+        latencies = [latency for latency, _ in entries]
+        errors = sum(not ok for _, ok in entries)
+        report[path] = {
+            **harness.latency_summary(latencies),
+            "error_rate": round(errors / len(entries), 4),
+            "requests_per_second": round(len(entries) / elapsed, 1)
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--traffic', help="JSON-lines file of recorded requests")
+    source.add_argument('--mix', nargs='+', metavar='ENDPOINT=WEIGHT', help="synthesize traffic with this mix")
+    parser.add_argument('--requests', type=int, default=1000, help="synthetic requests to generate")
+    parser.add_argument('--save-traffic', help="write the synthesized traffic to this file")
+    parser.add_argument('--url', help="base URL of a running server (default: in-process test client)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=0, help="Poisson arrival rate in requests/s (0 = closed loop)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.traffic:
+        records = read_traffic(args.traffic)
+    else:
+        records = synthesize_traffic(parse_mix(args.mix), args.requests, args.seed)
+        if args.save_traffic:
+            with open(args.save_traffic, 'w') as f:
+                f.writelines(json.dumps(record) + '\n' for record in records)
+            print(f"✓ Wrote {len(records)} requests to {args.save_traffic}")
+    if not records:
+        raise SystemExit("No requests to send")
+
+    samples, elapsed = run(records, make_sender(args.url), args.concurrency, args.rate, args.seed)
+    report = summarize(samples, elapsed)
+
+    mode = f"{args.rate:g} req/s Poisson arrivals" if args.rate else "closed loop"
+    print(f"{len(samples)} requests in {elapsed:.2f}s, {args.concurrency} workers, {mode}")
+    print(f"  {'endpoint':28s} {'count':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'errors':>8s} {'req/s':>9s}")
+    for path, stats in sorted(report.items(), key=lambda item: item[0] == 'all'):
+        print(f"  {path:28s} {stats['count']:7d} {stats['p50_ms']:9.2f} {stats['p95_ms']:9.2f} "
+              f"{stats['p99_ms']:9.2f} {stats['error_rate']:8.2%} {stats['requests_per_second']:9.1f}")
+
+    harness.save_results('load_test', {
+        "source": args.traffic or {"mix": parse_mix(args.mix), "requests": args.requests},
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "elapsed_seconds": round(elapsed, 3),
+        "endpoints": report
+    })
+
+if __name__ == "__main__":
+    main()
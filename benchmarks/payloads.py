@@ -0,0 +1,135 @@
+"""
+Benchmark Payloads
+Request bodies for every API endpoint, drawn from rows of the CSVs in data/
+so categorical values are ones the models were trained on, and synthetic
+/forecast_vegan_demand and /optimize_supply_chain bodies sampled from the
+CSV value distributions (used by load_test.py).
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from harness import BASE_DIR
+
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+# (method, path) of every endpoint the suite measures
+ENDPOINTS = {
+    'health': ('GET', '/'),
+    'market_summary': ('GET', '/market_summary'),
+    'predict_demand': ('POST', '/predict_demand'),
+    'recommend_crop': ('POST', '/recommend_crop'),
+    'predict_suitability': ('POST', '/predict_suitability'),
+    'forecast_vegan_demand': ('POST', '/forecast_vegan_demand'),
+    'scenario_sweep': ('POST', '/scenario_sweep'),
+    'optimize_supply_chain': ('POST', '/optimize_supply_chain'),
+    'combined_intelligence': ('POST', '/combined_intelligence')
+}
+
+# Endpoints synthetic_payload() can generate traffic for
+SYNTHETIC_ENDPOINTS = ('forecast_vegan_demand', 'optimize_supply_chain')
+
+# Products whose crop appears in logistics_supply.csv (see optimize_supply_chain)
+SUPPLY_PRODUCTS = {'Oat Milk': 'Oats', 'Soy Products': 'Soy', 'Chickpea Flour': 'Chickpea'}
+
+def load_frames():
+    frames = {
+        name: pd.read_csv(os.path.join(DATA_DIR, f'{name}.csv'))
+        for name in ('crop_data', 'demand_data', 'crop_suitability', 'vegan_consumption', 'logistics_supply')
+    }
+    frames['vegan_consumption']['month'] = pd.to_datetime(frames['vegan_consumption']['date']).dt.month
+    return frames
+
+def _row(df, rng):
+    return df.iloc[int(rng.integers(len(df)))]
+
+def _forecast(row):
+    return {
+        "region": row['region'], "product": row['product'], "price": float(row['price']),
+        "genz_ratio": float(row['genz_ratio']), "google_trends_score": float(row['google_trends_score']),
+        "month": int(row['month'])
+    }
+
+def recorded_payload(endpoint, frames, rng):
+    """A request body for endpoint built from a random CSV row (None for GET endpoints)."""
+    if endpoint == 'predict_demand':
+        row = _row(frames['demand_data'], rng)
+        return {"base_price": float(row['base_price']), "checkout_price": float(row['checkout_price']),
+                "center_id": int(row['center_id']), "meal_id": int(row['meal_id'])}
+    if endpoint == 'recommend_crop':
+        row = _row(frames['crop_data'], rng)
+        return {field: float(row[field]) for field in ('N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall')}
+    if endpoint == 'predict_suitability':
+        row = _row(frames['crop_suitability'], rng)
+        return {"district": row['district'], "crop": row['crop'], "soil_ph": float(row['soil_ph']),
+                "soil_type": row['soil_type'], "rainfall": float(row['rainfall']),
+                "temperature": float(row['temperature']), "irrigation": int(row['irrigation']),
+                "distance_to_city": float(row['distance_to_city'])}
+    if endpoint == 'forecast_vegan_demand':
+        return _forecast(_row(frames['vegan_consumption'], rng))
+    if endpoint == 'scenario_sweep':
+        payload = _forecast(_row(frames['vegan_consumption'], rng))
+        payload["x"] = {"feature": "price", "start": 100, "stop": 500, "step": 10}
+        payload["y"] = {"feature": "genz_ratio", "start": 0, "stop": 1, "step": 0.05}
+        return payload
+    if endpoint == 'optimize_supply_chain':
+        logistics = frames['logistics_supply']
+        product = list(SUPPLY_PRODUCTS)[int(rng.integers(len(SUPPLY_PRODUCTS)))]
+        lanes = logistics[logistics['crop'] == SUPPLY_PRODUCTS[product]]
+        row = _row(lanes if len(lanes) else logistics, rng)
+        return {"destination_city": row['destination_city'], "product": product,
+                "required_quantity": float(rng.integers(100, 5000))}
+    if endpoint == 'combined_intelligence':
+        payload = _forecast(_row(frames['vegan_consumption'], rng))
+        suitability = _row(frames['crop_suitability'], rng)
+        payload.update(district=suitability['district'], crop=suitability['crop'])
+        return payload
+    return None
+
+# ==================== SYNTHETIC TRAFFIC ====================
+
+def fit_distributions(frames):
+    """
+    Empirical distributions of the request fields: category frequencies plus
+    per-product price, per-region genz/trends and per-lane quantity statistics.
+    """
+    consumption = frames['vegan_consumption']
+    logistics = frames['logistics_supply']
+    supply_lanes = logistics[logistics['crop'].isin(SUPPLY_PRODUCTS.values())]
+    return {
+        'region_product': consumption.groupby(['region', 'product']).size() / len(consumption),
+        'price': consumption.groupby('product')['price'].agg(['mean', 'std', 'min', 'max']),
+        'genz_ratio': consumption.groupby('region')['genz_ratio'].agg(['mean', 'std']),
+        'google_trends_score': consumption.groupby('region')['google_trends_score'].agg(['mean', 'std']),
+        'lanes': supply_lanes.groupby(['destination_city', 'crop'])['supply_quantity'].sum()
+    }
+
+def _normal(rng, stats, low, high):
+    std = stats['std'] if stats['std'] == stats['std'] else 0.0  # NaN for single-row groups
+    return float(np.clip(rng.normal(stats['mean'], std), low, high))
+
+def synthetic_payload(endpoint, distributions, rng):
+    """
+    A request body for /forecast_vegan_demand or /optimize_supply_chain sampled
+    from the fitted distributions rather than copied from a CSV row.
+    """
+    if endpoint == 'forecast_vegan_demand':
+        frequencies = distributions['region_product']
+        region, product = frequencies.index[rng.choice(len(frequencies), p=frequencies.to_numpy())]
+        price = distributions['price'].loc[product]
+        return {
+            "region": region, "product": product,
+            "price": round(_normal(rng, price, price['min'], price['max']), 2),
+            "genz_ratio": round(_normal(rng, distributions['genz_ratio'].loc[region], 0, 1), 3),
+            "google_trends_score": round(_normal(rng, distributions['google_trends_score'].loc[region], 0, 100), 1),
+            "month": int(rng.integers(1, 13))
+        }
+    if endpoint == 'optimize_supply_chain':
+        lanes = distributions['lanes']
+        # Busier lanes are requested more often, for a share of their total supply
+        city, crop = lanes.index[rng.choice(len(lanes), p=(lanes / lanes.sum()).to_numpy())]
+        product = next(name for name, mapped in SUPPLY_PRODUCTS.items() if mapped == crop)
+        return {"destination_city": city, "product": product,
+                "required_quantity": max(1.0, round(float(lanes.loc[(city, crop)] * rng.uniform(0.05, 0.6)), 1))}
+    raise ValueError(f"No synthetic payloads for {endpoint}")
@@ -0,0 +1,61 @@
+"""
+Benchmark Suite Runner
+Runs every benchmarks/bench_*.py script (each in its own process, so model
+loading and pools do not leak between them) and snapshots the result files
+under benchmarks/results/history/<commit>/ for later comparison:
+
+    python benchmarks/run_all.py
+    python benchmarks/run_all.py --only endpoints training
+    python benchmarks/compare.py benchmarks/results/history/<old> benchmarks/results/history/<new>
+
+Scripts run with their default settings; run one directly to pass options.
+"""
+
+import os
+import sys
+import glob
+import shutil
+import argparse
+import subprocess
+
+import harness
+
+BENCH_DIR = os.path.join(harness.BASE_DIR, 'benchmarks')
+HISTORY_DIR = os.path.join(harness.RESULTS_DIR, 'history')
+
+def bench_scripts():
+    """{short name: path} of the bench_*.py scripts."""
+    return {
+        os.path.basename(path)[len('bench_'):-len('.py')]: path
+        for path in sorted(glob.glob(os.path.join(BENCH_DIR, 'bench_*.py')))
+    }
+
+def main():
+    scripts = bench_scripts()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--only', nargs='+', choices=list(scripts), default=list(scripts))
+    args = parser.parse_args()
+
+    results_before = {path: os.path.getmtime(path) for path in glob.glob(os.path.join(harness.RESULTS_DIR, '*.json'))}
+    failed = []
+    for name in args.only:
+        print("=" * 60)
+        print(f"bench_{name}")
+        print("=" * 60)
+        if subprocess.run([sys.executable, scripts[name]], cwd=harness.BASE_DIR).returncode != 0:
+            failed.append(name)
+
+    # Snapshot the result files this run wrote
+    snapshot_dir = os.path.join(HISTORY_DIR, harness.git_commit())
+    os.makedirs(snapshot_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(harness.RESULTS_DIR, '*.json')):
+        if results_before.get(path) != os.path.getmtime(path):
+            shutil.copy2(path, snapshot_dir)
+    print(f"\n✓ Results snapshot in {snapshot_dir}")
+
+    if failed:
+        print(f"✗ Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+VOIS Model Compression Script
+Smart Vegan Supply & Demand Tracker - Forest Pruning & Distillation
+
+Post-training stage that shrinks the trained forests for serving:
+
+1. PRUNE: greedy forward selection of trees. Starting from an empty
+   ensemble, repeatedly add the tree that most reduces validation error,
+   then keep the smallest prefix whose error is within TOLERANCE of the
+   full forest.
+2. DISTILL (optional): fit a smaller student model (a shallow forest or a
+   histogram gradient-boosted model) on the original forest's predictions.
+
+Only random forests are compressed; models trained with another family
+(hist_gb in hyperparams.json) are skipped and served as trained.
+
+Compressed artifacts are written next to the originals as
+models/<name>.compressed.pkl with the same structure (bare model or dict
+with category vocabularies), so backend/app.py loads them transparently. A per-model
+report of accuracy delta, latency and size is saved to
+models/compression_report.json.
+
+Usage:
+    python compress_models.py                             # default models, prune only
+    python compress_models.py crop_suitability            # selected models
+    python compress_models.py --distill hgb               # also distill to HistGradientBoosting
+    python compress_models.py --distill forest demand_radar
+"""
+
+import os
+import sys
+import copy
+import json
+import pickle
+import warnings
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import (
+    RandomForestClassifier, RandomForestRegressor,
+    HistGradientBoostingClassifier, HistGradientBoostingRegressor
+)
+from sklearn.metrics import accuracy_score, r2_score
+
+from train_models import (
+    load_crop_advisor_data, load_demand_radar_data,
+    load_crop_suitability_data, load_vegan_demand_data,
+    measure_model_cost
+)
+
+MODELS_DIR = 'models'
+REPORT_PATH = os.path.join(MODELS_DIR, 'compression_report.json')
+
+# Largest artifacts, compressed when no model names are given
+DEFAULT_MODELS = ['crop_suitability', 'vegan_demand_forecast']
+
+# model name -> dataset loader
+DATASET_LOADERS = {
+    'crop_advisor': load_crop_advisor_data,
+    'demand_radar': load_demand_radar_data,
+    'crop_suitability': load_crop_suitability_data,
+    'vegan_demand_forecast': load_vegan_demand_data,
+}
+
+# Allowed relative increase in validation error over the full forest
+TOLERANCE = 0.01
+
+def compressed_model_path(model_name):
+    """Path of the compressed artifact for a model."""
+    return os.path.join(MODELS_DIR, f'{model_name}.compressed.pkl')
+
+def tree_predictions(forest, X):
+    """
+    Per-tree predictions on X: shape (n_trees, n_rows) for regressors,
+    (n_trees, n_rows, n_classes) probabilities for classifiers.
+    """
+    if isinstance(forest, RandomForestClassifier):
+        return np.stack([tree.predict_proba(X) for tree in forest.estimators_])
+    return np.stack([tree.predict(X) for tree in forest.estimators_])
+
+def ensemble_errors(partial_sum, per_tree, size, y, is_classifier):
+    """
+    Validation error of (partial_sum + per_tree[j]) / size for every tree j at
+    once: misclassification rate for classifiers, MSE for regressors.
+    """
+    candidates = (partial_sum[None] + per_tree) / size
+    if is_classifier:
+        return (candidates.argmax(axis=-1) != y[None]).mean(axis=1)
+    return ((candidates - y[None]) ** 2).mean(axis=1)
+
+def greedy_tree_selection(forest, X_val, y_val):
+    """
+    Greedy forward selection of trees on validation error.
+
+    Returns (selected tree indices in order of selection, error curve) where
+    error_curve[k] is the validation error of the first k + 1 selected trees.
+    """
+    is_classifier = isinstance(forest, RandomForestClassifier)
+    if is_classifier:
+        # Trees predict class indices; map labels to the same indices
+        y_val = np.searchsorted(forest.classes_, y_val)
+
+    per_tree = tree_predictions(forest, X_val)
+    partial_sum = np.zeros_like(per_tree[0])
+    available = np.ones(len(per_tree), dtype=bool)
+
+    selected = []
+    error_curve = []
+    for size in range(1, len(per_tree) + 1):
+        errors = ensemble_errors(partial_sum, per_tree, size, y_val, is_classifier)
+        errors[~available] = np.inf
+        best = int(np.argmin(errors))
+
+        selected.append(best)
+        error_curve.append(float(errors[best]))
+        partial_sum += per_tree[best]
+        available[best] = False
+
+    return selected, error_curve
+
+def prune_forest(forest, X_val, y_val):
+    """Return a copy of the forest keeping the smallest greedy subset within TOLERANCE."""
+    selected, error_curve = greedy_tree_selection(forest, X_val, y_val)
+
+    is_classifier = isinstance(forest, RandomForestClassifier)
+    if is_classifier:
+        full_predictions = forest.predict(X_val)
+        full_error = float(np.mean(full_predictions != y_val))
+    else:
+        full_error = float(np.mean((forest.predict(X_val) - y_val) ** 2))
+
+    # Misclassification rate can be 0; allow one extra miss in that case
+    limit = full_error * (1 + TOLERANCE) if full_error > 0 else 1.0 / len(y_val)
+    keep = next(
+        (k + 1 for k, error in enumerate(error_curve) if error <= limit),
+        len(selected)
+    )
+
+    pruned = copy.copy(forest)
+    pruned.estimators_ = [forest.estimators_[i] for i in selected[:keep]]
+    pruned.n_estimators = keep
+    return pruned
+
+def distill_model(teacher, X_train, kind):
+    """
+    Fit a smaller student on the teacher's predictions over the training inputs.
+    kind: 'hgb' (HistGradientBoosting) or 'forest' (shallow 25-tree forest).
+    """
+    is_classifier = isinstance(teacher, RandomForestClassifier)
+    soft_targets = teacher.predict(X_train)
+
+    if kind == 'hgb':
+        student_cls = HistGradientBoostingClassifier if is_classifier else HistGradientBoostingRegressor
+        student = student_cls(max_iter=100, max_depth=6, random_state=42)
+    else:
+        student_cls = RandomForestClassifier if is_classifier else RandomForestRegressor
+        student = student_cls(n_estimators=25, max_depth=8, random_state=42, n_jobs=-1)
+
+    student.fit(X_train, soft_targets)
+    if hasattr(student, 'n_jobs'):
+        student.n_jobs = 1
+    return student
+
+def evaluate(model, X, y):
+    """Accuracy (classifier) or R² (regressor) on X, y plus serving cost."""
+    predictions = model.predict(X)
+    if isinstance(model, (RandomForestClassifier, HistGradientBoostingClassifier)):
+        accuracy = accuracy_score(y, predictions)
+    else:
+        accuracy = r2_score(y, predictions)
+    return {"accuracy": float(accuracy), **measure_model_cost(model, X)}
+
+def compress_model(model_name, distill=None):
+    """Prune (and optionally distill) one model, save it, and return its report."""
+    print("\n" + "=" * 60)
+    print(f"Compressing: {model_name}")
+    print("=" * 60)
+
+    with open(os.path.join(MODELS_DIR, f'{model_name}.pkl'), 'rb') as f:
+        artifact = pickle.load(f)
+    forest = artifact['model'] if isinstance(artifact, dict) else artifact
+    if not hasattr(forest, 'estimators_'):
+        # Pruning and distillation select from / imitate a forest's trees
+        # (e.g. family hist_gb in hyperparams.json is not a forest)
+        reason = f"{type(forest).__name__} is not a random forest; only forests can be compressed"
+        print(f"  Skipped: {reason}")
+        return {"skipped": reason}
+
+    X, y = DATASET_LOADERS[model_name]()[:2]
+    X, y = np.asarray(X), np.asarray(y)
+
+    # Same held-out split as training; half of it selects trees, the other half reports
+    is_classifier = isinstance(forest, RandomForestClassifier)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y if is_classifier else None
+    )
+    X_val, X_report, y_val, y_report = train_test_split(
+        X_test, y_test, test_size=0.5, random_state=0
+    )
+
+    candidates = {'original': forest, 'pruned': prune_forest(forest, X_val, y_val)}
+    if distill:
+        candidates[f'distilled_{distill}'] = distill_model(forest, X_train, distill)
+
+    report = {}
+    for label, model in candidates.items():
+        report[label] = evaluate(model, X_report, y_report)
+        if hasattr(model, 'estimators_'):
+            report[label]['n_estimators'] = len(model.estimators_)
+
+    baseline = report['original']
+    for label, metrics in report.items():
+        metrics['accuracy_delta'] = metrics['accuracy'] - baseline['accuracy']
+        metrics['speedup'] = baseline['single_row_ms'] / max(metrics['single_row_ms'], 1e-9)
+        metrics['size_ratio'] = metrics['size_bytes'] / baseline['size_bytes']
+        trees = f"  trees={metrics['n_estimators']}" if 'n_estimators' in metrics else ""
+        print(f"  {label:18s} accuracy={metrics['accuracy']:.4f} ({metrics['accuracy_delta']:+.4f})  "
+              f"latency={metrics['single_row_ms']:.3f}ms (x{metrics['speedup']:.1f})  "
+              f"size={metrics['size_bytes'] / 1024:.0f}KB ({metrics['size_ratio']:.0%}){trees}")
+
+    # Ship the distilled student when requested, otherwise the pruned forest
+    chosen = f'distilled_{distill}' if distill else 'pruned'
+    compressed = candidates[chosen]
+    if isinstance(artifact, dict):
+        compressed = {**artifact, 'model': compressed}
+
+    with open(compressed_model_path(model_name), 'wb') as f:
+        pickle.dump(compressed, f)
+    print(f"\n✓ Saved {chosen} model to {compressed_model_path(model_name)}")
+
+    report['chosen'] = chosen
+    return report
+
+def main():
+    """Compress the requested models and write the combined report."""
+    args = sys.argv[1:]
+    distill = None
+    if '--distill' in args:
+        position = args.index('--distill')
+        distill = args[position + 1] if position + 1 < len(args) else None
+        if distill not in ('hgb', 'forest'):
+            print("--distill expects 'hgb' or 'forest'")
+            sys.exit(1)
+        del args[position:position + 2]
+
+    model_names = args or DEFAULT_MODELS
+    unknown = [name for name in model_names if name not in DATASET_LOADERS]
+    if unknown:
+        print(f"Unknown model(s): {', '.join(unknown)}")
+        print(f"Choose from: {', '.join(DATASET_LOADERS)}")
+        sys.exit(1)
+
+    # Forests were fitted on DataFrames; evaluation here uses plain arrays
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    print("\n" + "=" * 60)
+    print("V-Pulse Model Compression")
+    print("=" * 60)
+
+    reports = {}
+    if os.path.exists(REPORT_PATH):
+        with open(REPORT_PATH) as f:
+            reports = json.load(f)
+    for model_name in model_names:
+        reports[model_name] = compress_model(model_name, distill)
+
+    with open(REPORT_PATH, 'w') as f:
+        json.dump(reports, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print(f"✓ Compression complete! Report saved to {REPORT_PATH}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+VOIS Dashboard API Client
+Shared HTTP layer for the Streamlit dashboard.
+
+- One keep-alive requests.Session per dashboard process (st.cache_resource),
+  with a pooled adapter and retries with exponential backoff.
+- Successful responses cached per (endpoint, payload) with a TTL
+  (st.cache_data), so Streamlit reruns and repeated button presses with the
+  same inputs don't hit the backend again. Errors are never cached.
+- The sidebar health probe cached for a few seconds instead of running on
+  every rerun.
+"""
+
+import os
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_URL = os.environ.get('API_URL', 'http://localhost:5000')
+
+REQUEST_TIMEOUT = 5           # seconds per attempt
+RESPONSE_CACHE_TTL = 300      # seconds a successful response is reused
+HEALTH_CACHE_TTL = 5          # seconds the API status is reused
+SUMMARY_CACHE_TTL = 60        # seconds market aggregates are reused
+
+CONNECTION_ERROR_MESSAGE = """**Connection Error**: Cannot connect to the backend API.
+
+Please ensure the Flask backend is running:
+1. Open a terminal
+2. Navigate to the project directory
+3. Run: `python backend/app.py`"""
+TIMEOUT_ERROR_MESSAGE = "**Timeout Error**: The API request took too long. Please try again."
+
+class APIError(Exception):
+    """The backend was unreachable or returned an error; str(error) is user-facing."""
+
+@st.cache_resource
+def get_session():
+    """Shared keep-alive session; retries connection failures and 502/503/504 with backoff."""
+    retry = Retry(
+        total=3,
+        connect=2,
+        read=1,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET', 'POST'}),  # prediction endpoints are side-effect free
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+@st.cache_data(ttl=RESPONSE_CACHE_TTL, show_spinner=False, max_entries=1000)
+def post(endpoint, payload):
+    """
+    POST a JSON payload to an API endpoint (e.g. 'forecast_vegan_demand') and
+    return the decoded JSON body. Raises APIError on connection problems,
+    timeouts and non-200 responses.
+    """
+    try:
+        response = get_session().post(f"{API_URL}/{endpoint}", json=payload, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.ConnectionError:
+        raise APIError(CONNECTION_ERROR_MESSAGE)
+    except requests.exceptions.Timeout:
+        raise APIError(TIMEOUT_ERROR_MESSAGE)
+    except requests.exceptions.RequestException as e:
+        raise APIError(str(e))
+
+    if response.status_code != 200:
+        try:
+            message = response.json().get('error', 'Unknown error occurred')
+        except ValueError:
+            message = f"HTTP {response.status_code}"
+        raise APIError(message)
+    return response.json()
+
+@st.cache_data(ttl=SUMMARY_CACHE_TTL, show_spinner=False)
+def get(endpoint):
+    """GET an API endpoint and return the decoded JSON body. Raises APIError like post()."""
+    try:
+        response = get_session().get(f"{API_URL}/{endpoint}", timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        raise APIError(CONNECTION_ERROR_MESSAGE if isinstance(e, requests.exceptions.ConnectionError) else str(e))
+    if response.status_code != 200:
+        raise APIError(f"HTTP {response.status_code}")
+    return response.json()
+
+def market_summary():
+    """Market aggregates from /market_summary, or None when the backend is unavailable."""
+    try:
+        return get('market_summary')
+    except APIError:
+        return None
+
+@st.cache_data(ttl=HEALTH_CACHE_TTL, show_spinner=False)
+def health_status():
+    """'online', 'error' (reachable but unhealthy) or 'offline'."""
+    try:
+        response = get_session().get(f"{API_URL}/", timeout=2)
+    except requests.exceptions.RequestException:
+        return 'offline'
+    return 'online' if response.status_code == 200 else 'error'
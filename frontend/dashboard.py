@@ -5,7 +5,6 @@ Complete AI-driven market intelligence and agro-supply optimization
 """
 
 import streamlit as st
-import requests
 import json
 import pandas as pd
 import plotly.express as px
@@ -13,8 +12,9 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 
+import api_client
+
 # Configuration
-API_URL = "http://localhost:5000"
 PAGE_TITLE = "VOIS: Vegan Orbital Intelligence System"
 
 # Set page configuration
@@ -140,6 +140,32 @@ def create_price_elasticity_chart(price_elasticity):
     
     return fig
 
+def create_scenario_heatmap(surface):
+    """Create a heatmap of a /scenario_sweep response surface"""
+    labels = {'price': 'Price (₹)', 'genz_ratio': 'GenZ Ratio', 'google_trends_score': 'Google Trends Score'}
+    x, y = surface['x'], surface['y']
+    
+    fig = go.Figure(data=go.Heatmap(
+        x=x['values'], y=y['values'], z=surface['consumption'],
+        colorscale='Greens',
+        colorbar=dict(title='Units')
+    ))
+    fig.add_trace(go.Scatter(
+        x=[surface['best'][x['feature']]], y=[surface['best'][y['feature']]],
+        mode='markers',
+        marker=dict(symbol='star', size=14, color='#FF9800'),
+        name='Peak demand'
+    ))
+    
+    fig.update_layout(
+        title='What-if Demand Surface',
+        xaxis_title=labels.get(x['feature'], x['feature']),
+        yaxis_title=labels.get(y['feature'], y['feature']),
+        height=450
+    )
+    
+    return fig
+
 def create_suitability_radar(suitability_score, district, crop):
     """Create radar chart for crop suitability factors"""
     categories = ['Soil Quality', 'Climate', 'Water', 'Logistics', 'Market Access']
@@ -225,11 +251,22 @@ def create_cost_comparison_bar(optimal_sources):
     
     return fig
 
-def create_product_comparison_chart():
-    """Create comparison chart for different vegan products"""
-    products = ['Oat Milk', 'Vegan Meat', 'Soy Products', 'Chickpea Flour', 'Almond Milk', 'Tofu']
-    demand = [1200, 980, 1450, 890, 1100, 950]
-    growth = [25, 35, 20, 15, 30, 22]
+def top_products(summary, n, key='total_consumption'):
+    """Top-n (product, stats) pairs from a market summary, largest key first"""
+    ranked = sorted(summary['products'].items(), key=lambda item: item[1][key] or 0, reverse=True)
+    return ranked[:n]
+
+def create_product_comparison_chart(summary=None):
+    """Create comparison chart for different vegan products (from /market_summary when available)"""
+    if summary:
+        ranked = top_products(summary, 6)
+        products = [product for product, _ in ranked]
+        demand = [stats['total_consumption'] for _, stats in ranked]
+        growth = [stats['growth_pct'] or 0 for _, stats in ranked]
+    else:
+        products = ['Oat Milk', 'Vegan Meat', 'Soy Products', 'Chickpea Flour', 'Almond Milk', 'Tofu']
+        demand = [1200, 980, 1450, 890, 1100, 950]
+        growth = [25, 35, 20, 15, 30, 22]
     
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     
@@ -298,50 +335,76 @@ if dashboard_type == "🏭 Manufacturer":
                     "month": month, "quarter": quarter
                 }
                 with st.spinner("Forecasting..."):
-                    response = requests.post(f"{API_URL}/forecast_vegan_demand", json=payload, timeout=5)
+                    result = api_client.post("forecast_vegan_demand", payload)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    # Display key metrics
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Predicted Consumption", f"{result['predicted_consumption']:.0f} units", 
-                                 delta=f"+{result['predicted_consumption']*0.15:.0f} vs last month")
-                    with col2:
-                        st.metric("GenZ Adoption Index", f"{result['genz_adoption_index']:.3f}",
-                                 delta="+0.05" if result['genz_adoption_index'] > 0.5 else "-0.02")
-                    with col3:
-                        st.metric("Price Elasticity", f"{result['price_elasticity_score']:.3f}",
-                                 delta="High" if result['price_elasticity_score'] > 0.7 else "Medium")
-                    
-                    st.markdown("---")
-                    
-                    # Visualizations
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        # Demand forecast chart
-                        fig1 = create_demand_forecast_chart(result['predicted_consumption'], product, region)
-                        st.plotly_chart(fig1, use_container_width=True)
-                        
-                        # Price elasticity chart
-                        fig3 = create_price_elasticity_chart(result['price_elasticity_score'])
-                        st.plotly_chart(fig3, use_container_width=True)
+                
+                # Display key metrics
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Predicted Consumption", f"{result['predicted_consumption']:.0f} units", 
+                             delta=f"+{result['predicted_consumption']*0.15:.0f} vs last month")
+                with col2:
+                    st.metric("GenZ Adoption Index", f"{result['genz_adoption_index']:.3f}",
+                             delta="+0.05" if result['genz_adoption_index'] > 0.5 else "-0.02")
+                with col3:
+                    st.metric("Price Elasticity", f"{result['price_elasticity_score']:.3f}",
+                             delta=f"{result['price_elasticity']:+.2f}% demand per +1% price",
+                             delta_color="off")
+                
+                st.markdown("---")
+                
+                # Visualizations
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Demand forecast chart
+                    fig1 = create_demand_forecast_chart(result['predicted_consumption'], product, region)
+                    st.plotly_chart(fig1, use_container_width=True)
                     
-                    with col2:
-                        # GenZ adoption gauge
-                        fig2 = create_genz_adoption_gauge(result['genz_adoption_index'])
-                        st.plotly_chart(fig2, use_container_width=True)
-                        
-                        # Product comparison
-                        fig4 = create_product_comparison_chart()
-                        st.plotly_chart(fig4, use_container_width=True)
+                    # Price elasticity chart
+                    fig3 = create_price_elasticity_chart(result['price_elasticity_score'])
+                    st.plotly_chart(fig3, use_container_width=True)
+                
+                with col2:
+                    # GenZ adoption gauge
+                    fig2 = create_genz_adoption_gauge(result['genz_adoption_index'])
+                    st.plotly_chart(fig2, use_container_width=True)
                     
-                else:
-                    st.error(f"Error: {response.json().get('error', 'Unknown error')}")
+                    # Product comparison
+                    fig4 = create_product_comparison_chart(api_client.market_summary())
+                    st.plotly_chart(fig4, use_container_width=True)
+                
             except Exception as e:
                 st.error(f"Error: {str(e)}")
+        
+        with st.expander("🧪 What-if Sweep: Price × GenZ Ratio"):
+            col1, col2 = st.columns(2)
+            with col1:
+                price_range = st.slider("Price range (₹)", 50, 1000, (100, 500), 10)
+                price_step = st.number_input("Price step (₹)", min_value=1.0, value=10.0, step=1.0)
+            with col2:
+                genz_range = st.slider("GenZ ratio range", 0.0, 1.0, (0.0, 1.0), 0.05)
+                genz_step = st.number_input("GenZ step", min_value=0.01, max_value=0.5, value=0.05, step=0.01)
+            
+            if st.button("🧪 Run Sweep", use_container_width=True):
+                try:
+                    payload = {
+                        "region": region, "product": product, "price": price,
+                        "genz_ratio": genz_ratio, "google_trends_score": google_trends,
+                        "month": month, "quarter": quarter,
+                        "x": {"feature": "price", "start": price_range[0], "stop": price_range[1], "step": price_step},
+                        "y": {"feature": "genz_ratio", "start": genz_range[0], "stop": genz_range[1], "step": genz_step}
+                    }
+                    with st.spinner("Sweeping scenarios..."):
+                        surface = api_client.post("scenario_sweep", payload)
+                    
+                    best = surface['best']
+                    st.success(f"Peak demand {best['consumption']:.0f} units at ₹{best['price']:.0f} "
+                               f"with GenZ ratio {best['genz_ratio']:.2f} ({surface['cells']} scenarios)")
+                    st.plotly_chart(create_scenario_heatmap(surface), use_container_width=True)
+                    
+                except api_client.APIError as e:
+                    st.error(f"❌ {e}")
     
     with tab2:  # Supply Chain Optimizer
         st.header("🔗 VORTEX Supply Chain Optimizer")
@@ -358,47 +421,43 @@ if dashboard_type == "🏭 Manufacturer":
             try:
                 payload = {"destination_city": destination, "product": product, "required_quantity": required_qty}
                 with st.spinner("Optimizing..."):
-                    response = requests.post(f"{API_URL}/optimize_supply_chain", json=payload, timeout=5)
+                    result = api_client.post("optimize_supply_chain", payload)
+                
+                
+                # Display key metrics
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Total Cost", f"₹{result['total_cost']:.2f}", 
+                             delta=f"-₹{result['total_cost']*0.3:.2f} saved")
+                with col2:
+                    st.metric("Waste Reduction", f"{result['waste_reduction_percentage']:.1f}%",
+                             delta="Sustainable")
+                with col3:
+                    st.metric("Sources", len(result['optimal_sources']),
+                             delta="Optimized")
+                
+                st.markdown("---")
+                
+                # Visualizations
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Pie chart for allocation
+                    fig1 = create_supply_chain_pie(result['optimal_sources'])
+                    if fig1:
+                        st.plotly_chart(fig1, use_container_width=True)
+                
+                with col2:
+                    # Bar chart for cost comparison
+                    fig2 = create_cost_comparison_bar(result['optimal_sources'])
+                    if fig2:
+                        st.plotly_chart(fig2, use_container_width=True)
+                
+                # Detailed table
+                st.subheader("📋 Optimal Sources Breakdown")
+                sources_df = pd.DataFrame(result['optimal_sources'])
+                st.dataframe(sources_df, use_container_width=True)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    # Display key metrics
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Total Cost", f"₹{result['total_cost']:.2f}", 
-                                 delta=f"-₹{result['total_cost']*0.3:.2f} saved")
-                    with col2:
-                        st.metric("Waste Reduction", f"{result['waste_reduction_percentage']:.1f}%",
-                                 delta="Sustainable")
-                    with col3:
-                        st.metric("Sources", len(result['optimal_sources']),
-                                 delta="Optimized")
-                    
-                    st.markdown("---")
-                    
-                    # Visualizations
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        # Pie chart for allocation
-                        fig1 = create_supply_chain_pie(result['optimal_sources'])
-                        if fig1:
-                            st.plotly_chart(fig1, use_container_width=True)
-                    
-                    with col2:
-                        # Bar chart for cost comparison
-                        fig2 = create_cost_comparison_bar(result['optimal_sources'])
-                        if fig2:
-                            st.plotly_chart(fig2, use_container_width=True)
-                    
-                    # Detailed table
-                    st.subheader("📋 Optimal Sources Breakdown")
-                    sources_df = pd.DataFrame(result['optimal_sources'])
-                    st.dataframe(sources_df, use_container_width=True)
-                    
-                else:
-                    st.error(f"Error: {response.json().get('error', 'Unknown error')}")
             except Exception as e:
                 st.error(f"Error: {str(e)}")
     
@@ -421,15 +480,11 @@ if dashboard_type == "🏭 Manufacturer":
             try:
                 payload = {"region": region, "product": product, "district": district, "crop": crop, "price": price, "month": month}
                 with st.spinner("Generating intelligence..."):
-                    response = requests.post(f"{API_URL}/combined_intelligence", json=payload, timeout=5)
+                    result = api_client.post("combined_intelligence", payload)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    st.success(f"**Priority Score:** {result['priority_score']:.3f}")
-                    st.info(f"**Recommendation:** {result['recommendation']}")
-                    st.json(result)
-                else:
-                    st.error(f"Error: {response.json().get('error', 'Unknown error')}")
+                st.success(f"**Priority Score:** {result['priority_score']:.3f}")
+                st.info(f"**Recommendation:** {result['recommendation']}")
+                st.json(result)
             except Exception as e:
                 st.error(f"Error: {str(e)}")
 
@@ -461,87 +516,83 @@ elif dashboard_type == "👨‍🌾 Farmer":
                     "distance_to_city": distance
                 }
                 with st.spinner("Analyzing..."):
-                    response = requests.post(f"{API_URL}/predict_suitability", json=payload, timeout=5)
+                    result = api_client.post("predict_suitability", payload)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    score = result['suitability_score']
-                    
-                    # Display score with color coding
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        if score >= 0.8:
-                            st.success(f"**Suitability Score**\n\n# {score:.3f}\n🌟 Highly Suitable!")
-                        elif score >= 0.6:
-                            st.info(f"**Suitability Score**\n\n# {score:.3f}\n✓ Moderately Suitable")
-                        else:
-                            st.warning(f"**Suitability Score**\n\n# {score:.3f}\n⚠ Low Suitability")
-                    
-                    with col2:
-                        st.metric("Soil Match", f"{score*100:.1f}%", 
-                                 delta="Excellent" if score > 0.8 else "Good" if score > 0.6 else "Fair")
-                    
-                    with col3:
-                        st.metric("Climate Match", f"{score*95:.1f}%",
-                                 delta="Optimal" if score > 0.7 else "Acceptable")
-                    
-                    st.markdown("---")
-                    
-                    # Recommendation box
-                    st.info(f"**💡 Recommendation:** {result['recommendation']}")
-                    
-                    # Visualizations
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        # Radar chart for suitability factors
-                        fig1 = create_suitability_radar(score, district, crop)
-                        st.plotly_chart(fig1, use_container_width=True)
-                    
-                    with col2:
-                        # Gauge chart for overall score
-                        fig2 = go.Figure(go.Indicator(
-                            mode="gauge+number",
-                            value=score * 100,
-                            domain={'x': [0, 1], 'y': [0, 1]},
-                            title={'text': "Overall Suitability"},
-                            gauge={
-                                'axis': {'range': [None, 100]},
-                                'bar': {'color': "#4CAF50" if score > 0.7 else "#FFA726"},
-                                'steps': [
-                                    {'range': [0, 40], 'color': "#FFCDD2"},
-                                    {'range': [40, 70], 'color': "#FFF9C4"},
-                                    {'range': [70, 100], 'color': "#C8E6C9"}
-                                ],
-                                'threshold': {
-                                    'line': {'color': "red", 'width': 4},
-                                    'thickness': 0.75,
-                                    'value': 80
-                                }
+                score = result['suitability_score']
+                
+                # Display score with color coding
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    if score >= 0.8:
+                        st.success(f"**Suitability Score**\n\n# {score:.3f}\n🌟 Highly Suitable!")
+                    elif score >= 0.6:
+                        st.info(f"**Suitability Score**\n\n# {score:.3f}\n✓ Moderately Suitable")
+                    else:
+                        st.warning(f"**Suitability Score**\n\n# {score:.3f}\n⚠ Low Suitability")
+                
+                with col2:
+                    st.metric("Soil Match", f"{score*100:.1f}%", 
+                             delta="Excellent" if score > 0.8 else "Good" if score > 0.6 else "Fair")
+                
+                with col3:
+                    st.metric("Climate Match", f"{score*95:.1f}%",
+                             delta="Optimal" if score > 0.7 else "Acceptable")
+                
+                st.markdown("---")
+                
+                # Recommendation box
+                st.info(f"**💡 Recommendation:** {result['recommendation']}")
+                
+                # Visualizations
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Radar chart for suitability factors
+                    fig1 = create_suitability_radar(score, district, crop)
+                    st.plotly_chart(fig1, use_container_width=True)
+                
+                with col2:
+                    # Gauge chart for overall score
+                    fig2 = go.Figure(go.Indicator(
+                        mode="gauge+number",
+                        value=score * 100,
+                        domain={'x': [0, 1], 'y': [0, 1]},
+                        title={'text': "Overall Suitability"},
+                        gauge={
+                            'axis': {'range': [None, 100]},
+                            'bar': {'color': "#4CAF50" if score > 0.7 else "#FFA726"},
+                            'steps': [
+                                {'range': [0, 40], 'color': "#FFCDD2"},
+                                {'range': [40, 70], 'color': "#FFF9C4"},
+                                {'range': [70, 100], 'color': "#C8E6C9"}
+                            ],
+                            'threshold': {
+                                'line': {'color': "red", 'width': 4},
+                                'thickness': 0.75,
+                                'value': 80
                             }
-                        ))
-                        fig2.update_layout(height=400)
-                        st.plotly_chart(fig2, use_container_width=True)
-                    
-                    # Comparison with other crops
-                    st.subheader("📊 Crop Comparison for Your District")
-                    crops = ['Oats', 'Chickpea', 'Soy', 'Quinoa', 'Lentils', 'Mungbean']
-                    scores = [score if c == crop else score * np.random.uniform(0.7, 1.1) for c in crops]
-                    scores = [min(1.0, max(0.0, s)) for s in scores]
-                    
-                    fig3 = go.Figure(data=[
-                        go.Bar(x=crops, y=scores, marker_color=['#4CAF50' if c == crop else '#90CAF9' for c in crops])
-                    ])
-                    fig3.update_layout(
-                        title=f'Suitability Scores in {district}',
-                        xaxis_title='Crop',
-                        yaxis_title='Suitability Score',
-                        height=300
-                    )
-                    st.plotly_chart(fig3, use_container_width=True)
-                    
-                else:
-                    st.error(f"Error: {response.json().get('error', 'Unknown error')}")
+                        }
+                    ))
+                    fig2.update_layout(height=400)
+                    st.plotly_chart(fig2, use_container_width=True)
+                
+                # Comparison with other crops
+                st.subheader("📊 Crop Comparison for Your District")
+                crops = ['Oats', 'Chickpea', 'Soy', 'Quinoa', 'Lentils', 'Mungbean']
+                scores = [score if c == crop else score * np.random.uniform(0.7, 1.1) for c in crops]
+                scores = [min(1.0, max(0.0, s)) for s in scores]
+                
+                fig3 = go.Figure(data=[
+                    go.Bar(x=crops, y=scores, marker_color=['#4CAF50' if c == crop else '#90CAF9' for c in crops])
+                ])
+                fig3.update_layout(
+                    title=f'Suitability Scores in {district}',
+                    xaxis_title='Crop',
+                    yaxis_title='Suitability Score',
+                    height=300
+                )
+                st.plotly_chart(fig3, use_container_width=True)
+                
             except Exception as e:
                 st.error(f"Error: {str(e)}")
     
@@ -549,12 +600,25 @@ elif dashboard_type == "👨‍🌾 Farmer":
         st.header("📈 Market Insights & Buyback Opportunities")
         st.markdown("View market demand trends and pricing for your crops.")
         
+        summary = api_client.market_summary()
+        
         # Market overview
         col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Average Market Price", "₹245/kg", delta="+12%")
-        with col2:
-            st.metric("Demand Growth", "28%", delta="+5% YoY")
+        if summary:
+            overall = summary['overall']
+            monthly = summary['monthly']
+            price_change = ((monthly[-1]['avg_price'] - monthly[-2]['avg_price']) / monthly[-2]['avg_price'] * 100
+                            if len(monthly) >= 2 else 0)
+            with col1:
+                st.metric("Average Market Price", f"₹{overall['avg_price']:.0f}/kg", delta=f"{price_change:+.1f}%")
+            with col2:
+                growth = overall['growth_pct'] or 0
+                st.metric("Demand Growth", f"{growth:.1f}%", delta=f"vs {monthly[-2]['month']}" if len(monthly) >= 2 else None)
+        else:
+            with col1:
+                st.metric("Average Market Price", "₹245/kg", delta="+12%")
+            with col2:
+                st.metric("Demand Growth", "28%", delta="+5% YoY")
         with col3:
             st.metric("Buyback Offers", "15 Active", delta="+3 new")
         
@@ -565,8 +629,12 @@ elif dashboard_type == "👨‍🌾 Farmer":
         
         with col1:
             # Price trends
-            months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
-            prices = [220, 225, 235, 240, 242, 245]
+            if summary:
+                months = [entry['month'] for entry in summary['monthly'][-6:]]
+                prices = [entry['avg_price'] for entry in summary['monthly'][-6:]]
+            else:
+                months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
+                prices = [220, 225, 235, 240, 242, 245]
             
             fig1 = go.Figure()
             fig1.add_trace(go.Scatter(
@@ -586,9 +654,14 @@ elif dashboard_type == "👨‍🌾 Farmer":
             st.plotly_chart(fig1, use_container_width=True)
         
         with col2:
-            # Demand by crop
-            crops = ['Oats', 'Chickpea', 'Soy', 'Quinoa', 'Lentils']
-            demand = [1200, 980, 1450, 890, 1100]
+            # Demand by product
+            if summary:
+                ranked = top_products(summary, 5)
+                crops = [product for product, _ in ranked]
+                demand = [stats['total_consumption'] for _, stats in ranked]
+            else:
+                crops = ['Oats', 'Chickpea', 'Soy', 'Quinoa', 'Lentils']
+                demand = [1200, 980, 1450, 890, 1100]
             
             fig2 = go.Figure(data=[
                 go.Bar(x=crops, y=demand, marker_color='#66BB6A')
@@ -603,9 +676,17 @@ elif dashboard_type == "👨‍🌾 Farmer":
         
         # Regional demand heatmap
         st.subheader("🗺️ Regional Demand Distribution")
-        regions = ['Hyderabad', 'Bengaluru', 'Mumbai', 'Delhi', 'Chennai']
-        crops_heat = ['Oats', 'Chickpea', 'Soy']
-        demand_matrix = np.random.randint(500, 1500, size=(len(crops_heat), len(regions)))
+        if summary:
+            regions = list(summary['region_products'])
+            crops_heat = [product for product, _ in top_products(summary, 3)]
+            demand_matrix = np.array([
+                [summary['region_products'][region].get(product, {}).get('consumption', 0) for region in regions]
+                for product in crops_heat
+            ]).round().astype(int)
+        else:
+            regions = ['Hyderabad', 'Bengaluru', 'Mumbai', 'Delhi', 'Chennai']
+            crops_heat = ['Oats', 'Chickpea', 'Soy']
+            demand_matrix = np.random.randint(500, 1500, size=(len(crops_heat), len(regions)))
         
         fig3 = go.Figure(data=go.Heatmap(
             z=demand_matrix,
@@ -630,14 +711,27 @@ elif dashboard_type == "🛒 Consumer":
         st.header("📊 Trending Vegan Products")
         st.markdown("Discover trending vegan products in your region with GenZ adoption metrics.")
         
+        summary = api_client.market_summary()
+        
         # Top metrics
         col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Top Product", "Oat Milk", delta="🔥 Trending")
-        with col2:
-            st.metric("GenZ Favorite", "Vegan Meat", delta="+45%")
-        with col3:
-            st.metric("Best Value", "Chickpea Flour", delta="₹180/kg")
+        if summary:
+            top_product, top_stats = top_products(summary, 1)[0]
+            genz_product, genz_stats = top_products(summary, 1, key='avg_genz_ratio')[0]
+            value_product, value_stats = min(summary['products'].items(), key=lambda item: item[1]['avg_price'])
+            with col1:
+                st.metric("Top Product", top_product, delta=f"{top_stats['share_pct']:.1f}% share")
+            with col2:
+                st.metric("GenZ Favorite", genz_product, delta=f"GenZ ratio {genz_stats['avg_genz_ratio']:.2f}")
+            with col3:
+                st.metric("Best Value", value_product, delta=f"₹{value_stats['avg_price']:.0f}/kg")
+        else:
+            with col1:
+                st.metric("Top Product", "Oat Milk", delta="🔥 Trending")
+            with col2:
+                st.metric("GenZ Favorite", "Vegan Meat", delta="+45%")
+            with col3:
+                st.metric("Best Value", "Chickpea Flour", delta="₹180/kg")
         with col4:
             st.metric("New Arrivals", "3 Products", delta="This week")
         
@@ -647,9 +741,15 @@ elif dashboard_type == "🛒 Consumer":
         col1, col2 = st.columns(2)
         
         with col1:
-            # Product popularity
-            products = ['Oat Milk', 'Vegan Meat', 'Soy Products', 'Chickpea Flour', 'Almond Milk', 'Tofu']
-            popularity = [95, 88, 82, 75, 85, 78]
+            # Product popularity (consumption relative to the top product)
+            if summary:
+                ranked = top_products(summary, 6)
+                products = [product for product, _ in ranked]
+                popularity = [round(stats['total_consumption'] / ranked[0][1]['total_consumption'] * 100, 1)
+                              for _, stats in ranked]
+            else:
+                products = ['Oat Milk', 'Vegan Meat', 'Soy Products', 'Chickpea Flour', 'Almond Milk', 'Tofu']
+                popularity = [95, 88, 82, 75, 85, 78]
             colors = ['#4CAF50' if p > 85 else '#FFA726' if p > 75 else '#90CAF9' for p in popularity]
             
             fig1 = go.Figure(data=[
@@ -664,9 +764,19 @@ elif dashboard_type == "🛒 Consumer":
             st.plotly_chart(fig1, use_container_width=True)
         
         with col2:
-            # GenZ adoption pie chart
-            labels = ['Oat Milk', 'Vegan Meat', 'Almond Milk', 'Tofu', 'Others']
-            values = [30, 25, 20, 15, 10]
+            # GenZ adoption pie chart (consumption weighted by GenZ ratio)
+            if summary:
+                genz_volume = sorted(
+                    ((product, stats['total_consumption'] * stats['avg_genz_ratio'])
+                     for product, stats in summary['products'].items()),
+                    key=lambda item: item[1], reverse=True
+                )
+                labels = [product for product, _ in genz_volume[:4]] + ['Others']
+                values = [round(volume) for _, volume in genz_volume[:4]]
+                values.append(round(sum(volume for _, volume in genz_volume[4:])))
+            else:
+                labels = ['Oat Milk', 'Vegan Meat', 'Almond Milk', 'Tofu', 'Others']
+                values = [30, 25, 20, 15, 10]
             
             fig2 = go.Figure(data=[go.Pie(
                 labels=labels,
@@ -682,13 +792,23 @@ elif dashboard_type == "🛒 Consumer":
         
         # Price comparison
         st.subheader("💰 Price Comparison Across Regions")
-        regions = ['Hyderabad', 'Bengaluru', 'Mumbai', 'Delhi', 'Chennai']
-        oat_milk_prices = [195, 205, 220, 210, 200]
-        vegan_meat_prices = [280, 295, 310, 300, 290]
+        if summary:
+            regions = list(summary['region_products'])
+            compared = [product for product, _ in top_products(summary, 2)]
+            region_prices = {
+                product: [summary['region_products'][region].get(product, {}).get('avg_price') for region in regions]
+                for product in compared
+            }
+        else:
+            regions = ['Hyderabad', 'Bengaluru', 'Mumbai', 'Delhi', 'Chennai']
+            region_prices = {
+                'Oat Milk': [195, 205, 220, 210, 200],
+                'Vegan Meat': [280, 295, 310, 300, 290]
+            }
         
         fig3 = go.Figure()
-        fig3.add_trace(go.Bar(name='Oat Milk', x=regions, y=oat_milk_prices, marker_color='#66BB6A'))
-        fig3.add_trace(go.Bar(name='Vegan Meat', x=regions, y=vegan_meat_prices, marker_color='#FFA726'))
+        for product, color in zip(region_prices, ['#66BB6A', '#FFA726']):
+            fig3.add_trace(go.Bar(name=product, x=regions, y=region_prices[product], marker_color=color))
         
         fig3.update_layout(
             title='Product Prices by Region (₹/kg)',
@@ -843,52 +963,32 @@ elif dashboard_type == "📊 Legacy Tools":
                 
                 # Make API request
                 with st.spinner("Forecasting demand..."):
-                    response = requests.post(
-                        f"{API_URL}/predict_demand",
-                        json=payload,
-                        timeout=5
-                    )
+                    result = api_client.post("predict_demand", payload)
                 
-                # Check response
-                if response.status_code == 200:
-                    result = response.json()
-                    predicted_orders = result.get("predicted_orders", "N/A")
-                    
-                    st.markdown("")
-                    st.markdown(f"""
-                        <div class="result-box">
-                            <h3>📊 Forecast Result</h3>
-                            <p style="font-size: 1.5rem; color: #2E7D32; font-weight: bold;">
-                                Predicted Orders: <span style="color: #1B5E20;">{predicted_orders}</span>
-                            </p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Display input summary
-                    st.markdown("")
-                    st.info(f"""
-                        **Input Summary:**
-                        - Base Price: ${base_price:.2f}
-                        - Checkout Price: ${checkout_price:.2f}
-                        - Center ID: {center_id}
-                        - Meal ID: {meal_id}
-                    """)
-                    
-                else:
-                    error_msg = response.json().get("error", "Unknown error occurred")
-                    st.error(f"❌ API Error: {error_msg}")
-                    
-            except requests.exceptions.ConnectionError:
-                st.error("""
-                    ❌ **Connection Error**: Cannot connect to the backend API.
-                    
-                    Please ensure the Flask backend is running:
-                    1. Open a terminal
-                    2. Navigate to the project directory
-                    3. Run: `python backend/app.py`
+                predicted_orders = result.get("predicted_orders", "N/A")
+                
+                st.markdown("")
+                st.markdown(f"""
+                    <div class="result-box">
+                        <h3>📊 Forecast Result</h3>
+                        <p style="font-size: 1.5rem; color: #2E7D32; font-weight: bold;">
+                            Predicted Orders: <span style="color: #1B5E20;">{predicted_orders}</span>
+                        </p>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                # Display input summary
+                st.markdown("")
+                st.info(f"""
+                    **Input Summary:**
+                    - Base Price: ${base_price:.2f}
+                    - Checkout Price: ${checkout_price:.2f}
+                    - Center ID: {center_id}
+                    - Meal ID: {meal_id}
                 """)
-            except requests.exceptions.Timeout:
-                st.error("⏱️ **Timeout Error**: The API request took too long. Please try again.")
+
+            except api_client.APIError as e:
+                st.error(f"❌ {e}")
             except Exception as e:
                 st.error(f"❌ **Error**: {str(e)}")
     
@@ -984,55 +1084,35 @@ elif dashboard_type == "📊 Legacy Tools":
                 
                 # Make API request
                 with st.spinner("Analyzing soil conditions..."):
-                    response = requests.post(
-                        f"{API_URL}/recommend_crop",
-                        json=payload,
-                        timeout=5
-                    )
+                    result = api_client.post("recommend_crop", payload)
                 
-                # Check response
-                if response.status_code == 200:
-                    result = response.json()
-                    recommended_crop = result.get("recommended_crop", "N/A")
-                    
-                    st.markdown("")
-                    st.markdown(f"""
-                        <div class="result-box">
-                            <h3>🌾 Crop Recommendation</h3>
-                            <p style="font-size: 1.5rem; color: #2E7D32; font-weight: bold;">
-                                Recommended Crop: <span style="color: #1B5E20; text-transform: capitalize;">{recommended_crop}</span>
-                            </p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Display input summary
-                    st.markdown("")
-                    st.info(f"""
-                        **Input Summary:**
-                        - Nitrogen (N): {nitrogen:.1f}
-                        - Phosphorus (P): {phosphorus:.1f}
-                        - Potassium (K): {potassium:.1f}
-                        - Temperature: {temperature:.1f}°C
-                        - Humidity: {humidity:.1f}%
-                        - pH: {ph:.1f}
-                        - Rainfall: {rainfall:.1f} mm
-                    """)
-                    
-                else:
-                    error_msg = response.json().get("error", "Unknown error occurred")
-                    st.error(f"❌ API Error: {error_msg}")
-                    
-            except requests.exceptions.ConnectionError:
-                st.error("""
-                    ❌ **Connection Error**: Cannot connect to the backend API.
-                    
-                    Please ensure the Flask backend is running:
-                    1. Open a terminal
-                    2. Navigate to the project directory
-                    3. Run: `python backend/app.py`
+                recommended_crop = result.get("recommended_crop", "N/A")
+                
+                st.markdown("")
+                st.markdown(f"""
+                    <div class="result-box">
+                        <h3>🌾 Crop Recommendation</h3>
+                        <p style="font-size: 1.5rem; color: #2E7D32; font-weight: bold;">
+                            Recommended Crop: <span style="color: #1B5E20; text-transform: capitalize;">{recommended_crop}</span>
+                        </p>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                # Display input summary
+                st.markdown("")
+                st.info(f"""
+                    **Input Summary:**
+                    - Nitrogen (N): {nitrogen:.1f}
+                    - Phosphorus (P): {phosphorus:.1f}
+                    - Potassium (K): {potassium:.1f}
+                    - Temperature: {temperature:.1f}°C
+                    - Humidity: {humidity:.1f}%
+                    - pH: {ph:.1f}
+                    - Rainfall: {rainfall:.1f} mm
                 """)
-            except requests.exceptions.Timeout:
-                st.error("⏱️ **Timeout Error**: The API request took too long. Please try again.")
+
+            except api_client.APIError as e:
+                st.error(f"❌ {e}")
             except Exception as e:
                 st.error(f"❌ **Error**: {str(e)}")
 
@@ -1065,13 +1145,12 @@ with st.sidebar:
     
     # API Status Check
     st.subheader("🔌 API Status")
-    try:
-        response = requests.get(f"{API_URL}/", timeout=2)
-        if response.status_code == 200:
-            st.success("✅ Backend API is Online")
-        else:
-            st.warning("⚠️ Backend API returned an error")
-    except:
+    status = api_client.health_status()
+    if status == 'online':
+        st.success("✅ Backend API is Online")
+    elif status == 'error':
+        st.warning("⚠️ Backend API returned an error")
+    else:
         st.error("❌ Backend API is Offline")
         st.caption("Start the backend with: `python backend/app.py`")
 
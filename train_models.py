@@ -8,40 +8,263 @@ This script trains the 3-model AI system:
 3. MODEL 3: VORTEX Optimizer (uses Models 1 & 2 + logistics data)
 
 All models align with hackathon problem statement requirements.
+
+Each model can be trained as a RandomForest (default) or a
+HistGradientBoosting model with native categorical support:
+
+    python train_models.py                                 # configured family per model
+    python train_models.py --family hist_gb                # all models
+    python train_models.py --family crop_suitability=hist_gb
+    python train_models.py --compare                       # train both, report side by side
+
+The family per model can also be pinned with a "family" key in
+models/hyperparams.json. Accuracy, size and latency of every trained model
+are written to models/training_report.json.
 """
 
 import pandas as pd
 import pickle
+import json
 import os
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+import sys
+import time
+import warnings
+from sklearn.ensemble import (
+    RandomForestClassifier, RandomForestRegressor,
+    HistGradientBoostingClassifier, HistGradientBoostingRegressor
+)
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report, mean_squared_error, r2_score
-from sklearn.preprocessing import LabelEncoder
 import numpy as np
 
-def train_crop_advisor():
+from backend import elasticity
+
+# Hyperparameters written by tune_models.py; the defaults below are used for
+# any model (or parameter) the tuner has not produced a value for.
+HYPERPARAMS_PATH = os.path.join('models', 'hyperparams.json')
+
+MODEL_FAMILIES = ('random_forest', 'hist_gb')
+
+DEFAULT_HYPERPARAMS = {
+    'crop_advisor': {'n_estimators': 100, 'max_depth': 10, 'min_samples_split': 5},
+    'demand_radar': {'n_estimators': 100, 'max_depth': 10, 'min_samples_split': 5},
+    'crop_suitability': {'n_estimators': 100, 'max_depth': 10, 'min_samples_split': 5},
+    'vegan_demand_forecast': {'n_estimators': 100, 'max_depth': 12, 'min_samples_split': 5},
+}
+
+DEFAULT_HGB_HYPERPARAMS = {'max_iter': 200, 'learning_rate': 0.1, 'max_leaf_nodes': 31}
+
+# Categorical feature columns per model (integer codes from encode_categories);
+# HistGradientBoosting splits on them natively instead of treating codes as ordered
+CATEGORICAL_FEATURES = {
+    'crop_advisor': [],
+    'demand_radar': [],
+    'crop_suitability': ['soil_type_encoded', 'crop_encoded', 'district_encoded'],
+    'vegan_demand_forecast': ['region_encoded', 'product_encoded'],
+}
+
+# Families chosen on the command line, overriding models/hyperparams.json
+FAMILY_OVERRIDES = {}
+
+# model name -> family -> test metrics, filled in by the train_* functions
+TRAINING_REPORT = {}
+TRAINING_REPORT_PATH = os.path.join('models', 'training_report.json')
+
+# Price elasticity per (region, product, month), estimated from the trained
+# vegan demand model and served by the backend (see backend/elasticity.py)
+ELASTICITY_PATH = os.path.join('models', 'price_elasticity.json')
+
+def _read_model_config(model_name):
+    """Return the models/hyperparams.json entry for a model ({} if absent)."""
+    if not os.path.exists(HYPERPARAMS_PATH):
+        return {}
+    with open(HYPERPARAMS_PATH) as f:
+        return json.load(f).get(model_name, {})
+
+def load_hyperparams(model_name, family='random_forest'):
+    """
+    Return the hyperparameters for a model, tuned values overriding defaults.
+    RandomForest parameters live at the top level of the model's config entry;
+    HistGradientBoosting parameters under its "hist_gb" key.
+    """
+    config = _read_model_config(model_name)
+    if family == 'hist_gb':
+        return {**DEFAULT_HGB_HYPERPARAMS, **config.get('hist_gb', {})}
+    
+    params = dict(DEFAULT_HYPERPARAMS[model_name])
+    params.update({k: v for k, v in config.items() if k not in ('family', 'hist_gb')})
+    return params
+
+def load_model_family(model_name):
+    """Return the model family to train: command line, then hyperparams.json, then RandomForest."""
+    if model_name in FAMILY_OVERRIDES:
+        return FAMILY_OVERRIDES[model_name]
+    return _read_model_config(model_name).get('family', 'random_forest')
+
+def save_hyperparams(model_name, params):
+    """Persist tuned hyperparameters for a model, keeping other entries."""
+    config = {}
+    if os.path.exists(HYPERPARAMS_PATH):
+        with open(HYPERPARAMS_PATH) as f:
+            config = json.load(f)
+    config[model_name] = {**config.get(model_name, {}), **params}
+    os.makedirs(os.path.dirname(HYPERPARAMS_PATH), exist_ok=True)
+    with open(HYPERPARAMS_PATH, 'w') as f:
+        json.dump(config, f, indent=2, sort_keys=True)
+
+def discard_compressed(model_name):
+    """Remove models/<name>.compressed.pkl, which was compressed from the model just replaced."""
+    compressed_path = os.path.join('models', f'{model_name}.compressed.pkl')
+    if os.path.exists(compressed_path):
+        os.remove(compressed_path)
+        print(f"  Removed stale {compressed_path} (re-run compress_models.py)")
+
+def build_model(model_name, family, feature_columns, classifier=False):
+    """Create an unfitted model of the given family with the configured hyperparameters."""
+    params = load_hyperparams(model_name, family)
+    
+    if family == 'hist_gb':
+        model_cls = HistGradientBoostingClassifier if classifier else HistGradientBoostingRegressor
+        categorical = [column in CATEGORICAL_FEATURES[model_name] for column in feature_columns]
+        return model_cls(
+            random_state=42,
+            categorical_features=categorical if any(categorical) else None,
+            **params
+        )
+    
+    model_cls = RandomForestClassifier if classifier else RandomForestRegressor
+    return model_cls(random_state=42, n_jobs=-1, **params)
+
+def prepare_for_serving(model):
+    """Serve forests single-threaded: per-request thread fan-out costs more than it saves."""
+    if hasattr(model, 'n_jobs'):
+        model.n_jobs = 1
+    return model
+
+def record_metrics(model_name, family, model, X_test, **scores):
+    """Measure serving cost of a trained model and store it with its test scores."""
+    cost = measure_model_cost(model, X_test)
+    TRAINING_REPORT.setdefault(model_name, {})[family] = {**scores, **cost}
+    print(f"  Size: {cost['size_bytes'] / 1024:.0f}KB  "
+          f"Single-row: {cost['single_row_ms']:.3f}ms  "
+          f"Batch ({len(X_test)} rows): {cost['batch_ms']:.2f}ms")
+
+def measure_model_cost(model, X, n_single=50, n_repeats=3):
+    """
+    Measure serving cost of a fitted model.
+    
+    Returns:
+    {
+        "single_row_ms": median latency of one-row predict calls,
+        "batch_ms": best-of-n latency of a predict over all rows of X,
+        "size_bytes": pickled model size
+    }
+    """
+    # Serving passes plain arrays, so measure the same way (and silence the
+    # feature-name warning that triggers for models fitted on DataFrames)
+    X = np.asarray(X)
+    rows = X[:n_single]
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        
+        single_times = []
+        for i in range(len(rows)):
+            start = time.perf_counter()
+            model.predict(rows[i:i + 1])
+            single_times.append(time.perf_counter() - start)
+        
+        batch_times = []
+        for _ in range(n_repeats):
+            start = time.perf_counter()
+            model.predict(X)
+            batch_times.append(time.perf_counter() - start)
+    
+    return {
+        "single_row_ms": float(np.median(single_times) * 1000),
+        "batch_ms": float(min(batch_times) * 1000),
+        "size_bytes": len(pickle.dumps(model))
+    }
+
+# ==================== DATASET PREPARATION ====================
+
+def load_crop_advisor_data():
+    """Load crop_data.csv and return (X, y) for the Crop Advisor."""
+    df = pd.read_csv(os.path.join('data', 'crop_data.csv'))
+    feature_columns = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
+    return df[feature_columns], df['label']
+
+def load_demand_radar_data():
+    """Load demand_data.csv and return (X, y) for the Demand Radar."""
+    df = pd.read_csv(os.path.join('data', 'demand_data.csv'))
+    feature_columns = ['base_price', 'checkout_price', 'center_id', 'meal_id']
+    return df[feature_columns], df['num_orders']
+
+def encode_categories(df, columns):
+    """
+    Add an integer-coded <column>_encoded column for each categorical column
+    (codes index the sorted vocabulary, as LabelEncoder did).
+    Returns {column: vocabulary list}, stored in the model pickle for serving.
+    """
+    categories = {}
+    for column in columns:
+        codes, vocabulary = pd.factorize(df[column], sort=True)
+        df[f'{column}_encoded'] = codes
+        categories[column] = [str(value) for value in vocabulary]
+    return categories
+
+def load_crop_suitability_data():
+    """
+    Load crop_suitability.csv and return (X, y, categories).
+    Soil type, crop and district are integer-coded; categories holds their vocabularies.
+    """
+    df = pd.read_csv(os.path.join('data', 'crop_suitability.csv'))
+    
+    categories = encode_categories(df, ['soil_type', 'crop', 'district'])
+    
+    feature_columns = ['soil_ph', 'soil_type_encoded', 'rainfall', 'temperature', 
+                      'irrigation', 'distance_to_city', 'crop_encoded', 'district_encoded']
+    return df[feature_columns], df['suitability_score'], categories
+
+def load_vegan_demand_data():
+    """
+    Load vegan_consumption.csv and return (X, y, categories).
+    Date is expanded into month/quarter; region and product are integer-coded.
+    """
+    df = pd.read_csv(os.path.join('data', 'vegan_consumption.csv'))
+    
+    df['date'] = pd.to_datetime(df['date'])
+    df['month'] = df['date'].dt.month
+    df['quarter'] = df['date'].dt.quarter
+    
+    categories = encode_categories(df, ['region', 'product'])
+    
+    feature_columns = ['price', 'genz_ratio', 'google_trends_score', 
+                      'region_encoded', 'product_encoded', 'month', 'quarter']
+    return df[feature_columns], df['consumption'], categories
+
+# ==================== MODEL TRAINING ====================
+
+def train_crop_advisor(family=None, save=True):
     """
-    Train RandomForestClassifier for crop recommendation.
+    Train the crop recommendation classifier.
+    family: 'random_forest' or 'hist_gb' (default: configured family);
+    save=False trains and records metrics without overwriting the pickle.
     Features: N, P, K, temperature, humidity, ph, rainfall
     Target: label
     """
+    family = family or load_model_family('crop_advisor')
     print("=" * 60)
-    print("Training Supply Model: Crop Advisor")
+    print(f"Training Supply Model: Crop Advisor [{family}]")
     print("=" * 60)
     
     # Load data
-    data_path = os.path.join('data', 'crop_data.csv')
-    df = pd.read_csv(data_path)
+    X, y = load_crop_advisor_data()
     
-    print(f"Loaded {len(df)} samples")
-    print(f"Features: {list(df.columns[:-1])}")
-    print(f"Target: {df.columns[-1]}")
-    print(f"Classes: {df['label'].unique()}")
-    
-    # Prepare features and target
-    feature_columns = ['N', 'P', 'K', 'temperature', 'humidity', 'ph', 'rainfall']
-    X = df[feature_columns]
-    y = df['label']
+    print(f"Loaded {len(X)} samples")
+    print(f"Features: {list(X.columns)}")
+    print(f"Target: {y.name}")
+    print(f"Classes: {y.unique()}")
     
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(
@@ -52,14 +275,8 @@ def train_crop_advisor():
     print(f"Test set: {len(X_test)} samples")
     
     # Train model
-    print("\nTraining RandomForestClassifier...")
-    model = RandomForestClassifier(
-        n_estimators=100,
-        random_state=42,
-        max_depth=10,
-        min_samples_split=5,
-        n_jobs=-1
-    )
+    model = build_model('crop_advisor', family, X.columns, classifier=True)
+    print(f"\nTraining {type(model).__name__} {load_hyperparams('crop_advisor', family)}...")
     
     model.fit(X_train, y_train)
     
@@ -72,6 +289,12 @@ def train_crop_advisor():
     print("\nClassification Report:")
     print(classification_report(y_test, y_pred))
     
+    prepare_for_serving(model)
+    record_metrics('crop_advisor', family, model, X_test, accuracy=accuracy)
+    
+    if not save:
+        return model
+    
     # Save model
     model_path = os.path.join('models', 'crop_advisor.pkl')
     os.makedirs('models', exist_ok=True)
@@ -80,31 +303,29 @@ def train_crop_advisor():
         pickle.dump(model, f)
     
     print(f"\n✓ Model saved to {model_path}")
+    discard_compressed('crop_advisor')
     
     return model
 
-def train_demand_radar():
+def train_demand_radar(family=None, save=True):
     """
-    Train RandomForestRegressor for sales forecasting.
+    Train the sales forecasting regressor.
+    family: 'random_forest' or 'hist_gb' (default: configured family);
+    save=False trains and records metrics without overwriting the pickle.
     Features: base_price, checkout_price, center_id, meal_id
     Target: num_orders
     """
+    family = family or load_model_family('demand_radar')
     print("\n" + "=" * 60)
-    print("Training Demand Model: Demand Radar")
+    print(f"Training Demand Model: Demand Radar [{family}]")
     print("=" * 60)
     
     # Load data
-    data_path = os.path.join('data', 'demand_data.csv')
-    df = pd.read_csv(data_path)
+    X, y = load_demand_radar_data()
     
-    print(f"Loaded {len(df)} samples")
-    print(f"Features: {list(df.columns[:-1])}")
-    print(f"Target: {df.columns[-1]}")
-    
-    # Prepare features and target
-    feature_columns = ['base_price', 'checkout_price', 'center_id', 'meal_id']
-    X = df[feature_columns]
-    y = df['num_orders']
+    print(f"Loaded {len(X)} samples")
+    print(f"Features: {list(X.columns)}")
+    print(f"Target: {y.name}")
     
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(
@@ -116,14 +337,8 @@ def train_demand_radar():
     print(f"Target range: {y.min()} - {y.max()} orders")
     
     # Train model
-    print("\nTraining RandomForestRegressor...")
-    model = RandomForestRegressor(
-        n_estimators=100,
-        random_state=42,
-        max_depth=10,
-        min_samples_split=5,
-        n_jobs=-1
-    )
+    model = build_model('demand_radar', family, X.columns)
+    print(f"\nTraining {type(model).__name__} {load_hyperparams('demand_radar', family)}...")
     
     model.fit(X_train, y_train)
     
@@ -139,6 +354,12 @@ def train_demand_radar():
     print(f"  Mean Actual Orders: {y_test.mean():.2f}")
     print(f"  Mean Predicted Orders: {y_pred.mean():.2f}")
     
+    prepare_for_serving(model)
+    record_metrics('demand_radar', family, model, X_test, rmse=float(rmse), r2=r2)
+    
+    if not save:
+        return model
+    
     # Save model
     model_path = os.path.join('models', 'demand_radar.pkl')
     os.makedirs('models', exist_ok=True)
@@ -147,41 +368,29 @@ def train_demand_radar():
         pickle.dump(model, f)
     
     print(f"\n✓ Model saved to {model_path}")
+    discard_compressed('demand_radar')
     
     return model
 
-def train_crop_suitability():
+def train_crop_suitability(family=None, save=True):
     """
-    Train RandomForestRegressor for crop suitability scoring.
+    Train the crop suitability scoring regressor.
+    family: 'random_forest' or 'hist_gb' (default: configured family);
+    save=False trains and records metrics without overwriting the pickle.
     Features: soil_ph, soil_type, rainfall, temperature, irrigation, distance_to_city
     Target: suitability_score (0-1)
     """
+    family = family or load_model_family('crop_suitability')
     print("\n" + "=" * 60)
-    print("Training Crop Suitability Model")
+    print(f"Training Crop Suitability Model [{family}]")
     print("=" * 60)
     
-    # Load data
-    data_path = os.path.join('data', 'crop_suitability.csv')
-    df = pd.read_csv(data_path)
-    
-    print(f"Loaded {len(df)} samples")
-    print(f"Districts: {df['district'].nunique()}")
-    print(f"Crops: {df['crop'].nunique()}")
+    # Load data and encode categorical features
+    X, y, categories = load_crop_suitability_data()
     
-    # Encode categorical features
-    le_soil = LabelEncoder()
-    le_crop = LabelEncoder()
-    le_district = LabelEncoder()
-    
-    df['soil_type_encoded'] = le_soil.fit_transform(df['soil_type'])
-    df['crop_encoded'] = le_crop.fit_transform(df['crop'])
-    df['district_encoded'] = le_district.fit_transform(df['district'])
-    
-    # Prepare features and target
-    feature_columns = ['soil_ph', 'soil_type_encoded', 'rainfall', 'temperature', 
-                      'irrigation', 'distance_to_city', 'crop_encoded', 'district_encoded']
-    X = df[feature_columns]
-    y = df['suitability_score']
+    print(f"Loaded {len(X)} samples")
+    print(f"Districts: {len(categories['district'])}")
+    print(f"Crops: {len(categories['crop'])}")
     
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(
@@ -193,14 +402,8 @@ def train_crop_suitability():
     print(f"Target range: {y.min():.3f} - {y.max():.3f}")
     
     # Train model
-    print("\nTraining RandomForestRegressor for Suitability...")
-    model = RandomForestRegressor(
-        n_estimators=100,
-        random_state=42,
-        max_depth=10,
-        min_samples_split=5,
-        n_jobs=-1
-    )
+    model = build_model('crop_suitability', family, X.columns)
+    print(f"\nTraining {type(model).__name__} for Suitability {load_hyperparams('crop_suitability', family)}...")
     
     model.fit(X_train, y_train)
     
@@ -216,60 +419,45 @@ def train_crop_suitability():
     print(f"  Mean Actual Score: {y_test.mean():.3f}")
     print(f"  Mean Predicted Score: {y_pred.mean():.3f}")
     
-    # Save model and encoders
+    prepare_for_serving(model)
+    record_metrics('crop_suitability', family, model, X_test, rmse=float(rmse), r2=r2)
+    
+    if not save:
+        return model
+    
+    # Save model and category vocabularies
     model_path = os.path.join('models', 'crop_suitability.pkl')
     os.makedirs('models', exist_ok=True)
     
-    model_data = {
-        'model': model,
-        'soil_encoder': le_soil,
-        'crop_encoder': le_crop,
-        'district_encoder': le_district
-    }
+    model_data = {'model': model, 'family': family, 'categories': categories}
     
     with open(model_path, 'wb') as f:
         pickle.dump(model_data, f)
     
     print(f"\n✓ Model saved to {model_path}")
+    discard_compressed('crop_suitability')
     
     return model
 
-def train_vegan_demand_forecast():
+def train_vegan_demand_forecast(family=None, save=True):
     """
     Train enhanced demand forecasting model with time-series features.
+    family: 'random_forest' or 'hist_gb' (default: configured family);
+    save=False trains and records metrics without overwriting the pickle.
     Features: price, genz_ratio, google_trends_score, region, product, month, season
     Target: consumption
     """
+    family = family or load_model_family('vegan_demand_forecast')
     print("\n" + "=" * 60)
-    print("Training Enhanced Vegan Demand Forecast Model")
+    print(f"Training Enhanced Vegan Demand Forecast Model [{family}]")
     print("=" * 60)
     
-    # Load data
-    data_path = os.path.join('data', 'vegan_consumption.csv')
-    df = pd.read_csv(data_path)
-    
-    print(f"Loaded {len(df)} samples")
-    print(f"Regions: {df['region'].nunique()}")
-    print(f"Products: {df['product'].nunique()}")
+    # Load data, extract time features and encode categorical features
+    X, y, categories = load_vegan_demand_data()
     
-    # Convert date to datetime and extract features
-    df['date'] = pd.to_datetime(df['date'])
-    df['month'] = df['date'].dt.month
-    df['quarter'] = df['date'].dt.quarter
-    df['day_of_year'] = df['date'].dt.dayofyear
-    
-    # Encode categorical features
-    le_region = LabelEncoder()
-    le_product = LabelEncoder()
-    
-    df['region_encoded'] = le_region.fit_transform(df['region'])
-    df['product_encoded'] = le_product.fit_transform(df['product'])
-    
-    # Prepare features and target
-    feature_columns = ['price', 'genz_ratio', 'google_trends_score', 
-                      'region_encoded', 'product_encoded', 'month', 'quarter']
-    X = df[feature_columns]
-    y = df['consumption']
+    print(f"Loaded {len(X)} samples")
+    print(f"Regions: {len(categories['region'])}")
+    print(f"Products: {len(categories['product'])}")
     
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(
@@ -281,14 +469,8 @@ def train_vegan_demand_forecast():
     print(f"Target range: {y.min()} - {y.max()}")
     
     # Train model
-    print("\nTraining RandomForestRegressor for Demand Forecast...")
-    model = RandomForestRegressor(
-        n_estimators=100,
-        random_state=42,
-        max_depth=12,
-        min_samples_split=5,
-        n_jobs=-1
-    )
+    model = build_model('vegan_demand_forecast', family, X.columns)
+    print(f"\nTraining {type(model).__name__} for Demand Forecast {load_hyperparams('vegan_demand_forecast', family)}...")
     
     model.fit(X_train, y_train)
     
@@ -304,40 +486,97 @@ def train_vegan_demand_forecast():
     print(f"  Mean Actual Consumption: {y_test.mean():.2f}")
     print(f"  Mean Predicted Consumption: {y_pred.mean():.2f}")
     
-    # Save model and encoders
+    prepare_for_serving(model)
+    record_metrics('vegan_demand_forecast', family, model, X_test, rmse=float(rmse), r2=r2)
+    
+    if not save:
+        return model
+    
+    # Save model and category vocabularies
     model_path = os.path.join('models', 'vegan_demand_forecast.pkl')
     os.makedirs('models', exist_ok=True)
     
-    model_data = {
-        'model': model,
-        'region_encoder': le_region,
-        'product_encoder': le_product
-    }
+    model_data = {'model': model, 'family': family, 'categories': categories}
     
     with open(model_path, 'wb') as f:
         pickle.dump(model_data, f)
     
     print(f"\n✓ Model saved to {model_path}")
+    discard_compressed('vegan_demand_forecast')
+    
+    # Precompute price elasticities for every (region, product, month) in the data
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)  # predicting on arrays, fitted on a DataFrame
+        table = elasticity.build_table(model, X, categories, X.columns)
+    elasticity.save_table(table, ELASTICITY_PATH)
+    print(f"✓ Price elasticity table ({len(table['entries'])} entries) saved to {ELASTICITY_PATH}")
     
     return model
 
+def parse_family_args(args):
+    """
+    Apply --family FAMILY (all models) or --family MODEL=FAMILY (one model)
+    arguments to FAMILY_OVERRIDES.
+    """
+    for position, arg in enumerate(args):
+        if arg != '--family' or position + 1 >= len(args):
+            continue
+        value = args[position + 1]
+        model_names, family = list(DEFAULT_HYPERPARAMS), value
+        if '=' in value:
+            model_name, family = value.split('=', 1)
+            model_names = [model_name]
+        if family not in MODEL_FAMILIES or any(name not in DEFAULT_HYPERPARAMS for name in model_names):
+            print(f"Invalid --family {value}: expected FAMILY or MODEL=FAMILY "
+                  f"with FAMILY in {MODEL_FAMILIES}")
+            sys.exit(1)
+        for name in model_names:
+            FAMILY_OVERRIDES[name] = family
+
+def print_comparison():
+    """Print accuracy, size and latency of every trained family side by side."""
+    print("\n" + "=" * 60)
+    print("Model Family Comparison")
+    print("=" * 60)
+    for model_name, families in TRAINING_REPORT.items():
+        print(f"\n{model_name} (serving: {load_model_family(model_name)})")
+        for family, metrics in families.items():
+            score = (f"accuracy={metrics['accuracy']:.4f}" if 'accuracy' in metrics
+                     else f"R²={metrics['r2']:.4f}")
+            print(f"  {family:14s} {score}  size={metrics['size_bytes'] / 1024:.0f}KB  "
+                  f"single-row={metrics['single_row_ms']:.3f}ms  batch={metrics['batch_ms']:.2f}ms")
+
 def main():
-    """Train both models."""
+    """Train all models."""
+    args = sys.argv[1:]
+    parse_family_args(args)
+    compare = '--compare' in args
+    
     print("\n" + "=" * 60)
     print("V-Pulse Model Training")
     print("=" * 60 + "\n")
     
-    # Train Supply Model (Crop Advisor)
-    crop_model = train_crop_advisor()
+    trainers = [
+        ('crop_advisor', train_crop_advisor),                    # Supply Model (Crop Advisor)
+        ('demand_radar', train_demand_radar),                    # Demand Model (Demand Radar)
+        ('crop_suitability', train_crop_suitability),            # Crop Suitability Model
+        ('vegan_demand_forecast', train_vegan_demand_forecast),  # Enhanced Vegan Demand Forecast Model
+    ]
     
-    # Train Demand Model (Demand Radar)
-    demand_model = train_demand_radar()
+    for model_name, trainer in trainers:
+        if compare:
+            # Train every family; only the configured one overwrites the pickle
+            serving_family = load_model_family(model_name)
+            for family in MODEL_FAMILIES:
+                trainer(family=family, save=(family == serving_family))
+        else:
+            trainer()
     
-    # Train Crop Suitability Model
-    suitability_model = train_crop_suitability()
+    with open(TRAINING_REPORT_PATH, 'w') as f:
+        json.dump(TRAINING_REPORT, f, indent=2)
     
-    # Train Enhanced Vegan Demand Forecast Model
-    vegan_demand_model = train_vegan_demand_forecast()
+    if compare:
+        print_comparison()
     
     print("\n" + "=" * 60)
     print("✓ All models trained and saved successfully!")
@@ -347,7 +586,7 @@ def main():
     print("  - demand_radar.pkl (Basic Demand Forecasting)")
     print("  - crop_suitability.pkl (Crop Suitability Scoring)")
     print("  - vegan_demand_forecast.pkl (Enhanced Demand Forecasting)")
+    print(f"\nAccuracy, size and latency report: {TRAINING_REPORT_PATH}")
 
 if __name__ == "__main__":
     main()
-
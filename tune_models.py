@@ -0,0 +1,173 @@
+"""
+VOIS Hyperparameter Tuning Script
+Smart Vegan Supply & Demand Tracker - Forest Size Search
+
+Searches tree count, depth and split size for each model with successive
+halving (candidates are scored on a small sample first and only the best
+third survives to the next, larger round). Cross-validation folds and
+candidates run in parallel across all cores.
+
+Candidates are ranked on a joint objective:
+
+    score = accuracy - LATENCY_WEIGHT * latency / LATENCY_BUDGET_MS
+                     - SIZE_WEIGHT * size / SIZE_BUDGET_MB
+
+where accuracy is test accuracy (classifier) or R² (regressors), latency is
+the median single-row predict time and size is the pickled model size. The
+winning configuration is written to models/hyperparams.json, which
+train_models.py picks up on the next normal training run.
+
+Usage:
+    python tune_models.py                       # tune all models
+    python tune_models.py crop_suitability      # tune selected models
+"""
+
+import sys
+import time
+import pickle
+import numpy as np
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, train_test_split
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.metrics import accuracy_score, r2_score
+
+from train_models import (
+    load_crop_advisor_data, load_demand_radar_data,
+    load_crop_suitability_data, load_vegan_demand_data,
+    load_hyperparams, save_hyperparams, measure_model_cost
+)
+
+SEARCH_SPACE = {
+    'n_estimators': [25, 50, 100, 200],
+    'max_depth': [6, 8, 10, 12, 16],
+    'min_samples_split': [2, 5, 10]
+}
+
+# Joint objective weights: a model at the latency/size budget loses this much
+# accuracy (or R²) in the ranking
+LATENCY_WEIGHT = 0.05
+LATENCY_BUDGET_MS = 10.0
+SIZE_WEIGHT = 0.05
+SIZE_BUDGET_MB = 2.0
+
+# Number of rows timed individually when scoring a candidate
+LATENCY_SAMPLE_ROWS = 20
+
+# model name -> (estimator class, accuracy metric, dataset loader)
+TUNABLE_MODELS = {
+    'crop_advisor': (RandomForestClassifier, accuracy_score, load_crop_advisor_data),
+    'demand_radar': (RandomForestRegressor, r2_score, load_demand_radar_data),
+    'crop_suitability': (RandomForestRegressor, r2_score, load_crop_suitability_data),
+    'vegan_demand_forecast': (RandomForestRegressor, r2_score, load_vegan_demand_data),
+}
+
+def joint_objective(accuracy, latency_ms, size_bytes):
+    """Combine accuracy with serving latency and model size into one score."""
+    size_mb = size_bytes / (1024 * 1024)
+    return (accuracy
+            - LATENCY_WEIGHT * latency_ms / LATENCY_BUDGET_MS
+            - SIZE_WEIGHT * size_mb / SIZE_BUDGET_MB)
+
+def make_joint_scorer(metric):
+    """
+    Build a scorer(estimator, X, y) for the search that measures accuracy on
+    the validation fold plus single-row latency and pickled size of the fitted
+    candidate.
+    """
+    def scorer(estimator, X, y):
+        accuracy = metric(y, estimator.predict(X))
+
+        rows = X[:LATENCY_SAMPLE_ROWS]
+        timings = []
+        for i in range(len(rows)):
+            start = time.perf_counter()
+            estimator.predict(rows[i:i + 1])
+            timings.append(time.perf_counter() - start)
+        latency_ms = float(np.median(timings) * 1000)
+
+        return joint_objective(accuracy, latency_ms, len(pickle.dumps(estimator)))
+
+    return scorer
+
+def tune_model(model_name):
+    """Run successive-halving search for one model and save the winner."""
+    print("\n" + "=" * 60)
+    print(f"Tuning: {model_name}")
+    print("=" * 60)
+
+    estimator_cls, metric, loader = TUNABLE_MODELS[model_name]
+    X, y = loader()[:2]
+    X, y = np.asarray(X), np.asarray(y)
+
+    # Hold out the same test split train_models.py evaluates on
+    stratify = y if estimator_cls is RandomForestClassifier else None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=stratify
+    )
+
+    # Candidates run single-threaded (the search parallelises across them),
+    # which also matches how the forests are served
+    search = HalvingGridSearchCV(
+        estimator_cls(random_state=42, n_jobs=1),
+        SEARCH_SPACE,
+        factor=3,
+        resource='n_samples',
+        cv=3,
+        scoring=make_joint_scorer(metric),
+        n_jobs=-1,
+        refit=False,
+        random_state=42
+    )
+
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    elapsed = time.perf_counter() - start
+
+    print(f"Evaluated {len(search.cv_results_['params'])} candidate fits "
+          f"over {search.n_iterations_} rounds in {elapsed:.1f}s")
+
+    # Compare the winner against the current configuration on the held-out set
+    best_params = search.best_params_
+    report = {}
+    for label, params in (('current', load_hyperparams(model_name)), ('tuned', best_params)):
+        model = estimator_cls(random_state=42, n_jobs=-1, **params)
+        model.fit(X_train, y_train)
+        model.n_jobs = 1
+        accuracy = metric(y_test, model.predict(X_test))
+        cost = measure_model_cost(model, X_test)
+        score = joint_objective(accuracy, cost['single_row_ms'], cost['size_bytes'])
+        report[label] = score
+        print(f"  {label:8s} {params}")
+        print(f"           accuracy={accuracy:.4f}  latency={cost['single_row_ms']:.3f}ms  "
+              f"size={cost['size_bytes'] / 1024:.0f}KB  objective={score:.4f}")
+
+    if report['tuned'] >= report['current']:
+        save_hyperparams(model_name, best_params)
+        print(f"\n✓ Saved tuned hyperparameters for {model_name}")
+    else:
+        print(f"\n✓ Current hyperparameters for {model_name} still win; not updated")
+
+    return best_params
+
+def main():
+    """Tune the requested models (all by default)."""
+    model_names = sys.argv[1:] or list(TUNABLE_MODELS)
+    unknown = [name for name in model_names if name not in TUNABLE_MODELS]
+    if unknown:
+        print(f"Unknown model(s): {', '.join(unknown)}")
+        print(f"Choose from: {', '.join(TUNABLE_MODELS)}")
+        sys.exit(1)
+
+    print("\n" + "=" * 60)
+    print("V-Pulse Hyperparameter Tuning")
+    print("=" * 60)
+
+    for model_name in model_names:
+        tune_model(model_name)
+
+    print("\n" + "=" * 60)
+    print("✓ Tuning complete! Run `python train_models.py` to retrain with the winners.")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()